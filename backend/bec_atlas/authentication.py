@@ -10,13 +10,16 @@ from fastapi.security.utils import get_authorization_scheme_param
 from jwt.exceptions import InvalidTokenError
 from pwdlib import PasswordHash
 
-from bec_atlas.model import UserInfo
+from bec_atlas.model import User, UserInfo
+from bec_atlas.utils.token_cache import VerifiedTokenCache
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/user/login/form")
 password_hash = PasswordHash.recommended()
+# claims of verified tokens, so that repeated requests skip the signature check
+token_cache = VerifiedTokenCache()
 
 
 class OptionalOAuth2PasswordBearer(OAuth2PasswordBearer):
@@ -51,7 +54,7 @@ def convert_to_user(func):
             current_user = kwargs["current_user"]
             if current_user:
                 router = args[0]
-                user = router.get_user_from_db(current_user.token, current_user.email)
+                user = await router.get_user(current_user)
                 kwargs["current_user"] = user
         return await func(*args, **kwargs)
 
@@ -90,17 +93,73 @@ def create_access_token(data: dict, expires_delta: int | None = None):
     return encoded_jwt
 
 
+def create_claims_token(user: User, group_version: int, expires_delta: int) -> str:
+    """
+    Create an access token that carries the claims needed to build the user of a
+    request without a database query. The claims are only valid as long as the
+    group version matches the current version, see UserGroupVersion.
+
+    Args:
+        user (User): The authenticated user
+        group_version (int): The current group version
+        expires_delta (int): The lifetime of the token in minutes
+
+    Returns:
+        str: The encoded token
+    """
+    claims = {
+        "email": user.email,
+        "username": user.username,
+        "groups": user.groups,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "owner_groups": user.owner_groups,
+        "access_groups": user.access_groups,
+        "gv": group_version,
+    }
+    if user.id is not None:
+        claims["uid"] = str(user.id)
+    return create_access_token(claims, expires_delta=expires_delta)
+
+
+def get_user_from_claims(claims: dict) -> User:
+    """
+    Build the user from the claims of a claims-carrying token.
+
+    Args:
+        claims (dict): The verified claims of the token
+
+    Returns:
+        User: The user
+    """
+    return User(
+        _id=claims.get("uid"),
+        email=claims["email"],
+        username=claims.get("username"),
+        groups=claims["groups"],
+        first_name=claims["first_name"],
+        last_name=claims["last_name"],
+        owner_groups=claims["owner_groups"],
+        access_groups=claims.get("access_groups", []),
+    )
+
+
 def decode_token(token: str):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if isinstance(token, str):
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
     try:
         payload = jwt.decode(token, get_secret_key(), algorithms=[ALGORITHM])
-        return payload
     except InvalidTokenError as exc:
         raise credentials_exception from exc
+    token_cache.add(token, payload)
+    return payload
 
 
 async def get_current_user(
@@ -143,4 +202,5 @@ def get_current_user_sync(token: str) -> UserInfo:
             raise credentials_exception
     except Exception as exc:
         raise credentials_exception from exc
-    return UserInfo(email=email, token=token)
+    claims = payload if "gv" in payload else None
+    return UserInfo(email=email, token=token, claims=claims)
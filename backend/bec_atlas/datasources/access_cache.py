@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable
+
+from bec_lib import messages
+from bec_lib.logger import bec_logger
+
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+
+if TYPE_CHECKING:  # pragma: no cover
+    from bec_lib.redis_connector import MessageObject, RedisConnector
+
+logger = bec_logger.logger
+
+
+class AccessDecisionCache:
+    """
+    In-memory cache for resolved access decisions per deployment. Entries are
+    invalidated per deployment, either locally or on all API workers through a
+    Redis channel. Entries additionally expire after a fixed time as a safety net.
+
+    To avoid storing decisions that were resolved from outdated data, readers
+    fetch the deployment's generation before resolving a decision and pass it
+    to set. Decisions for an invalidated generation are dropped.
+    """
+
+    def __init__(self, connector: RedisConnector, max_size: int = 10000, ttl: float = 300):
+        """
+        Args:
+            connector (RedisConnector): The redis connector used to distribute invalidations
+            max_size (int): The maximum number of cached decisions
+            ttl (float): The time in seconds after which a decision expires
+        """
+        self.connector = connector
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._global_generation = 0
+        self._lock = threading.Lock()
+
+    def start_listener(self):
+        """
+        Start listening for invalidations published by other API workers.
+        """
+        self.connector.register(
+            RedisAtlasEndpoints.bec_access_updates(), cb=self._on_invalidation, parent=self
+        )
+
+    @staticmethod
+    def _on_invalidation(msg: MessageObject, parent: AccessDecisionCache):
+        deployment_id = msg.value.value.get("deployment_id")
+        parent.invalidate(deployment_id)
+
+    def generation(self, deployment_id: str) -> int:
+        """
+        Get the current generation of the cached decisions for a deployment.
+
+        Args:
+            deployment_id (str): The deployment id
+
+        Returns:
+            int: The generation
+        """
+        with self._lock:
+            return self._generation(deployment_id)
+
+    def _generation(self, deployment_id: str) -> int:
+        # both counters only increase, so their sum changes on any invalidation
+        return self._global_generation + self._generations.get(deployment_id, 0)
+
+    def get(self, deployment_id: str, key: Hashable) -> Any | None:
+        """
+        Get a cached decision.
+
+        Args:
+            deployment_id (str): The deployment id
+            key (Hashable): The key of the decision within the deployment, e.g. the user
+
+        Returns:
+            Any | None: The cached decision or None if no valid decision is cached
+        """
+        with self._lock:
+            entry = self._entries.get((deployment_id, key))
+            if entry is None:
+                return None
+            expires_at, decision = entry
+            if expires_at < time.monotonic():
+                del self._entries[(deployment_id, key)]
+                return None
+            return decision
+
+    def set(self, deployment_id: str, key: Hashable, decision: Any, generation: int):
+        """
+        Cache a decision.
+
+        Args:
+            deployment_id (str): The deployment id
+            key (Hashable): The key of the decision within the deployment, e.g. the user
+            decision (Any): The decision to cache
+            generation (int): The generation of the deployment at the time the decision
+                was resolved. If the deployment was invalidated since, the decision is dropped.
+        """
+        with self._lock:
+            if self._generation(deployment_id) != generation:
+                return
+            self._entries[(deployment_id, key)] = (time.monotonic() + self.ttl, decision)
+            self._entries.move_to_end((deployment_id, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, deployment_id: str | None = None, broadcast: bool = False):
+        """
+        Invalidate the cached decisions of a deployment.
+
+        Args:
+            deployment_id (str | None): The deployment id. If None, all decisions are invalidated.
+            broadcast (bool): If True, the invalidation is also sent to all other API workers.
+        """
+        with self._lock:
+            if deployment_id is None:
+                self._global_generation += 1
+                self._entries.clear()
+            else:
+                deployment_id = str(deployment_id)
+                self._generations[deployment_id] = self._generations.get(deployment_id, 0) + 1
+                for entry_key in [k for k in self._entries if k[0] == deployment_id]:
+                    del self._entries[entry_key]
+        if broadcast:
+            self.publish_invalidation(self.connector, deployment_id)
+
+    @staticmethod
+    def publish_invalidation(connector: RedisConnector, deployment_id: str | None):
+        """
+        Send an invalidation to all API workers, e.g. from a process without a cache.
+
+        Args:
+            connector (RedisConnector): The redis connector
+            deployment_id (str | None): The deployment id. If None, all decisions are invalidated.
+        """
+        msg = messages.VariableMessage(value={"deployment_id": deployment_id})
+        connector.send(RedisAtlasEndpoints.bec_access_updates(), msg)
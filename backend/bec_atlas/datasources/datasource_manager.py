@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from bec_lib.logger import bec_logger
 
+from bec_atlas.datasources.access_cache import AccessDecisionCache
+from bec_atlas.datasources.group_version import UserGroupVersion
 from bec_atlas.datasources.mongodb.mongodb import MongoDBDatasource
 from bec_atlas.datasources.redis_datasource import RedisDatasource
 from bec_atlas.ingestor.scilog_logbook_manager import SciLogLogbookManager
@@ -17,10 +19,16 @@ class DatasourceManager:
         self._scilog_logbook_manager: SciLogLogbookManager = SciLogLogbookManager(
             config=config["scilog"]
         )
+        self._access_cache = AccessDecisionCache(self._redis.connector)
+        self._group_version = UserGroupVersion(self._redis.client, self._redis.async_connector)
 
     def connect(self):
         self.redis.connect()
         self.mongodb.connect()
+        if self.mongodb.functional_accounts_changed:
+            # invalidate the claims of tokens issued to changed or removed accounts
+            self.group_version.bump_sync()
+        self.access_cache.start_listener()
 
     @property
     def redis(self) -> RedisDatasource:
@@ -40,6 +48,14 @@ class DatasourceManager:
             raise RuntimeError("SciLog Logbook Manager not loaded")
         return self._scilog_logbook_manager
 
+    @property
+    def access_cache(self) -> AccessDecisionCache:
+        return self._access_cache
+
+    @property
+    def group_version(self) -> UserGroupVersion:
+        return self._group_version
+
     def shutdown(self):
         self._redis.shutdown()
         self._mongodb.shutdown()
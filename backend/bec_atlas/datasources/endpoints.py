@@ -30,6 +30,20 @@ class RedisAtlasEndpoints:
         """
         return f"internal/deployment/{deployment}/{host_id}/state"
 
+    @staticmethod
+    def websocket_state_index(deployment: str):
+        """
+        Endpoint for the set of websocket state keys of a deployment. It is used to
+        look up the state of all backend hosts without scanning the keyspace.
+
+        Args:
+            deployment (str): The deployment name
+
+        Returns:
+            str: The endpoint for the websocket state index
+        """
+        return f"internal/atlas/websocket_state_index/{deployment}"
+
     @staticmethod
     def redis_data(deployment: str, endpoint: str):
         """
@@ -57,6 +71,19 @@ class RedisAtlasEndpoints:
         """
         return f"socketio/rooms/{deployment}/{endpoint}"
 
+    @staticmethod
+    def is_socketio_endpoint_room(room: str) -> bool:
+        """
+        Check if a room is a socketio room for an endpoint.
+
+        Args:
+            room (str): The room name
+
+        Returns:
+            bool: True if the room is a socketio endpoint room
+        """
+        return room.startswith("socketio/rooms/")
+
     @staticmethod
     def redis_request(deployment: str):
         """
@@ -84,6 +111,37 @@ class RedisAtlasEndpoints:
         """
         return f"internal/deployment/{deployment}/request_response/{request_id}"
 
+    @staticmethod
+    def redis_response_cache(deployment: str, key: str):
+        """
+        Endpoint for the cached response of a remote read for a deployment and key.
+        The cache lives outside of the deployment namespace to prevent deployments
+        from writing to it.
+
+        Args:
+            deployment (str): The deployment name
+            key (str): The key in the BEC instance of the deployment
+
+        Returns:
+            str: The endpoint for the cached response
+        """
+        return f"internal/atlas/response_cache/{deployment}/{key}"
+
+    @staticmethod
+    def redis_response_cache_lock(deployment: str, key: str):
+        """
+        Endpoint for the lock that coalesces concurrent remote reads of the same key
+        across all API workers.
+
+        Args:
+            deployment (str): The deployment name
+            key (str): The key in the BEC instance of the deployment
+
+        Returns:
+            str: The endpoint for the lock
+        """
+        return f"internal/atlas/response_cache_lock/{deployment}/{key}"
+
     @staticmethod
     def redis_bec_acl_user(deployment_id: str):
         """
@@ -97,6 +155,28 @@ class RedisAtlasEndpoints:
         """
         return f"internal/deployment/{deployment_id}/bec_access"
 
+    @staticmethod
+    def bec_access_updates():
+        """
+        Endpoint for notifications about updated BEC access of a deployment. All API
+        workers listen to it to invalidate their cached access decisions.
+
+        Returns:
+            str: The endpoint for the BEC access updates
+        """
+        return "internal/atlas/bec_access_updates"
+
+    @staticmethod
+    def user_group_version():
+        """
+        Endpoint for the version counter of the user groups. Claims-carrying access tokens
+        are only trusted as long as their group version matches the counter.
+
+        Returns:
+            str: The endpoint for the user group version
+        """
+        return "internal/atlas/user_group_version"
+
     @staticmethod
     def deployments():
         """
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis import Redis
+    from redis.asyncio import Redis as AsyncRedis
+
+
+class UserGroupVersion:
+    """
+    Version counter of the user groups, shared by all API workers through Redis. The
+    counter is bumped whenever the groups of a user change or a user is removed, which
+    invalidates the claims of all access tokens issued before.
+
+    The counter is read at most once per ttl per worker, so bumps take effect on all
+    workers within ttl seconds. Request handlers use the async methods, so that the
+    event loop is not blocked by Redis; bump_sync is meant for worker threads and
+    the startup.
+    """
+
+    def __init__(self, client: Redis, async_connector: AsyncRedis, ttl: float = 1):
+        """
+        Args:
+            client (Redis): The synchronous redis client
+            async_connector (AsyncRedis): The async redis client
+            ttl (float): The time in seconds a read version is reused
+        """
+        self.client = client
+        self.async_connector = async_connector
+        self.ttl = ttl
+        self._version: int | None = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    async def get(self) -> int:
+        """
+        Get the current group version.
+
+        Returns:
+            int: The group version
+        """
+        with self._lock:
+            if self._version is not None and self._expires > time.monotonic():
+                return self._version
+        version = await self.async_connector.get(RedisAtlasEndpoints.user_group_version())
+        return self._set(int(version or 0))
+
+    async def bump(self) -> int:
+        """
+        Increment the group version.
+
+        Returns:
+            int: The new group version
+        """
+        version = await self.async_connector.incr(RedisAtlasEndpoints.user_group_version())
+        return self._set(version)
+
+    def bump_sync(self) -> int:
+        """
+        Increment the group version from a synchronous context, e.g. a worker thread.
+
+        Returns:
+            int: The new group version
+        """
+        version = self.client.incr(RedisAtlasEndpoints.user_group_version())
+        return self._set(version)
+
+    def _set(self, version: int) -> int:
+        with self._lock:
+            self._version = version
+            self._expires = time.monotonic() + self.ttl
+        return version
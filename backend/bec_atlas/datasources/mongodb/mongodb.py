@@ -2,23 +2,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import TYPE_CHECKING, Literal, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Type, TypeVar
 
 import pymongo
 from bec_lib.logger import bec_logger
+from bson import ObjectId
+from pwdlib.exceptions import UnknownHashError
 from pydantic import BaseModel
-from pymongo import database
+from pymongo import DeleteMany, InsertOne, UpdateMany, database
 
-from bec_atlas.authentication import get_password_hash
+from bec_atlas.authentication import get_password_hash, password_hash
 from bec_atlas.datasources.mongodb.aggregation_pipelines import build_aggregation_pipeline
 from bec_atlas.model.model import Deployments, Session, User, UserCredentials
 from bec_atlas.router.base_router import CollectionQueryParamsWithInclude
 
 logger = bec_logger.logger
 
-if TYPE_CHECKING:
-    from bson import ObjectId
-
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -27,6 +27,7 @@ class MongoDBDatasource:
         self.config = config
         self.client = None
         self.db: database.Database = None
+        self.functional_accounts_changed = False
 
     def connect(self, include_setup: bool = True):
         """
@@ -82,7 +83,14 @@ class MongoDBDatasource:
 
     def load_functional_accounts(self):
         """
-        Load the functional accounts to the database.
+        Synchronize the functional accounts of the deployment file with the database.
+        The synchronization is idempotent: passwords are verified against the stored
+        hashes and only rehashed if they changed or the hash parameters were upgraded.
+        The verification runs on a thread pool and all changes are written with one
+        bulk operation per collection.
+
+        Sets functional_accounts_changed to True if accounts were added or removed or
+        their groups or passwords changed.
         """
         functional_accounts_file = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
@@ -96,45 +104,88 @@ class MongoDBDatasource:
         with open(functional_accounts_file, "r", encoding="utf-8") as file:
             functional_accounts = json.load(file)
         for account in functional_accounts:
-            account["groups"].append("atlas_func_account")
-            account = list(set(account["groups"]))
+            account["groups"] = list(dict.fromkeys([*account["groups"], "atlas_func_account"]))
 
-        existing_accounts = list(
-            self.db["users"].find({"groups": {"$in": ["atlas_func_account"]}}, {"email": 1})
-        )
+        existing_accounts = {
+            account["email"]: account
+            for account in self.db["users"].find({"groups": {"$in": ["atlas_func_account"]}})
+        }
+        stored_hashes = {
+            credentials["user_id"]: credentials["password"]
+            for credentials in self.db["user_credentials"].find(
+                {"user_id": {"$in": [account["_id"] for account in existing_accounts.values()]}}
+            )
+        }
 
-        for account in functional_accounts:
-            # check if the account already exists in the database
-            password = account.pop("password")
-            password_hash = get_password_hash(password)
-
-            result = None
-            for existing_account in existing_accounts:
-                if existing_account["email"] == account["email"]:
-                    result = existing_account
-                    existing_accounts.remove(existing_account)
-                    break
-            if result is not None:
-                # account already exists; check if the password is the same
-                credentials = self.db["user_credentials"].find_one({"user_id": result["_id"]})
-                if credentials is not None and credentials["password"] == password_hash:
-                    continue
-                # update the password
-                self.db["user_credentials"].update_one(
-                    {"user_id": result["_id"]}, {"$set": {"password": password_hash}}
+        def check_password(account: dict) -> tuple[str | None, bool]:
+            # returns the new hash, if any, and whether the password changed
+            existing_account = existing_accounts.get(account["email"])
+            stored_hash = stored_hashes.get(existing_account["_id"]) if existing_account else None
+            if stored_hash is not None:
+                try:
+                    valid, updated_hash = password_hash.verify_and_update(
+                        account["password"], stored_hash
+                    )
+                    if valid:
+                        return updated_hash, False
+                except UnknownHashError:
+                    pass
+            return get_password_hash(account["password"]), True
+
+        # argon2 releases the GIL, so the accounts are verified in parallel
+        with ThreadPoolExecutor(max_workers=min(8, len(functional_accounts) or 1)) as executor:
+            password_checks = list(executor.map(check_password, functional_accounts))
+
+        # the update filters match at most one document per account
+        user_ops = []
+        credential_ops = []
+        self.functional_accounts_changed = False
+        for account, (new_hash, password_changed) in zip(functional_accounts, password_checks):
+            account.pop("password")
+            existing_account = existing_accounts.pop(account["email"], None)
+            if existing_account is None:
+                user = User(**account).__dict__
+                user.pop("id")
+                user["_id"] = ObjectId()
+                user_ops.append(InsertOne(user))
+                credentials = UserCredentials(
+                    owner_groups=["admin"], user_id=user["_id"], password=new_hash
                 )
+                credential_ops.append(InsertOne(credentials.__dict__))
+                self.functional_accounts_changed = True
                 continue
-            user = User(**account)
-            user = self.db["users"].insert_one(user.__dict__)
-            credentials = UserCredentials(
-                owner_groups=["admin"], user_id=user.inserted_id, password=password_hash
-            )
-            self.db["user_credentials"].insert_one(credentials.__dict__)
+            if set(existing_account["groups"]) != set(account["groups"]):
+                user_ops.append(
+                    UpdateMany(
+                        {"_id": existing_account["_id"]}, {"$set": {"groups": account["groups"]}}
+                    )
+                )
+                self.functional_accounts_changed = True
+            if new_hash is not None:
+                credential_ops.append(
+                    UpdateMany(
+                        {"user_id": existing_account["_id"]},
+                        {
+                            "$set": {"password": new_hash},
+                            "$setOnInsert": {"owner_groups": ["admin"], "access_groups": []},
+                        },
+                        upsert=True,
+                    )
+                )
+                # rehashing an unchanged password does not invalidate issued tokens
+                self.functional_accounts_changed |= password_changed
 
         # remove any accounts that are no longer in the functional accounts file
-        for account in existing_accounts:
-            self.db["users"].delete_one({"_id": account["_id"]})
-            self.db["user_credentials"].delete_one({"user_id": account["_id"]})
+        removed_ids = [account["_id"] for account in existing_accounts.values()]
+        if removed_ids:
+            user_ops.append(DeleteMany({"_id": {"$in": removed_ids}}))
+            credential_ops.append(DeleteMany({"user_id": {"$in": removed_ids}}))
+            self.functional_accounts_changed = True
+
+        if user_ops:
+            self.db["users"].bulk_write(user_ops, ordered=False)
+        if credential_ops:
+            self.db["user_credentials"].bulk_write(credential_ops, ordered=False)
 
     def get_user_by_email(self, email: str) -> User | None:
         """
@@ -8,6 +8,7 @@ from bec_lib.endpoints import MessageEndpoints
 from bec_lib.redis_connector import RedisConnector
 from bec_lib.serialization import msgpack
 from bson import ObjectId
+from redis import Redis
 from redis.asyncio import Redis as AsyncRedis
 from redis.exceptions import AuthenticationError, ResponseError
 
@@ -65,6 +66,17 @@ class RedisDatasource:
                 username=config.get("username"),
                 password=config.get("password"),
             )
+        # plain redis client for commands the BEC connector does not expose, e.g. blocking
+        # reads of several streams
+        if config.get("client_instance"):
+            self.client = config.get("client_instance")
+        else:
+            self.client = Redis(
+                host=config.get("host"),
+                port=config.get("port"),
+                username=config.get("username"),
+                password=config.get("password"),
+            )
         self.connector.set_retry_enabled(True)
         print("Connected to Redis")
 
@@ -195,3 +207,4 @@ class RedisDatasource:
 
     def shutdown(self):
         self.connector.shutdown()
+        self.client.close()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import uuid
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from bec_lib.logger import bec_logger
+
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis.asyncio import Redis as AsyncRedis
+
+logger = bec_logger.logger
+
+# delete the lock only if it is still held with the given token, so that a lock that
+# expired and was acquired by another worker is not released
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisResponseCache:
+    """
+    Short-lived cache for responses of remote BEC reads. The cache is opt-in per key
+    pattern and stored in Redis so that it is shared across all API workers.
+    Concurrent reads of the same key are coalesced into a single upstream request,
+    both within a worker and across workers.
+
+    The cache does not perform any access checks. Callers must validate the user's
+    access before serving a cached value.
+    """
+
+    LOCK_TIMEOUT = 10
+    POLL_INTERVAL = 0.02
+
+    def __init__(self, redis: AsyncRedis, patterns: dict[str, float] | None = None):
+        """
+        Args:
+            redis (AsyncRedis): The async redis client
+            patterns (dict[str, float] | None): Mapping of glob key patterns to the cache
+                TTL in seconds. Keys that do not match any pattern are not cached.
+        """
+        self.redis = redis
+        self.patterns = patterns or {}
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._release_lock = redis.register_script(RELEASE_LOCK_SCRIPT)
+
+    def get_ttl(self, key: str) -> float | None:
+        """
+        Get the cache TTL for a key.
+
+        Args:
+            key (str): The key in Redis
+
+        Returns:
+            float | None: The TTL in seconds or None if the key should not be cached
+        """
+        for pattern, ttl in self.patterns.items():
+            if fnmatch.fnmatchcase(key, pattern):
+                return ttl
+        return None
+
+    async def get_or_fetch(
+        self, deployment: str, key: str, ttl: float, fetch: Callable[[], Awaitable[str | None]]
+    ) -> str | None:
+        """
+        Get the cached response for a key or fetch it using the provided coroutine function.
+        Responses of None are not cached.
+
+        Args:
+            deployment (str): The deployment id
+            key (str): The key in Redis
+            ttl (float): The cache TTL in seconds
+            fetch (Callable[[], Awaitable[str | None]]): Coroutine function to fetch the response
+
+        Returns:
+            str | None: The response
+        """
+        cache_key = RedisAtlasEndpoints.redis_response_cache(deployment, key)
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._get_or_fetch(deployment, key, ttl, fetch))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        # shield the shared task so that a cancelled request does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _get_or_fetch(
+        self, deployment: str, key: str, ttl: float, fetch: Callable[[], Awaitable[str | None]]
+    ) -> str | None:
+        cache_key = RedisAtlasEndpoints.redis_response_cache(deployment, key)
+        cached = await self.redis.get(cache_key)
+        if cached is not None:
+            return cached.decode()
+
+        lock_key = RedisAtlasEndpoints.redis_response_cache_lock(deployment, key)
+        token = uuid.uuid4().hex
+        if await self.redis.set(lock_key, token, nx=True, px=int(self.LOCK_TIMEOUT * 1000)):
+            try:
+                out = await fetch()
+                if out is not None:
+                    await self.redis.set(cache_key, out, px=max(int(ttl * 1000), 1))
+                return out
+            finally:
+                await self._release_lock(keys=[lock_key], args=[token])
+
+        # another worker is already fetching the key; wait for its result
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.LOCK_TIMEOUT
+        while loop.time() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            cached = await self.redis.get(cache_key)
+            if cached is not None:
+                return cached.decode()
+            if not await self.redis.exists(lock_key):
+                break
+        logger.debug(f"No cached response for {key} after waiting for lock; fetching directly")
+        return await fetch()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from bec_lib.logger import bec_logger
+from bec_lib.serialization import MsgpackSerialization
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis import Redis
+
+logger = bec_logger.logger
+
+
+def stream_id_key(stream_id: str) -> tuple[int, int]:
+    """
+    Get a sortable key for a redis stream id.
+
+    Args:
+        stream_id (str): The stream id, e.g. "1700000000000-0"
+
+    Returns:
+        tuple[int, int]: The timestamp and sequence number of the id
+    """
+    timestamp, _, sequence = stream_id.partition("-")
+    return int(timestamp), int(sequence or 0)
+
+
+class StreamReader:
+    """
+    Reader for a changing set of redis streams. In contrast to the subscriptions of
+    the BEC connector, each stream is read from an explicit start id and the callback
+    receives the stream id of every entry, so that consumers can resume a stream
+    without gaps.
+
+    The streams are read with a single blocking XREAD in a background thread. The
+    callback is called on this thread.
+    """
+
+    def __init__(self, redis: Redis, cb: Callable[..., None], block: int = 200, count: int = 100):
+        """
+        Args:
+            redis (Redis): The synchronous redis client
+            cb (Callable[..., None]): Callback called with the stream id, the decoded
+                entry and the keyword arguments the stream was added with
+            block (int): The time in milliseconds a read blocks if no entries are available
+            count (int): The maximum number of entries read per stream and read
+        """
+        self.redis = redis
+        self.cb = cb
+        self.block = block
+        self.count = count
+        self._streams: dict[str, str] = {}
+        self._kwargs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._shutdown_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, stream: str, last_id: str, **kwargs) -> str:
+        """
+        Start reading a stream. The call does not access redis, so that it can be used
+        from an event loop.
+
+        Args:
+            stream (str): The stream key
+            last_id (str): The id after which entries are read, e.g. the id of the most
+                recent entry to only read new entries or "0-0" to read the whole stream
+            **kwargs: Additional keyword arguments passed to the callback
+
+        Returns:
+            str: The id after which entries are read
+        """
+        with self._lock:
+            self._streams[stream] = last_id
+            self._kwargs[stream] = kwargs
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._read_loop, name="stream_reader", daemon=True
+                )
+                self._thread.start()
+        return last_id
+
+    def remove(self, stream: str):
+        """
+        Stop reading a stream.
+
+        Args:
+            stream (str): The stream key
+        """
+        with self._lock:
+            self._streams.pop(stream, None)
+            self._kwargs.pop(stream, None)
+
+    def _read_loop(self):
+        while not self._shutdown_event.is_set():
+            with self._lock:
+                streams = dict(self._streams)
+            if not streams:
+                self._shutdown_event.wait(self.block / 1000)
+                continue
+            try:
+                response = self.redis.xread(streams, count=self.count, block=self.block)
+            except RedisConnectionError as exc:
+                logger.error(f"Failed to read streams: {exc}")
+                self._shutdown_event.wait(1)
+                continue
+            for stream, entries in response or []:
+                stream = stream.decode() if isinstance(stream, bytes) else stream
+                self._handle_entries(stream, streams[stream], entries)
+
+    def _handle_entries(self, stream: str, read_id: str, entries: list):
+        for entry_id, fields in entries:
+            entry_id = entry_id.decode()
+            with self._lock:
+                # the stream was removed or re-added while reading
+                if self._streams.get(stream) != read_id:
+                    return
+                self._streams[stream] = entry_id
+                kwargs = self._kwargs[stream]
+            read_id = entry_id
+            try:
+                entry = {
+                    key.decode(): MsgpackSerialization.loads(val) for key, val in fields.items()
+                }
+            except RuntimeError as exc:
+                logger.error(f"Skipping undecodable stream entry {entry_id} on {stream}: {exc}")
+                continue
+            try:
+                self.cb(entry_id, entry, **kwargs)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(f"Error in stream callback for {stream}")
+
+    def shutdown(self):
+        """
+        Stop the reader thread.
+        """
+        self._shutdown_event.set()
+        if self._thread is not None:
+            self._thread.join()
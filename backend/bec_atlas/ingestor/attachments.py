@@ -0,0 +1,313 @@
+"""
+Preparation of the file attachments of messaging service messages. Attachments are
+checked against size limits, optionally downscaled and deduplicated by their content
+hash, so that the same plot sent to several services is only processed once.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator
+
+from bec_lib import messages
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# a multiple of 3 bytes, so that the base64 chunks can be concatenated without padding
+ENCODING_CHUNK_SIZE = 3 * 2**14
+DOWNSCALE_FORMATS = {"image/png": "PNG", "image/jpeg": "JPEG", "image/webp": "WEBP"}
+
+
+@dataclass
+class PreparedAttachment:
+    digest: str
+    filename: str
+    mime_type: str
+    data: bytes
+
+    @property
+    def data_uri_prefix(self) -> str:
+        return f"data:{self.mime_type};filename={self.filename};base64,"
+
+    def iter_base64(self) -> Iterator[bytes]:
+        """
+        Encode the data as base64 in chunks of bounded size.
+
+        Yields:
+            bytes: The base64 encoded chunks
+        """
+        view = memoryview(self.data)
+        for start in range(0, len(view), ENCODING_CHUNK_SIZE):
+            yield base64.b64encode(view[start : start + ENCODING_CHUNK_SIZE])
+
+    def write_to(self, directory: str) -> str:
+        """
+        Write the data to a file in the given directory.
+
+        Args:
+            directory (str): The directory
+
+        Returns:
+            str: The path of the file
+        """
+        file_path = os.path.join(directory, os.path.basename(self.filename))
+        with open(file_path, "wb") as f:
+            f.write(self.data)
+        return file_path
+
+
+class AttachmentPipeline:
+    """
+    Size-bounded preparation of file attachments with a content-hash cache.
+    Images larger than max_image_dimension are downscaled if Pillow is installed, e.g.
+    through the images extra of the package.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10 * 2**20,
+        max_message_size: int = 25 * 2**20,
+        max_image_dimension: int | None = 2048,
+        cache_size: int = 64 * 2**20,
+    ):
+        """
+        Args:
+            max_size (int): The maximum size in bytes of a single attachment
+            max_message_size (int): The maximum total size in bytes of the attachments of a message
+            max_image_dimension (int | None): The maximum width and height in pixels of images.
+                If None, images are not downscaled.
+            cache_size (int): The maximum total size in bytes of the cached attachments
+        """
+        self.max_size = max_size
+        self.max_message_size = max_message_size
+        self.max_image_dimension = max_image_dimension
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, PreparedAttachment] = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.cache_hits = 0
+        self.downscaled = 0
+        self.rejected = 0
+        if Image is None and max_image_dimension is not None:
+            logger.warning(
+                "Pillow is not installed, images are not downscaled and are subject to the size limits as they are."
+            )
+
+    def prepare(
+        self, msg: messages.MessagingServiceMessage
+    ) -> list[tuple[messages.MessagingServiceFileContent, PreparedAttachment]]:
+        """
+        Prepare the file attachments of a message. Attachments that exceed the size limits
+        are skipped.
+
+        Args:
+            msg (messages.MessagingServiceMessage): The message
+
+        Returns:
+            list[tuple[messages.MessagingServiceFileContent, PreparedAttachment]]: The message
+                parts and their prepared attachments
+        """
+        out = []
+        total_size = 0
+        for msg_part in msg.message:
+            if not isinstance(msg_part, messages.MessagingServiceFileContent):
+                continue
+            attachment = self.prepare_file(msg_part)
+            if attachment is None:
+                continue
+            if total_size + len(attachment.data) > self.max_message_size:
+                self.rejected += 1
+                logger.warning(
+                    f"Skipping attachment {msg_part.filename}: the attachments of the message exceed {self.max_message_size} bytes."
+                )
+                continue
+            total_size += len(attachment.data)
+            out.append((msg_part, attachment))
+        return out
+
+    def prepare_file(
+        self, msg_part: messages.MessagingServiceFileContent
+    ) -> PreparedAttachment | None:
+        """
+        Prepare a single file attachment.
+
+        Args:
+            msg_part (messages.MessagingServiceFileContent): The file content
+
+        Returns:
+            PreparedAttachment | None: The prepared attachment or None if it exceeds the size limit
+        """
+        digest = hashlib.sha256(msg_part.data).hexdigest()
+        with self._lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                self.cache_hits += 1
+        if cached is not None:
+            if cached.filename == msg_part.filename and cached.mime_type == msg_part.mime_type:
+                return cached
+            return PreparedAttachment(
+                digest=digest,
+                filename=msg_part.filename,
+                mime_type=msg_part.mime_type,
+                data=cached.data,
+            )
+
+        data = self._downscale(msg_part)
+        if len(data) > self.max_size:
+            self.rejected += 1
+            logger.warning(
+                f"Skipping attachment {msg_part.filename}: {len(data)} bytes exceed the limit of {self.max_size} bytes."
+            )
+            return None
+        attachment = PreparedAttachment(
+            digest=digest, filename=msg_part.filename, mime_type=msg_part.mime_type, data=data
+        )
+        with self._lock:
+            self.processed += 1
+            if digest not in self._cache and len(data) <= self.cache_size:
+                self._cache[digest] = attachment
+                self._cache_bytes += len(data)
+                while self._cache_bytes > self.cache_size:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= len(evicted.data)
+        return attachment
+
+    def _downscale(self, msg_part: messages.MessagingServiceFileContent) -> bytes:
+        """
+        Downscale an image if it exceeds the maximum dimension.
+
+        Args:
+            msg_part (messages.MessagingServiceFileContent): The file content
+
+        Returns:
+            bytes: The downscaled image or the original data
+        """
+        image_format = DOWNSCALE_FORMATS.get(msg_part.mime_type)
+        if Image is None or self.max_image_dimension is None or image_format is None:
+            return msg_part.data
+        try:
+            with Image.open(io.BytesIO(msg_part.data)) as image:
+                if max(image.size) <= self.max_image_dimension:
+                    return msg_part.data
+                image.thumbnail((self.max_image_dimension, self.max_image_dimension))
+                out = io.BytesIO()
+                image.save(out, format=image_format)
+        except Exception as exc:
+            logger.warning(f"Failed to downscale attachment {msg_part.filename}: {exc}")
+            return msg_part.data
+        self.downscaled += 1
+        return out.getvalue()
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Get the pipeline metrics.
+
+        Returns:
+            dict[str, int]: The number of processed, deduplicated, downscaled and rejected
+                attachments and the number and size of the cached attachments
+        """
+        return {
+            "processed": self.processed,
+            "cache_hits": self.cache_hits,
+            "downscaled": self.downscaled,
+            "rejected": self.rejected,
+            "cached": len(self._cache),
+            "cached_bytes": self._cache_bytes,
+        }
+
+
+class StreamingJsonBody:
+    """
+    File-like JSON request body. Prepared attachments in the payload are serialized as
+    base64 data URIs while the body is read, so that the encoded attachments are never
+    held in memory as a whole.
+    """
+
+    def __init__(self, payload: dict):
+        """
+        Args:
+            payload (dict): The JSON payload, possibly containing PreparedAttachment values
+        """
+        attachments: dict[str, PreparedAttachment] = {}
+
+        def _replace(obj):
+            if isinstance(obj, PreparedAttachment):
+                placeholder = f"@@attachment-{uuid.uuid4().hex}@@"
+                attachments[placeholder] = obj
+                return placeholder
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+        text = json.dumps(payload, default=_replace)
+        self._parts: list[bytes | PreparedAttachment] = []
+        self._length = 0
+        for placeholder, attachment in attachments.items():
+            before, text = text.split(f'"{placeholder}"', 1)
+            self._add_text(before)
+            self._parts.append(attachment)
+            self._length += len(self._get_prefix(attachment)) + 2
+            self._length += 4 * ((len(attachment.data) + 2) // 3)
+        self._add_text(text)
+        self._chunks = self._iter_chunks()
+        self._buffer = bytearray()
+
+    def _add_text(self, text: str):
+        data = text.encode()
+        self._parts.append(data)
+        self._length += len(data)
+
+    @staticmethod
+    def _get_prefix(attachment: PreparedAttachment) -> bytes:
+        # the prefix contains the file name, which may have to be escaped
+        return json.dumps(attachment.data_uri_prefix)[1:-1].encode()
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            yield b'"' + self._get_prefix(part)
+            yield from part.iter_base64()
+            yield b'"'
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._iter_chunks()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read the next bytes of the body.
+
+        Args:
+            size (int): The maximum number of bytes to read; -1 to read the remaining body
+
+        Returns:
+            bytes: The data; empty at the end of the body
+        """
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
@@ -4,7 +4,9 @@ import secrets
 import pymongo
 import yaml
 from bec_lib import messages
+from bec_lib.redis_connector import RedisConnector
 
+from bec_atlas.datasources.access_cache import AccessDecisionCache
 from bec_atlas.model import Deployments, Realm, Session
 
 
@@ -13,6 +15,8 @@ class DeploymentIngestor:
     The DeploymentIngestor class is responsible for loading deployment data into the MongoDB database.
     It is executed as part of the deployment procedure, loading the deployment file and creating the
     database entries for realms and deployments as well as the default session if it does not exist.
+    If a redis config is given, the API workers are notified about deployments whose access changed,
+    so that they drop their cached access decisions.
     """
 
     def __init__(self, config: dict):
@@ -20,11 +24,39 @@ class DeploymentIngestor:
         self.client = pymongo.MongoClient(config.get("host"), config.get("port"))
         self.db = self.client["bec_atlas"]
         self._data = {}
+        self._updated_access = set()
 
     def load(self, data):
         self._data = data
         self._load_realm()
         self._load_deployments()
+        self._publish_access_updates()
+
+    def _publish_access_updates(self):
+        """
+        Invalidate the cached access decisions of all deployments whose access was written.
+        """
+        if not self._updated_access:
+            return
+        redis_config = self.config.get("redis")
+        if not redis_config:
+            print(
+                "No redis config given; cached access decisions of the API workers expire"
+                " after their TTL."
+            )
+            self._updated_access.clear()
+            return
+        connector = RedisConnector(f"{redis_config.get('host')}:{redis_config.get('port')}")
+        try:
+            if redis_config.get("username"):
+                connector.authenticate(
+                    username=redis_config.get("username"), password=redis_config.get("password")
+                )
+            for deployment_id in self._updated_access:
+                AccessDecisionCache.publish_invalidation(connector, str(deployment_id))
+        finally:
+            connector.shutdown()
+        self._updated_access.clear()
 
     def _load_realm(self):
         for realm_name, realm_data in self._data.items():
@@ -143,6 +175,7 @@ class DeploymentIngestor:
                         "remote_write_access": [],
                     }
                     self.db["deployment_access"].insert_one(deployment_access)
+                    self._updated_access.add(deployment.id)
                 else:
                     # Patch the access groups if necessary
                     if existing_deployment_access[
@@ -160,6 +193,7 @@ class DeploymentIngestor:
                                 }
                             },
                         )
+                        self._updated_access.add(deployment.id)
 
                 # Create messaging_config if it does not exist
                 if not existing_deployment.get("messaging_config"):
@@ -7,6 +7,7 @@ from bec_lib import messages
 from bec_lib.endpoints import EndpointInfo, MessageEndpoints
 from bec_lib.logger import bec_logger
 
+from bec_atlas.ingestor.attachments import AttachmentPipeline
 from bec_atlas.ingestor.ingestor_base import IngestorBase
 from bec_atlas.ingestor.scilog_logbook_manager import SciLogLogbookManager
 from bec_atlas.ingestor.signal_manager import SignalManager
@@ -18,8 +19,15 @@ class MessageServiceIngestor(IngestorBase):
 
     def __init__(self, config: dict):
         super().__init__(config=config)
-        self.signal_manager = SignalManager(self, config.get("signal", {}))
-        self.scilog_manager = SciLogLogbookManager(config.get("scilog", {}))
+        # shared by the messaging services, so that an attachment sent to several services is
+        # only processed once
+        self.attachment_pipeline = AttachmentPipeline(**config.get("attachments", {}))
+        self.signal_manager = SignalManager(
+            self, config.get("signal", {}), attachment_pipeline=self.attachment_pipeline
+        )
+        self.scilog_manager = SciLogLogbookManager(
+            config.get("scilog", {}), attachment_pipeline=self.attachment_pipeline
+        )
         self._deployment_info_cache: dict[str, messages.DeploymentInfoMessage] = {}
         logger.success("Message service ingestor started.")
 
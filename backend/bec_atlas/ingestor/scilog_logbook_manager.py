@@ -16,6 +16,8 @@ import scilog
 from bec_lib import messages
 from scilog import models as scilog_models
 
+from bec_atlas.ingestor.attachments import AttachmentPipeline
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,12 +45,17 @@ class SciLogLogbookManager:
     scilog_base_url = "https://scilog.psi.ch/api/v1"
 
     def __init__(
-        self, config: dict | None = None, token: str | None = None, temp_dir: str | None = None
+        self,
+        config: dict | None = None,
+        token: str | None = None,
+        temp_dir: str | None = None,
+        attachment_pipeline: AttachmentPipeline | None = None,
     ):
         if not token and not config:
             raise ValueError("Either token or config must be provided.")
         self.token = token
         self.temp_dir = temp_dir or "/tmp/scilog_logbook_manager"
+        self.attachment_pipeline = attachment_pipeline or AttachmentPipeline()
         self.config = config
         self.scilog = scilog.SciLog(
             address=self.scilog_base_url,
@@ -176,6 +183,11 @@ class SciLogLogbookManager:
         # Should be patched in the SciLog SDK but for now, we set it directly
         scilog_msg._logbook = self.scilog
 
+        # the message parts are not hashable, so the prepared attachments are keyed by their id
+        attachments = {
+            id(msg_part): attachment
+            for msg_part, attachment in self.attachment_pipeline.prepare(msg)
+        }
         try:
             files = []
             tmp_dir = None
@@ -183,14 +195,14 @@ class SciLogLogbookManager:
                 if isinstance(msg_part, messages.MessagingServiceTextContent):
                     scilog_msg.add_text(msg_part.content)
                 elif isinstance(msg_part, messages.MessagingServiceFileContent):
+                    attachment = attachments.get(id(msg_part))
+                    if attachment is None:
+                        continue
                     # We have to write the file to disk because the SciLog SDK only accepts file paths for attachments.
                     if not tmp_dir:
                         tmp_dir = f"{self.temp_dir}/{uuid.uuid4()}"
                         os.makedirs(tmp_dir, exist_ok=True)
-                    file_name = msg_part.filename
-                    file_path = f"{tmp_dir}/{file_name}"
-                    with open(file_path, "wb") as f:
-                        f.write(msg_part.data)
+                    file_path = attachment.write_to(tmp_dir)
                     files.append(file_path)
                     dimensions = {}
                     if msg_part.width is not None:
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+COALESCABLE_PARAMS = {"message", "groupId", "recipients"}
+# signal-cli JSON-RPC error codes of transient failures: IO errors and rate limits
+RETRYABLE_ERROR_CODES = {-3, -5}
+
+
+class SignalDeliveryError(Exception):
+    """
+    Error returned by the Signal server for a send request.
+    """
+
+    def __init__(self, error: dict):
+        """
+        Args:
+            error (dict): The JSON-RPC error object
+        """
+        super().__init__(error.get("message", error))
+        self.code = error.get("code")
+        self.retryable = self.code in RETRYABLE_ERROR_CODES
+
+
+@dataclass
+class OutgoingMessage:
+    payload: dict
+    enqueued_at: float
+    attempts: int = 0
+
+
+@dataclass
+class RecipientQueue:
+    tokens: float
+    updated: float
+    messages: deque[OutgoingMessage] = field(default_factory=deque)
+    blocked_until: float = 0
+
+
+class SignalOutbox:
+    """
+    Outbound queue for Signal messages. Messages are queued per recipient or group and
+    delivered in order by a background thread, so that callers return immediately even if
+    the Signal server is slow. Each recipient is rate limited by a token bucket, consecutive
+    text messages to the same recipient are coalesced into one message and failed
+    deliveries are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict], None],
+        rate: float = 1,
+        burst: int = 5,
+        coalesce_window: float = 2,
+        max_retries: int = 3,
+        retry_delay: tuple[float, float] = (1, 30),
+        max_queued: int = 1000,
+    ):
+        """
+        Args:
+            send (Callable[[dict], None]): Delivers a JSON-RPC payload and raises on failure
+            rate (float): The number of messages per second sent to a recipient
+            burst (int): The number of messages that can be sent to a recipient at once
+            coalesce_window (float): The maximum time in seconds between the first and the last
+                text message coalesced into one message
+            max_retries (int): The number of retries before a message is dropped
+            retry_delay (tuple[float, float]): The initial and the maximum retry delay in seconds
+            max_queued (int): The maximum number of queued messages per recipient
+        """
+        self.send = send
+        self.rate = rate
+        self.burst = burst
+        self.coalesce_window = coalesce_window
+        self.max_retries = max_retries
+        self.retry_delay = tuple(retry_delay)
+        self.max_queued = max_queued
+        self._queues: dict[str, RecipientQueue] = {}
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self.enqueued = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.retried = 0
+        self.dropped = 0
+        self._latency_count = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="signal_outbox")
+        self._thread.start()
+
+    def enqueue(self, payload: dict):
+        """
+        Queue a JSON-RPC send payload for delivery.
+
+        Args:
+            payload (dict): The payload to send.
+        """
+        key = self._get_key(payload)
+        now = time.monotonic()
+        with self._condition:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = RecipientQueue(tokens=self.burst, updated=now)
+            if len(queue.messages) >= self.max_queued:
+                self.dropped += 1
+                print(f"Signal outbox for {key} is full, dropping message.")
+                return
+            queue.messages.append(OutgoingMessage(payload=payload, enqueued_at=now))
+            self.enqueued += 1
+            self._condition.notify()
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        Get the outbox metrics.
+
+        Returns:
+            dict[str, int | float]: The number of queued, enqueued, sent, coalesced, retried
+                and dropped messages and the mean and maximum delivery latency in seconds
+        """
+        with self._condition:
+            queued = sum(len(queue.messages) for queue in self._queues.values())
+            return {
+                "queued": queued,
+                "enqueued": self.enqueued,
+                "sent": self.sent,
+                "coalesced": self.coalesced,
+                "retried": self.retried,
+                "dropped": self.dropped,
+                "latency_mean": (
+                    self._latency_sum / self._latency_count if self._latency_count else 0.0
+                ),
+                "latency_max": self._latency_max,
+            }
+
+    def shutdown(self, timeout: float | None = 5):
+        """
+        Stop the delivery thread. Messages that are still queued are dropped.
+
+        Args:
+            timeout (float | None): The maximum time in seconds to wait for a running delivery
+        """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    @staticmethod
+    def _get_key(payload: dict) -> str:
+        params = payload.get("params", {})
+        if params.get("groupId"):
+            return f"group:{params['groupId']}"
+        return "recipients:" + ",".join(sorted(params.get("recipients", [])))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._shutdown:
+                    return
+                key, timeout = self._get_next_ready()
+                if key is None:
+                    self._condition.wait(timeout)
+                    continue
+                queue = self._queues.pop(key)
+                # re-insert the queue at the end, so that recipients are served round-robin
+                self._queues[key] = queue
+                message = self._pop_message(queue)
+            self._deliver(key, queue, message)
+
+    def _get_next_ready(self) -> tuple[str | None, float | None]:
+        """
+        Find a recipient with a message that can be sent now. Must be called with the
+        condition held.
+
+        Returns:
+            tuple[str | None, float | None]: The key of the recipient or None and the time in
+                seconds until the next message can be sent or None if nothing is queued
+        """
+        now = time.monotonic()
+        timeout = None
+        for key, queue in list(self._queues.items()):
+            queue.tokens = min(self.burst, queue.tokens + (now - queue.updated) * self.rate)
+            queue.updated = now
+            if not queue.messages:
+                if queue.tokens >= self.burst:
+                    del self._queues[key]
+                continue
+            wait = max(queue.blocked_until - now, (1 - queue.tokens) / self.rate, 0)
+            if wait == 0:
+                return key, None
+            timeout = wait if timeout is None else min(timeout, wait)
+        return None, timeout
+
+    def _pop_message(self, queue: RecipientQueue) -> OutgoingMessage:
+        """
+        Take the next message from a queue and coalesce it with the following text messages
+        that were queued within the coalesce window. Must be called with the condition held.
+
+        Args:
+            queue (RecipientQueue): The queue of the recipient
+
+        Returns:
+            OutgoingMessage: The message to send
+        """
+        queue.tokens -= 1
+        message = queue.messages.popleft()
+        if not self._is_coalescable(message):
+            return message
+        texts = [message.payload["params"]["message"]]
+        while queue.messages:
+            upcoming = queue.messages[0]
+            if not self._is_coalescable(upcoming):
+                break
+            if upcoming.enqueued_at - message.enqueued_at > self.coalesce_window:
+                break
+            texts.append(queue.messages.popleft().payload["params"]["message"])
+            self.coalesced += 1
+        if len(texts) == 1:
+            return message
+        payload = {**message.payload, "params": {**message.payload["params"]}}
+        payload["params"]["message"] = "\n".join(texts)
+        return OutgoingMessage(payload=payload, enqueued_at=message.enqueued_at)
+
+    @staticmethod
+    def _is_coalescable(message: OutgoingMessage) -> bool:
+        # only plain text messages without attachments or stickers are coalesced
+        return message.attempts == 0 and set(message.payload["params"]) <= COALESCABLE_PARAMS
+
+    def _deliver(self, key: str, queue: RecipientQueue, message: OutgoingMessage):
+        """
+        Send a message and requeue it with a backoff if the delivery failed. Messages that the
+        Signal server rejected with a permanent error are dropped without a retry.
+
+        Args:
+            key (str): The key of the recipient
+            queue (RecipientQueue): The queue of the recipient
+            message (OutgoingMessage): The message to send
+        """
+        try:
+            self.send(message.payload)
+        except Exception as exc:
+            with self._condition:
+                retryable = not isinstance(exc, SignalDeliveryError) or exc.retryable
+                if not retryable or message.attempts >= self.max_retries:
+                    self.dropped += 1
+                    print(f"Failed to deliver Signal message to {key}, dropping message:", exc)
+                    return
+                delay = min(self.retry_delay[0] * 2**message.attempts, self.retry_delay[1])
+                message.attempts += 1
+                self.retried += 1
+                # the idle queue may have been removed and recreated during the delivery
+                queue = self._queues.setdefault(key, queue)
+                queue.messages.appendleft(message)
+                queue.blocked_until = time.monotonic() + delay
+            print(f"Failed to deliver Signal message to {key}, retrying in {delay} s:", exc)
+            return
+        latency = time.monotonic() - message.enqueued_at
+        with self._condition:
+            self.sent += 1
+            self._latency_count += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
@@ -1,15 +1,204 @@
 from __future__ import annotations
 
+import threading
+import time
+
 import requests
 
-from bec_atlas.ingestor.signal.model import SignalGroupInfo
+from bec_atlas.ingestor.signal.model import SignalGroupInfo, SignalJsonGroupInfo
+
+
+class SignalGroupDirectory:
+    """
+    Cache of the groups we are a member of, keyed by group ID and invite link. The directory
+    is considered stale after ttl seconds and then has to be refreshed with a full group
+    listing. Single groups are invalidated if an event reports a change to them and have to
+    be fetched again before they are used.
+    """
+
+    def __init__(self, ttl: float = 300):
+        """
+        Args:
+            ttl (float): The time in seconds after which the directory has to be refreshed
+        """
+        self.ttl = ttl
+        self._groups: dict[str, SignalGroupInfo] = {}
+        self._ids_by_link: dict[str, str] = {}
+        self._revisions: dict[str, int] = {}
+        self._invalidated: set[str] = set()
+        self._refreshed_at: float | None = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.ttl
+
+    @property
+    def invalidated(self) -> set[str]:
+        with self._lock:
+            return set(self._invalidated)
+
+    def replace(self, groups: list[SignalGroupInfo]):
+        """
+        Replace the directory with a full group listing.
+
+        Args:
+            groups (list[SignalGroupInfo]): All groups we are a member of
+        """
+        with self._lock:
+            self._groups = {}
+            self._ids_by_link = {}
+            self._invalidated = set()
+            for group in groups:
+                self._add(group)
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+
+    def update(self, group: SignalGroupInfo):
+        """
+        Add or update a single group.
+
+        Args:
+            group (SignalGroupInfo): The group
+        """
+        with self._lock:
+            self._remove(group.id)
+            self._add(group)
+            self._invalidated.discard(group.id)
+
+    def remove(self, group_id: str):
+        """
+        Remove a group, e.g. after we left it.
+
+        Args:
+            group_id (str): The group ID
+        """
+        with self._lock:
+            self._remove(group_id)
+            self._invalidated.discard(group_id)
+
+    def invalidate(self, group_id: str):
+        """
+        Mark a group as changed, so that it is fetched again before it is used.
+
+        Args:
+            group_id (str): The group ID
+        """
+        with self._lock:
+            self._invalidated.add(group_id)
+            self.invalidations += 1
+
+    def apply_event(self, group_info: SignalJsonGroupInfo):
+        """
+        Patch the directory from the group info of an incoming message. Group updates with
+        a new revision invalidate the group; the name is updated directly.
+
+        Args:
+            group_info (SignalJsonGroupInfo): The group info of the message
+        """
+        with self._lock:
+            revision = self._revisions.get(group_info.groupId)
+            if group_info.type != "UPDATE" or (
+                revision is not None and group_info.revision <= revision
+            ):
+                return
+            self._revisions[group_info.groupId] = group_info.revision
+            group = self._groups.get(group_info.groupId)
+            if group is not None:
+                self._groups[group.id] = group.model_copy(update={"name": group_info.groupName})
+            self._invalidated.add(group_info.groupId)
+            self.invalidations += 1
+
+    def get(self, group_id: str) -> SignalGroupInfo | None:
+        """
+        Get a group by its ID.
+
+        Args:
+            group_id (str): The group ID
+        Returns:
+            SignalGroupInfo | None: The group or None if we are not a member
+        """
+        with self._lock:
+            return self._count(self._groups.get(group_id))
+
+    def get_by_link(self, invite_link: str) -> SignalGroupInfo | None:
+        """
+        Get a group by its invite link.
+
+        Args:
+            invite_link (str): The invite link
+        Returns:
+            SignalGroupInfo | None: The group or None if no group has this invite link
+        """
+        with self._lock:
+            group_id = self._ids_by_link.get(invite_link)
+            return self._count(self._groups.get(group_id) if group_id else None)
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        Get the directory metrics.
+
+        Returns:
+            dict[str, int | float]: The number of cached and invalidated groups, the age of the
+                directory in seconds (-1 if it was never refreshed) and the number of refreshes,
+                invalidations, hits and misses
+        """
+        with self._lock:
+            age = -1.0
+            if self._refreshed_at is not None:
+                age = time.monotonic() - self._refreshed_at
+            return {
+                "groups": len(self._groups),
+                "invalidated": len(self._invalidated),
+                "age": age,
+                "refreshes": self.refreshes,
+                "invalidations": self.invalidations,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _add(self, group: SignalGroupInfo):
+        self._groups[group.id] = group
+        if group.groupInviteLink:
+            self._ids_by_link[group.groupInviteLink] = group.id
+
+    def _remove(self, group_id: str):
+        group = self._groups.pop(group_id, None)
+        if group is not None and group.groupInviteLink:
+            self._ids_by_link.pop(group.groupInviteLink, None)
+
+    def _count(self, group: SignalGroupInfo | None) -> SignalGroupInfo | None:
+        if group is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return group
 
 
 class SignalGroupManager:
-    def __init__(self, host: str, number: str):
+    MAX_BATCH_SIZE = 50
+
+    def __init__(self, host: str, number: str, directory_ttl: float = 300):
         self.host = host
         self.number = number
-        self.session = requests.Session()
+        self._local = threading.local()
+        self.directory = SignalGroupDirectory(ttl=directory_ttl)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session of the calling thread. The group manager is used by the event
+        workers, the cleanup thread and the redis callbacks, and requests sessions must not
+        be shared between threads.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
 
     def get_all_groups(self) -> list[SignalGroupInfo]:
         """
@@ -23,6 +212,58 @@ class SignalGroupManager:
         result = self._run("listGroups", {}) or []
         return [SignalGroupInfo(**group) for group in result]
 
+    def refresh_directory(self) -> list[SignalGroupInfo]:
+        """
+        Refresh the group directory with all groups from the signal server.
+
+        Returns:
+            list[SignalGroupInfo]: List of groups.
+        """
+        groups = self.get_all_groups()
+        self.directory.replace(groups)
+        return groups
+
+    def get_cached_group(self, group_id: str) -> SignalGroupInfo | None:
+        """
+        Get a group by its ID from the group directory. The directory is refreshed if it is
+        stale and the group is fetched again if it was invalidated.
+
+        Args:
+            group_id (str): The group ID.
+        Returns:
+            SignalGroupInfo | None: The group info or None if not found.
+        """
+        self._ensure_directory()
+        if group_id in self.directory.invalidated:
+            self._fetch_group(group_id)
+        return self.directory.get(group_id)
+
+    def get_group_by_link(self, invite_link: str) -> SignalGroupInfo | None:
+        """
+        Get a group by its invite link from the group directory. The directory is refreshed
+        if it is stale or if groups were invalidated, as their link may have changed.
+
+        Args:
+            invite_link (str): The invite link.
+        Returns:
+            SignalGroupInfo | None: The group info or None if not found.
+        """
+        # a single full listing instead of one request per invalidated group
+        if self.directory.is_stale or self.directory.invalidated:
+            self.refresh_directory()
+        return self.directory.get_by_link(invite_link)
+
+    def _ensure_directory(self):
+        if self.directory.is_stale:
+            self.refresh_directory()
+
+    def _fetch_group(self, group_id: str):
+        group = self.get_group_by_id(group_id)
+        if group is None:
+            self.directory.remove(group_id)
+        else:
+            self.directory.update(group)
+
     def get_group_by_id(self, group_id: str) -> SignalGroupInfo | None:
         """
         Get a group by its ID.
@@ -48,9 +289,10 @@ class SignalGroupManager:
             str | None: The created group ID or None if creation failed.
         """
         result = self._run("updateGroup", {"name": name, "description": description})
-        if result:
-            return result.get("groupId")
-        return None
+        group_id = result.get("groupId") if result else None
+        if group_id:
+            self.directory.invalidate(group_id)
+        return group_id
 
     def join_group(self, invitation_link: str) -> str | None:
         """
@@ -63,9 +305,10 @@ class SignalGroupManager:
         """
         params = {"uri": invitation_link}
         result = self._run("joinGroup", params)
-        if result:
-            return result.get("groupId")
-        return None
+        group_id = result.get("groupId") if result else None
+        if group_id:
+            self.directory.invalidate(group_id)
+        return group_id
 
     def leave_group(self, group_id: str, delete: bool = False) -> bool:
         """
@@ -77,18 +320,55 @@ class SignalGroupManager:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
-        # If we are the last admin but there are other members, we cannot leave the group.
-        group_info = self.get_group_by_id(group_id)
+        group_info = self.get_cached_group(group_id)
         if group_info is None:
             return False
+        if self._is_last_admin(group_info):
+            raise ValueError("Cannot leave group as the last admin while other members exist.")
+        result = self._run("quitGroup", self._get_quit_params(group_id, delete))
+        if result is None:
+            return False
+        self.directory.remove(group_id)
+        return True
+
+    def leave_groups(self, groups: list[SignalGroupInfo], delete: bool = False) -> dict[str, bool]:
+        """
+        Leave multiple groups with batched requests. Groups in which we are the last admin
+        while other members exist are not left.
+
+        Args:
+            groups (list[SignalGroupInfo]): The groups to leave, e.g. as returned by get_all_groups.
+            delete (bool): Whether to delete the groups.
+        Returns:
+            dict[str, bool]: Whether each group was left successfully, keyed by group ID.
+        """
+        out = {}
+        calls = []
+        for group in groups:
+            if self._is_last_admin(group):
+                print(f"Cannot leave group {group.id} as the last admin while other members exist.")
+                out[group.id] = False
+                continue
+            calls.append(("quitGroup", self._get_quit_params(group.id, delete)))
+        results = self._run_group_batch(calls)
+        for group_id, success in results.items():
+            if success:
+                self.directory.remove(group_id)
+        out.update(results)
+        return out
+
+    def _is_last_admin(self, group_info: SignalGroupInfo) -> bool:
+        # If we are the last admin but there are other members, we cannot leave the group.
         if len(group_info.admins) == 1 and len(group_info.members) > 1:
-            if group_info.admins[0].number == self.number:
-                raise ValueError("Cannot leave group as the last admin while other members exist.")
+            return group_info.admins[0].number == self.number
+        return False
+
+    @staticmethod
+    def _get_quit_params(group_id: str, delete: bool) -> dict:
         params: dict = {"groupId": group_id}
         if delete:
             params["delete"] = True
-        result = self._run("quitGroup", params)
-        return result is not None
+        return params
 
     def add_user_to_group(self, group_id: str, user_id: str | list[str]) -> bool:
         """
@@ -100,7 +380,7 @@ class SignalGroupManager:
         Returns:
             bool: True if the user was added successfully, False otherwise.
         """
-        user_ids = " ".join(user_id) if isinstance(user_id, list) else user_id
+        user_ids = self._join_ids(user_id)
         result = self._run("updateGroup", {"groupId": group_id, "member": user_ids})
         return result is not None
 
@@ -114,7 +394,7 @@ class SignalGroupManager:
         Returns:
             bool: True if the admin was added successfully, False otherwise.
         """
-        user_ids = " ".join(user_id) if isinstance(user_id, list) else user_id
+        user_ids = self._join_ids(user_id)
         result = self._run("updateGroup", {"groupId": group_id, "admin": user_ids})
         return result is not None
 
@@ -128,7 +408,7 @@ class SignalGroupManager:
         Returns:
             bool: True if the admin was removed successfully, False otherwise.
         """
-        user_ids = " ".join(user_id) if isinstance(user_id, list) else user_id
+        user_ids = self._join_ids(user_id)
         result = self._run("updateGroup", {"groupId": group_id, "removeAdmin": user_ids})
         return result is not None
 
@@ -142,7 +422,7 @@ class SignalGroupManager:
         Returns:
             bool: True if the user was removed successfully, False otherwise.
         """
-        user_ids = " ".join(user_id) if isinstance(user_id, list) else user_id
+        user_ids = self._join_ids(user_id)
         result = self._run("updateGroup", {"groupId": group_id, "removeMember": user_ids})
         return result is not None
 
@@ -212,11 +492,65 @@ class SignalGroupManager:
         Returns:
             dict | None: The result of the method call or None if not found.
         """
+        self._invalidate_updated_group(method, params)
         payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
         response = self.session.post(f"{self.host}/api/v1/rpc", json=payload, timeout=10)
         response.raise_for_status()
         return response.json().get("result")
 
+    def _run_batch(self, calls: list[tuple[str, dict]]) -> list[dict | None]:
+        """
+        Run multiple JSON-RPC methods on the signal server. The calls are sent as JSON-RPC
+        batches of at most MAX_BATCH_SIZE calls and the results are mapped back to the calls
+        by their request IDs.
+        Args:
+            calls (list[tuple[str, dict]]): The method names and parameters.
+        Returns:
+            list[dict | None]: The results in the order of the calls; None for failed calls.
+        """
+        for method, params in calls:
+            self._invalidate_updated_group(method, params)
+        results: list[dict | None] = [None] * len(calls)
+        for start in range(0, len(calls), self.MAX_BATCH_SIZE):
+            payload = [
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": index}
+                for index, (method, params) in enumerate(
+                    calls[start : start + self.MAX_BATCH_SIZE], start=start
+                )
+            ]
+            response = self.session.post(f"{self.host}/api/v1/rpc", json=payload, timeout=10)
+            response.raise_for_status()
+            responses = response.json()
+            if not isinstance(responses, list):
+                # the server rejected the batch as a whole
+                print("Signal JSON-RPC batch failed:", responses)
+                continue
+            for item in responses:
+                index = item.get("id")
+                if not isinstance(index, int) or not start <= index < len(calls):
+                    continue
+                if "error" in item:
+                    print(f"Signal JSON-RPC call {calls[index][0]} failed:", item["error"])
+                    continue
+                results[index] = item.get("result")
+        return results
+
+    def _invalidate_updated_group(self, method: str, params: dict):
+        # the group is invalidated before the update, so that a failed call cannot leave
+        # an outdated entry behind
+        if method == "updateGroup" and "groupId" in params:
+            self.directory.invalidate(params["groupId"])
+
+    def _run_group_batch(self, calls: list[tuple[str, dict]]) -> dict[str, bool]:
+        results = self._run_batch(calls)
+        return {
+            params["groupId"]: result is not None for (_, params), result in zip(calls, results)
+        }
+
+    @staticmethod
+    def _join_ids(user_id: str | list[str]) -> str:
+        return " ".join(user_id) if isinstance(user_id, list) else user_id
+
 
 if __name__ == "__main__":  # pragma: no cover
     from bec_atlas.utils.env_loader import load_env
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import base64
 import json
 import os
+import random
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Literal, cast
 
@@ -15,7 +16,9 @@ from bec_lib.endpoints import MessageEndpoints
 from bson import ObjectId
 
 from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+from bec_atlas.ingestor.attachments import AttachmentPipeline, StreamingJsonBody
 from bec_atlas.ingestor.signal.model import SignalEventMessage
+from bec_atlas.ingestor.signal.outbox import SignalDeliveryError, SignalOutbox
 from bec_atlas.ingestor.signal.utils import SignalGroupManager
 
 if TYPE_CHECKING:
@@ -32,26 +35,96 @@ def load_messages() -> dict[Literal["enter", "exit"], list[str]]:
 
 
 class EventSubscriber:
-    def __init__(self, host: str, on_event: Callable[[dict], None]):
+    """
+    Subscriber for the server-sent events of the Signal server. The stream is read on a
+    dedicated thread and the events are handled by a pool of worker threads, so that slow
+    handlers do not stall the stream. Events are partitioned by their group or, outside of
+    groups, by their source. Events of the same partition are handled in order; a partition
+    is only handled by one worker at a time, so that a burst of events in one partition does
+    not delay the events of other partitions.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        on_event: Callable[[dict], None],
+        num_workers: int = 4,
+        max_queued: int = 1000,
+        reconnect_delay: tuple[float, float] = (0.5, 30),
+    ):
+        """
+        Args:
+            host (str): The Signal server host
+            on_event (Callable[[dict], None]): The event handler
+            num_workers (int): The number of worker threads handling events
+            max_queued (int): The maximum number of queued events; further events are dropped
+            reconnect_delay (tuple[float, float]): The initial and the maximum reconnect delay
+                in seconds
+        """
         self._message_prefix = "data:"
         self.host = host
         self.on_event = on_event
+        self.num_workers = num_workers
+        self.max_queued = max_queued
+        self.reconnect_delay = tuple(reconnect_delay)
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True, name=f"signal_events_{index}")
+            for index in range(num_workers)
+        ]
+        self._condition = threading.Condition()
+        # queued events per partition and the partitions that have events and no active worker
+        self._pending: dict[str, deque[dict]] = {}
+        self._ready: deque[str] = deque()
+        self._queued = 0
+        self._started_at = time.monotonic()
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.reconnects = 0
 
     def start(self):
         """
         Start the event subscriber.
         """
+        self._started_at = time.monotonic()
         self._thread.start()
+        for worker in self._workers:
+            worker.start()
 
     def stop(self):
         """
         Stop the event subscriber.
         """
         self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        Get the subscriber metrics.
+
+        Returns:
+            dict[str, int | float]: The number of received, processed, failed and dropped
+                events, the queue depth, the number of reconnects and the mean throughput in
+                processed events per second
+        """
+        with self._condition:
+            uptime = time.monotonic() - self._started_at
+            return {
+                "received": self.received,
+                "processed": self.processed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "queued": self._queued,
+                "reconnects": self.reconnects,
+                "throughput": self.processed / uptime if uptime > 0 else 0.0,
+            }
 
     def _run(self):
+        attempt = 0
         while not self._stop.is_set():
             try:
                 with requests.get(
@@ -68,33 +141,151 @@ class EventSubscriber:
                             return
 
                         if line and line.startswith(self._message_prefix):
-                            msg = json.loads(line.removeprefix(self._message_prefix).strip())
-                            self.on_event(msg)
+                            # the connection is healthy, so the next reconnect starts with
+                            # the initial delay again
+                            attempt = 0
+                            self._dispatch(line.removeprefix(self._message_prefix).strip())
+                print("SSE stream closed by the server, reconnecting.")
 
             except Exception as exc:
                 # network error, server restart, etc.
-                time.sleep(2)
                 print("SSE disconnected, retrying:", exc)
 
+            if self._stop.is_set():
+                return
+            self.reconnects += 1
+            time.sleep(self._get_reconnect_delay(attempt))
+            attempt += 1
+
+    def _get_reconnect_delay(self, attempt: int) -> float:
+        """
+        Get the delay before the next reconnect: exponential backoff with jitter, so that
+        several subscribers do not reconnect at the same time.
+
+        Args:
+            attempt (int): The number of failed reconnects since the last healthy connection
+
+        Returns:
+            float: The delay in seconds
+        """
+        initial, maximum = self.reconnect_delay
+        delay = min(initial * 2 ** min(attempt, 32), maximum)
+        return random.uniform(delay / 2, delay)
+
+    def _dispatch(self, data: str):
+        """
+        Parse an event and queue it for the workers.
+
+        Args:
+            data (str): The JSON data of the event
+        """
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError as exc:
+            print("Failed to decode SSE event:", exc)
+            return
+        key = self._get_key(event)
+        with self._condition:
+            self.received += 1
+            if self._queued >= self.max_queued:
+                self.dropped += 1
+                print(f"SSE event queue is full, dropping event for {key}.")
+                return
+            events = self._pending.get(key)
+            if events is None:
+                self._pending[key] = deque([event])
+                self._ready.append(key)
+                self._condition.notify()
+            else:
+                # the partition is either ready or handled by a worker, which picks the event up
+                events.append(event)
+            self._queued += 1
+
+    @staticmethod
+    def _get_key(event: dict) -> str:
+        """
+        Get the partition of an event: the group of group messages, otherwise the source.
+
+        Args:
+            event (dict): The event
+
+        Returns:
+            str: The partition key
+        """
+        envelope = event.get("envelope") if isinstance(event, dict) else None
+        if not isinstance(envelope, dict):
+            return ""
+        data_message = envelope.get("dataMessage")
+        group_info = data_message.get("groupInfo") if isinstance(data_message, dict) else None
+        if isinstance(group_info, dict) and group_info.get("groupId"):
+            # events of a group from different sources must not overtake each other
+            return f"group:{group_info['groupId']}"
+        return "source:" + str(
+            envelope.get("sourceUuid")
+            or envelope.get("sourceNumber")
+            or envelope.get("source")
+            or ""
+        )
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._ready and not self._stop.is_set():
+                    self._condition.wait()
+                if not self._ready:
+                    # stopped and all received events are handled
+                    return
+                key = self._ready.popleft()
+                event = self._pending[key].popleft()
+                self._queued -= 1
+            try:
+                self.on_event(event)
+            except Exception as exc:
+                print("Failed to handle SSE event:", exc)
+                with self._condition:
+                    self.failed += 1
+            with self._condition:
+                self.processed += 1
+                if self._pending[key]:
+                    # re-queue the partition at the end, so that partitions are served round-robin
+                    self._ready.append(key)
+                    self._condition.notify()
+                else:
+                    del self._pending[key]
+
 
 class SignalManager:
     """
     Manages the data exchange for Signal messages.
     """
 
-    def __init__(self, ingestor: IngestorBase, config: dict):
+    def __init__(
+        self,
+        ingestor: IngestorBase,
+        config: dict,
+        attachment_pipeline: AttachmentPipeline | None = None,
+    ):
         self.ingestor = ingestor
         self.config = config
         self.host = config.get("host", "").rstrip("/")
         self.number = config.get("number")
         if not self.host or not self.number:
             raise ValueError("SignalManager requires 'host' and 'number' in config.")
+        # only used by the outbox thread; the event workers send through the outbox
         self.session = requests.Session()
-        self.group_manager = SignalGroupManager(host=self.host, number=self.number)
-        self.subscriber = EventSubscriber(host=self.host, on_event=self._handle_event)
-        self.subscriber.start()
+        self.attachment_pipeline = attachment_pipeline or AttachmentPipeline()
+        self.outbox = SignalOutbox(self._send, **config.get("outbox", {}))
+        self.group_manager = SignalGroupManager(
+            host=self.host, number=self.number, directory_ttl=config.get("group_directory_ttl", 300)
+        )
+        # accessed by the event workers and the redis callbacks
         self.pending_signal_requests: dict[str, dict] = {}
+        self._pending_lock = threading.Lock()
         self.auto_messages = load_messages()
+        self.subscriber = EventSubscriber(
+            host=self.host, on_event=self._handle_event, **config.get("event_subscriber", {})
+        )
+        self.subscriber.start()
         self.ingestor.redis.register(
             RedisAtlasEndpoints.signal_link_requests(),
             cb=self._handle_signal_link_request,
@@ -194,12 +385,8 @@ class SignalManager:
             payload (dict): The payload to which the attachments should be added.
 
         """
-        attachments = []
-        for msg_part in msg.message:
-            if isinstance(msg_part, messages.MessagingServiceFileContent):
-                attachments.append(
-                    f"data:{msg_part.mime_type};filename={msg_part.filename};base64,{base64.b64encode(msg_part.data).decode()}"
-                )
+        # The attachments are encoded as base64 data URIs while the payload is sent
+        attachments = [attachment for _, attachment in self.attachment_pipeline.prepare(msg)]
         if attachments:
             payload["params"]["attachments"] = attachments
 
@@ -267,18 +454,48 @@ class SignalManager:
 
     def post(self, payload: dict):
         """
-        Post a payload to the Signal server.
+        Queue a payload for delivery to the Signal server. The payload is sent by the outbox
+        thread, so that a slow Signal server does not block the caller.
         Args:
             payload (dict): The payload to post.
 
         """
-        self.session.post(f"{self.host}/api/v1/rpc", json=payload, timeout=10)
+        self.outbox.enqueue(payload)
+
+    def _send(self, payload: dict):
+        """
+        Post a payload to the Signal server. The server reports failed requests, including
+        rate limits, as JSON-RPC errors in a successful HTTP response.
+        Args:
+            payload (dict): The payload to post.
+
+        Raises:
+            SignalDeliveryError: If the Signal server returned an error.
+        """
+        # without a request id, the server does not return the result of the request
+        payload = {**payload, "id": 1}
+        if payload["params"].get("attachments"):
+            response = self.session.post(
+                f"{self.host}/api/v1/rpc",
+                data=StreamingJsonBody(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=10,
+            )
+        else:
+            response = self.session.post(f"{self.host}/api/v1/rpc", json=payload, timeout=10)
+        response.raise_for_status()
+        error = response.json().get("error")
+        if error:
+            raise SignalDeliveryError(error)
 
     def _handle_event(self, event: dict):
         try:
             signal_event = SignalEventMessage(**event)
             print("Received Signal event:", signal_event.model_dump(exclude_defaults=True))
             if signal_event.envelope.dataMessage:
+                group_info = signal_event.envelope.dataMessage.groupInfo
+                if group_info:
+                    self.group_manager.directory.apply_event(group_info)
                 if self.check_pending_signal_link_request(signal_event):
                     return
                 if self.check_direct_mention(signal_event):
@@ -351,7 +568,8 @@ class SignalManager:
                 f"Received message from {source_number} that is not a group link, ignoring for signal linking process."
             )
             return False
-        pending_request = self.pending_signal_requests.get(source_number)
+        with self._pending_lock:
+            pending_request = self.pending_signal_requests.get(source_number)
         if not pending_request:
             message = "Your signal group link has been received, but no pending signal link request was found. Please initiate the linking process first."
             self.send_simple_message_to_individuals(source_number, message)
@@ -370,7 +588,8 @@ class SignalManager:
             link (str): The group link to associate with the session.
 
         """
-        pending_request = self.pending_signal_requests.pop(number, None)
+        with self._pending_lock:
+            pending_request = self.pending_signal_requests.pop(number, None)
         if not pending_request:
             print(
                 f"No pending signal link request found for number {number} when trying to complete linking."
@@ -380,10 +599,8 @@ class SignalManager:
         if group_id:
             self.send_random_message(group_id, "enter")
         else:
-            groups = self.group_manager.get_all_groups()
-            for group in groups:
-                if group.groupInviteLink != link:
-                    continue
+            group = self.group_manager.get_group_by_link(link)
+            if group:
                 # we already are a member of the group, so we can just use the group id
                 group_id = group.id
                 for banned_user in group.banned:
@@ -391,7 +608,6 @@ class SignalManager:
                         message = "Your link request has been received, but BEC is currently banned from the group. Please add BEC back to the group."
                         self.send_simple_message_to_individuals(number, message)
                         return
-                break
         if not group_id:
             message = "Your link request has been received, but no matching group was found on the Signal server. Please make sure to send a valid group link."
             self.send_simple_message_to_individuals(number, message)
@@ -457,7 +673,8 @@ class SignalManager:
 
         # Store the pending signal link request, so that when we receive the corresponding event from the Signal server,
         # we can correlate it with the session and complete the linking process.
-        parent.pending_signal_requests[number] = data
+        with parent._pending_lock:
+            parent.pending_signal_requests[number] = data
         parent.send_signal_link_request(number)
 
     def send_signal_link_request(self, number: str):
@@ -468,7 +685,8 @@ class SignalManager:
             number (str): The phone number for which the link request is being made.
 
         """
-        pending_request = self.pending_signal_requests.get(number)
+        with self._pending_lock:
+            pending_request = self.pending_signal_requests.get(number)
         if not pending_request:
             print(
                 f"No pending signal link request found for number {number} when trying to send link request."
@@ -587,16 +805,17 @@ class SignalManager:
                             continue
                         signal_groups.add(service.group_id)
 
-                groups = self.group_manager.get_all_groups()
-                for group in groups:
-                    if group.id not in signal_groups:
-                        print(
-                            f"Leaving group {group.id} as it is no longer linked to any active session."
-                        )
-                        try:
-                            self.group_manager.leave_group(group.id, delete=True)
-                        except Exception as exc:
-                            print(f"Error leaving group {group.id}:", exc)
+                groups = self.group_manager.refresh_directory()
+                stale_groups = [group for group in groups if group.id not in signal_groups]
+                for group in stale_groups:
+                    print(
+                        f"Leaving group {group.id} as it is no longer linked to any active session."
+                    )
+                if stale_groups:
+                    results = self.group_manager.leave_groups(stale_groups, delete=True)
+                    for group_id, success in results.items():
+                        if not success:
+                            print(f"Error leaving group {group_id}.")
             except Exception as exc:
                 print("Error during group cleanup:", exc)
 
@@ -604,9 +823,10 @@ class SignalManager:
 
     def shutdown(self):
         """
-        Shutdown the Signal manager, including the event subscriber and cleanup timer.
+        Shutdown the Signal manager, including the event subscriber, outbox and cleanup timer.
         """
         self.subscriber.stop()
+        self.outbox.shutdown()
         self.shutdown_event.set()
         if self.cleanup_thread:
             self.cleanup_thread.join()
@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
+from bec_atlas.authentication import token_cache
 from bec_atlas.datasources.datasource_manager import DatasourceManager
 from bec_atlas.router.bec_access_router import BECAccessRouter
 from bec_atlas.router.deployment_access_router import DeploymentAccessRouter
@@ -16,6 +17,7 @@ from bec_atlas.router.realm_router import RealmRouter
 from bec_atlas.router.redis_router import RedisRouter, RedisWebsocket
 from bec_atlas.router.scan_router import ScanRouter
 from bec_atlas.router.session_router import SessionRouter
+from bec_atlas.router.stream_router import StreamRouter
 from bec_atlas.router.user_router import UserRouter
 
 CONFIG = {
@@ -28,10 +30,19 @@ origins = ["http://localhost:4200", "http://localhost"]
 
 class AtlasApp:
     API_VERSION = "v1"
-
-    def __init__(self, config: dict | None = None):
+    TITLE = "BEC Atlas API"
+
+    def __init__(self, config: dict | None = None, websocket: bool = True):
+        """
+        Args:
+            config (dict | None): The service config
+            websocket (bool): Whether to serve the websocket in this app. Disable it if the
+                websocket is served by separate bec-atlas-ws workers.
+        """
         self.prefix = f"/api/{self.API_VERSION}"
         self.config = config or CONFIG
+        self.websocket = websocket
+        self.redis_websocket = None
 
         @asynccontextmanager
         async def lifespan(app: FastAPI):
@@ -45,7 +56,7 @@ class AtlasApp:
             docs_url=f"{self.prefix}/docs",
             openapi_url=f"{self.prefix}/openapi.json",
             redoc_url=f"{self.prefix}/redoc",
-            title="BEC Atlas API",
+            title=self.TITLE,
             lifespan=lifespan,
         )
         self.app.add_middleware(
@@ -64,6 +75,10 @@ class AtlasApp:
         self.add_routers()
 
     async def on_shutdown(self):
+        if self.redis_websocket is not None:
+            self.redis_websocket.shutdown()
+        if hasattr(self, "user_router"):
+            self.user_router.shutdown()
         self.datasources.shutdown()
 
     def add_routers(self):
@@ -74,6 +89,7 @@ class AtlasApp:
         # Health
         self.health_router = HealthRouter(prefix=self.prefix, datasources=self.datasources)
         self.app.include_router(self.health_router.router, tags=["Health"])
+        self.health_router.add_metrics_provider("token_cache", token_cache.metrics)
 
         # User
         self.user_router = UserRouter(
@@ -82,6 +98,7 @@ class AtlasApp:
             use_ssl=self.config.get("use_ssl", True),
         )
         self.app.include_router(self.user_router.router, tags=["User"])
+        self.health_router.add_metrics_provider("login_pool", self.user_router.login_pool.metrics)
 
         # Realm
         self.realm_router = RealmRouter(prefix=self.prefix, datasources=self.datasources)
@@ -129,9 +146,25 @@ class AtlasApp:
         self.redis_router = RedisRouter(prefix=self.prefix, datasources=self.datasources)
         self.app.include_router(self.redis_router.router, tags=["Redis"])
 
+        if self.websocket:
+            self.add_websocket()
+
+    def add_websocket(self):
+        """
+        Mount the socket.io app for the Redis websocket and add the server-sent events
+        endpoint that shares its rooms.
+        """
+        # pylint: disable=attribute-defined-outside-init
         self.redis_websocket = RedisWebsocket(
             prefix=self.prefix, datasources=self.datasources, app=self
         )
+        self.health_router.add_metrics_provider(
+            "websocket_admission", self.redis_websocket.admission.metrics
+        )
+        self.stream_router = StreamRouter(
+            prefix=self.prefix, datasources=self.datasources, websocket=self.redis_websocket
+        )
+        self.app.include_router(self.stream_router.router, tags=["Stream"])
         self.app.mount("/", self.redis_websocket.app)
 
     def run(self, port=8000):  # pragma: no cover
@@ -141,6 +174,31 @@ class AtlasApp:
         # uvicorn.run(self.app, host="localhost", port=port)
 
 
+class AtlasWebsocketApp(AtlasApp):
+    """
+    Websocket tier of BEC Atlas. It only serves the socket.io app and the health endpoint,
+    so that the websocket fan-out can be scaled independently of the REST API.
+    """
+
+    TITLE = "BEC Atlas Websocket"
+
+    def add_routers(self):
+        # pylint: disable=attribute-defined-outside-init
+        if not self.datasources.redis or not self.datasources.mongodb:
+            raise ValueError("Datasources not loaded")
+
+        # Health
+        self.health_router = HealthRouter(prefix=self.prefix, datasources=self.datasources)
+        self.app.include_router(self.health_router.router, tags=["Health"])
+        self.health_router.add_metrics_provider("token_cache", token_cache.metrics)
+
+        # The websocket resolves the remote access of users through the redis router.
+        # Its REST routes are served by the API workers.
+        self.redis_router = RedisRouter(prefix=self.prefix, datasources=self.datasources)
+
+        self.add_websocket()
+
+
 def main():  # pragma: no cover
     import argparse
     import logging
@@ -152,11 +210,34 @@ def main():  # pragma: no cover
 
     parser = argparse.ArgumentParser(description="Run the BEC Atlas API")
     parser.add_argument("--port", type=int, default=8000, help="Port to run the API on")
+    parser.add_argument(
+        "--no-websocket",
+        action="store_true",
+        default=False,
+        help="Do not serve the websocket. Use if the websocket is served by bec-atlas-ws.",
+    )
 
     args = parser.parse_args()
-    horizon_app = AtlasApp(config=config)
+    horizon_app = AtlasApp(config=config, websocket=not args.no_websocket)
     horizon_app.run(port=args.port)
 
 
+def websocket_main():  # pragma: no cover
+    import argparse
+    import logging
+
+    from bec_atlas.utils.env_loader import load_env
+
+    config = load_env()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Run the BEC Atlas websocket")
+    parser.add_argument("--port", type=int, default=8100, help="Port to run the websocket on")
+
+    args = parser.parse_args()
+    websocket_app = AtlasWebsocketApp(config=config)
+    websocket_app.run(port=args.port)
+
+
 if __name__ == "__main__":  # pragma: no cover
     main()
@@ -229,6 +229,8 @@ UserPartial = make_fields_optional_with_relations(User, "UserPartial")
 class UserInfo(BaseModel):
     email: str
     token: str
+    # user claims of claims-carrying tokens, see create_claims_token
+    claims: dict | None = None
 
 
 class DeploymentCredential(MongoBaseModel):
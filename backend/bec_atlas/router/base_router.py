@@ -9,11 +9,12 @@ from fastapi import HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, field_validator
 
+from bec_atlas.authentication import get_user_from_claims
 from bec_atlas.datasources.mongodb.aggregation_pipelines import (
     build_aggregation_pipeline,
     is_objectid_compatible,
 )
-from bec_atlas.model.model import User
+from bec_atlas.model.model import User, UserInfo
 
 if TYPE_CHECKING:  # pragma: no cover
     from bec_atlas.datasources.datasource_manager import DatasourceManager
@@ -94,6 +95,23 @@ class BaseRouter:
         self.datasources = datasources
         self.prefix = prefix
 
+    async def get_user(self, user_info: UserInfo) -> User | None:
+        """
+        Get the user of a request. Users of claims-carrying tokens are built from the
+        token's claims as long as the group version of the token is current; all other
+        users are loaded from the database.
+
+        Args:
+            user_info (UserInfo): The authenticated user info
+
+        Returns:
+            User | None: The user
+        """
+        claims = user_info.claims
+        if claims is not None and claims["gv"] == await self.datasources.group_version.get():
+            return get_user_from_claims(claims)
+        return self.get_user_from_db(user_info.token, user_info.email)
+
     @lru_cache(maxsize=128)
     def get_user_from_db(self, _token: str, email: str) -> User | None:
         """
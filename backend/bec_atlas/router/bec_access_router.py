@@ -78,7 +78,7 @@ class BECAccessRouter(BaseRouter):
         if not self.app:
             raise RuntimeError("App not loaded")
 
-        user_info = self.app.user_router._get_user(user_login)
+        user_info = await self.app.user_router.verify_login(user_login)
         if not user_info:
             raise HTTPException(status_code=404, detail="User not found.")
         current_user = self.db.get_user_by_email(user_info.email)
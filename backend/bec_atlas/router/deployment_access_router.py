@@ -184,6 +184,7 @@ class DeploymentAccessRouter(BaseRouter):
         )
 
         redis.connector.set_and_publish(endpoint_info, MsgpackSerialization.dumps(profiles))
+        self.datasources.access_cache.invalidate(deployment_id, broadcast=True)
 
     def _is_valid_user(self, user: str) -> bool:
         """
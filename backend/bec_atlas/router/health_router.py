@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from fastapi import APIRouter, Response
 from pydantic import BaseModel
@@ -14,6 +14,7 @@ if TYPE_CHECKING:  # pragma: no cover
 class HealthStatus(BaseModel):
     status: str
     services: dict[str, dict[str, str]]
+    metrics: dict[str, dict[str, int | float]] = {}
 
 
 class HealthRouter(BaseRouter):
@@ -21,6 +22,17 @@ class HealthRouter(BaseRouter):
         super().__init__(datasources, prefix)
         self.router = APIRouter(prefix=prefix)
         self.router.add_api_route("/health", self.health_check, methods=["GET"])
+        self.metrics_providers: dict[str, Callable[[], dict[str, int | float]]] = {}
+
+    def add_metrics_provider(self, name: str, provider: Callable[[], dict[str, int | float]]):
+        """
+        Add a provider of metrics that are reported by the health endpoint.
+
+        Args:
+            name (str): The name of the metrics group
+            provider (Callable[[], dict[str, int | float]]): Function returning the metrics
+        """
+        self.metrics_providers[name] = provider
 
     async def health_check(self, response: Response) -> HealthStatus:
         """
@@ -75,4 +87,5 @@ class HealthRouter(BaseRouter):
         else:
             response.status_code = 200
 
-        return HealthStatus(status=overall_status, services=services)
+        metrics = {name: provider() for name, provider in self.metrics_providers.items()}
+        return HealthStatus(status=overall_status, services=services, metrics=metrics)
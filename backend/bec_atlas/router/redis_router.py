@@ -5,22 +5,31 @@ import enum
 import functools
 import inspect
 import json
+import time
 import traceback
 import uuid
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal
 
 import socketio
 from bec_lib import messages
-from bec_lib.endpoints import EndpointInfo, MessageEndpoints, MessageOp
+from bec_lib.endpoints import EndpointInfo, MessageEndpoints
 from bec_lib.logger import bec_logger
 from bec_lib.serialization import MsgpackSerialization, json_ext
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
 
 from bec_atlas.authentication import convert_to_user, get_current_user, get_current_user_sync
 from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+from bec_atlas.datasources.redis_response_cache import RedisResponseCache
+from bec_atlas.datasources.stream_reader import StreamReader, stream_id_key
 from bec_atlas.model.model import BECAccessProfile, DeploymentAccess, User
 from bec_atlas.router.base_router import BaseRouter
+from bec_atlas.utils.access_matcher import compile_access_patterns
+from bec_atlas.utils.admission import AdmissionRejected, ConnectionAdmission
+from bec_atlas.utils.loop_bridge import ThreadToLoopBridge
+from bec_atlas.utils.websocket_quotas import ConnectionStats, WebsocketQuotas
 
 logger = bec_logger.logger
 
@@ -38,6 +47,27 @@ class RemoteAccess(enum.Enum):
     NONE = "none"
 
 
+@dataclass(frozen=True)
+class AccessDecision:
+    """
+    Resolved remote access of a user to a deployment.
+    """
+
+    access: RemoteAccess
+    bec_access: BECAccessProfile | None
+
+
+class RedisWriteOperation(BaseModel):
+    """
+    A single write operation of a batched write request.
+    """
+
+    key: str
+    value: dict
+    redis_op: Literal["send", "set_and_publish", "lpush", "rpush", "set", "xadd"]
+    msg_type: str
+
+
 class MsgResponse(Response):
     media_type = "application/json"
 
@@ -55,12 +85,19 @@ class RedisRouter(BaseRouter):
         super().__init__(datasources, prefix)
         self.redis = self.datasources.redis.async_connector
         self.db = self.datasources.mongodb
+        self.response_cache = RedisResponseCache(
+            self.redis, patterns=self.datasources.config.get("redis_response_cache")
+        )
 
         self.router = APIRouter(prefix=prefix)
         self.router.add_api_route(
             "/redis", self.redis_get, methods=["GET"], response_class=MsgResponse
         )
         self.router.add_api_route("/redis", self.redis_post, methods=["POST"])
+        self.router.add_api_route(
+            "/redis/batch", self.redis_batch_get, methods=["POST"], response_class=MsgResponse
+        )
+        self.router.add_api_route("/redis/batch/write", self.redis_batch_post, methods=["POST"])
         self.router.add_api_route("/redis", self.redis_delete, methods=["DELETE"])
 
     @convert_to_user
@@ -77,21 +114,155 @@ class RedisRouter(BaseRouter):
             str: The response message
         """
         self.validate_user_bec_access(current_user, deployment, key, "get", "read")
+        ttl = self.response_cache.get_ttl(key)
+        if ttl is None:
+            out = await self._fetch_remote_key(deployment, key)
+        else:
+            out = await self.response_cache.get_or_fetch(
+                deployment, key, ttl, functools.partial(self._fetch_remote_key, deployment, key)
+            )
+        if out is None:
+            return json_ext.dumps({"error": "Timeout waiting for response"})
+        return out
+
+    async def _fetch_remote_key(self, deployment: str, key: str) -> str | None:
+        """
+        Fetch a key from the BEC instance of the specified deployment.
+
+        Args:
+            deployment (str): The deployment id
+            key (str): The key in Redis
+
+        Returns:
+            str | None: The serialized response or None if the request timed out
+        """
+        data = {"action": "get", "key": key}
+        out = await self._send_remote_request(deployment, data)
+        if out is None:
+            return None
+        return json_ext.dumps({"data": out.content, "metadata": out.metadata})
+
+    @convert_to_user
+    async def redis_batch_get(
+        self,
+        deployment: str,
+        keys: list[str] = Body(..., min_length=1),
+        current_user: User = Depends(get_current_user),
+    ) -> str:
+        """
+        Get multiple messages from the BEC instance of the specified deployment.
+        The keys are requested concurrently and the responses are collected over a
+        single subscription.
+
+        Args:
+            deployment (str): The deployment id
+            keys (list[str]): The keys in Redis
+            current_user (User): The current user
+        Returns:
+            str: The response message, containing the data and metadata per key.
+                Keys that do not exist in the remote BEC instance or were not answered
+                in time are returned as None.
+        """
+        bec_access = self.get_user_bec_access_profile(current_user, deployment, "read")
+        for key in keys:
+            self.bec_access_profile_allows_op(bec_access, key, "get")
+
+        # the BEC instance only handles single gets; they are sent concurrently and
+        # collected over one subscription
+        requests = [{"action": "get", "key": key} for key in keys]
+        out = await self._send_remote_requests(deployment, requests)
+        if not out:
+            return json_ext.dumps({"error": "Timeout waiting for response"})
+        result = {}
+        for index, key in enumerate(keys):
+            msg = out.get(index)
+            if msg is None:
+                result[key] = None
+                continue
+            result[key] = {"data": msg.content, "metadata": msg.metadata}
+        return json_ext.dumps({"data": result})
+
+    async def _send_remote_request(self, deployment: str, data: dict, timeout: float = 10) -> Any:
+        """
+        Send a request to the BEC instance of the specified deployment and wait for the response.
+
+        Args:
+            deployment (str): The deployment id
+            data (dict): The request data. The response endpoint is added automatically.
+            timeout (float): The time to wait for the response in seconds
+
+        Returns:
+            Any: The deserialized response or None if no response was received in time
+        """
         request_id = uuid.uuid4().hex
         response_endpoint = RedisAtlasEndpoints.redis_request_response(deployment, request_id)
         request_endpoint = RedisAtlasEndpoints.redis_request(deployment)
         pubsub = self.redis.pubsub()
         pubsub.ignore_subscribe_messages = True
         await pubsub.subscribe(response_endpoint)
-        data = {"action": "get", "key": key, "response_endpoint": response_endpoint}
-        await self.redis.publish(request_endpoint, json.dumps(data))
-        response = await pubsub.get_message(timeout=10)
-        print(response)
-        response = await pubsub.get_message(timeout=10)
-        if response is None:
-            return json_ext.dumps({"error": "Timeout waiting for response"})
-        out = MsgpackSerialization.loads(response["data"])
-        return json_ext.dumps({"data": out.content, "metadata": out.metadata})
+        try:
+            data = {**data, "response_endpoint": response_endpoint}
+            await self.redis.publish(request_endpoint, json.dumps(data))
+            deadline = time.monotonic() + timeout
+            # the subscribe confirmation is consumed as None since subscribe messages are ignored
+            while (remaining := deadline - time.monotonic()) > 0:
+                response = await pubsub.get_message(timeout=remaining)
+                if response is not None:
+                    return MsgpackSerialization.loads(response["data"])
+            return None
+        finally:
+            await pubsub.unsubscribe(response_endpoint)
+            await pubsub.aclose()
+
+    async def _send_remote_requests(
+        self, deployment: str, requests: list[dict], timeout: float = 10
+    ) -> dict[int, Any]:
+        """
+        Send multiple requests to the BEC instance of the specified deployment and wait for
+        their responses. Each request gets its own response endpoint, but all responses are
+        received through a single subscription.
+
+        Args:
+            deployment (str): The deployment id
+            requests (list[dict]): The request data. The response endpoints are added automatically.
+            timeout (float): The time to wait for all responses in seconds
+
+        Returns:
+            dict[int, Any]: The deserialized responses by the index of their request. Requests
+                without a response in time are omitted.
+        """
+        response_endpoints = [
+            RedisAtlasEndpoints.redis_request_response(deployment, uuid.uuid4().hex)
+            for _ in requests
+        ]
+        request_endpoint = RedisAtlasEndpoints.redis_request(deployment)
+        pubsub = self.redis.pubsub()
+        pubsub.ignore_subscribe_messages = True
+        await pubsub.subscribe(*response_endpoints)
+        responses = {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for data, response_endpoint in zip(requests, response_endpoints):
+                    data = {**data, "response_endpoint": response_endpoint}
+                    pipe.publish(request_endpoint, json.dumps(data))
+                await pipe.execute()
+            deadline = time.monotonic() + timeout
+            while len(responses) < len(requests) and (remaining := deadline - time.monotonic()) > 0:
+                response = await pubsub.get_message(timeout=remaining)
+                if response is None:
+                    continue
+                channel = response["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                responses[channel] = MsgpackSerialization.loads(response["data"])
+            return {
+                index: responses[response_endpoint]
+                for index, response_endpoint in enumerate(response_endpoints)
+                if response_endpoint in responses
+            }
+        finally:
+            await pubsub.unsubscribe(*response_endpoints)
+            await pubsub.aclose()
 
     @convert_to_user
     async def redis_post(
@@ -120,23 +291,86 @@ class RedisRouter(BaseRouter):
         Returns:
             dict: The response message
         """
-        self.validate_user_bec_access(current_user, deployment, key, redis_op, "write")
-        msg_obj = getattr(messages, msg_type, None)
+        bec_access = self.get_user_bec_access_profile(current_user, deployment, "write")
+        operation = RedisWriteOperation(key=key, value=value, redis_op=redis_op, msg_type=msg_type)
+        data = self._get_write_request(bec_access, operation)
+        request_endpoint = RedisAtlasEndpoints.redis_request(deployment)
+        await self.redis.publish(request_endpoint, data)
+        return {"status": "success"}
+
+    @convert_to_user
+    async def redis_batch_post(
+        self,
+        deployment: str,
+        operations: list[RedisWriteOperation] = Body(..., min_length=1),
+        current_user: User = Depends(get_current_user),
+    ) -> dict:
+        """
+        Send multiple messages to the BEC instance of the specified deployment in a
+        single round trip. All operations are validated against the access profile of
+        the user; the valid ones are published in order, invalid ones are skipped.
+
+        Args:
+            deployment (str): The deployment id
+            operations (list[RedisWriteOperation]): The write operations
+            current_user (User): The current user
+
+        Raises:
+            HTTPException: If the user does not have write access to the deployment
+
+        Returns:
+            dict: The response message, containing the status of each operation in the
+                order of the request
+        """
+        bec_access = self.get_user_bec_access_profile(current_user, deployment, "write")
+        results = []
+        requests = []
+        for operation in operations:
+            try:
+                requests.append(self._get_write_request(bec_access, operation))
+            except HTTPException as exc:
+                results.append({"status": "error", "detail": exc.detail})
+                continue
+            results.append({"status": "success"})
+
+        if requests:
+            request_endpoint = RedisAtlasEndpoints.redis_request(deployment)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for data in requests:
+                    pipe.publish(request_endpoint, data)
+                await pipe.execute()
+        return {"results": results}
+
+    def _get_write_request(
+        self, bec_access: BECAccessProfile, operation: RedisWriteOperation
+    ) -> bytes:
+        """
+        Validate a write operation and serialize it as a request to the BEC instance.
+
+        Args:
+            bec_access (BECAccessProfile): The BEC access profile of the user
+            operation (RedisWriteOperation): The write operation
+
+        Raises:
+            HTTPException: If the user does not have access to the key or if the message
+                type or value is invalid
+
+        Returns:
+            bytes: The serialized request
+        """
+        self.bec_access_profile_allows_op(bec_access, operation.key, operation.redis_op)
+        msg_obj = getattr(messages, operation.msg_type, None)
         if not isinstance(msg_obj, type) or not issubclass(msg_obj, messages.BECMessage):
             raise HTTPException(status_code=400, detail="Invalid message type.")
         try:
-            msg = msg_obj(**value)
-        except TypeError as exc:
-            raise HTTPException(status_code=400, detail=str(exc))
-        # msg_dump = MsgpackSerialization.dumps(msg)
-        data = MsgpackSerialization.dumps(
-            messages.RawMessage(data={"action": redis_op, "key": key, "value": msg})
+            msg = msg_obj(**operation.value)
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return MsgpackSerialization.dumps(
+            messages.RawMessage(
+                data={"action": operation.redis_op, "key": operation.key, "value": msg}
+            )
         )
-        request_endpoint = RedisAtlasEndpoints.redis_request(deployment)
-        pubsub = self.redis.pubsub()
-        pubsub.ignore_subscribe_messages = True
-        await self.redis.publish(request_endpoint, data)
-        return {"status": "success"}
 
     @convert_to_user
     async def redis_delete(
@@ -169,12 +403,31 @@ class RedisRouter(BaseRouter):
             HTTPException: If the user does not have access to the key
             ValueError: If the operation is invalid
         """
-        deployment_access = self.db.find_one(
-            "deployment_access", {"_id": ObjectId(deployment)}, DeploymentAccess
-        )
-        if not deployment_access:
-            raise ValueError("Deployment not found")
-        access = self.get_access(user, deployment_access)
+        bec_access = self.get_user_bec_access_profile(user, deployment, operation_type)
+        self.bec_access_profile_allows_op(bec_access, key, redis_op)
+
+    def get_user_bec_access_profile(
+        self, user: User, deployment: str, operation_type: Literal["read", "write"]
+    ) -> BECAccessProfile:
+        """
+        Validate the user access to the specified deployment and return the user's
+        BEC access profile. The profile can be used to check multiple keys at once
+        using bec_access_profile_allows_op.
+
+        Args:
+            user (User): The user object
+            deployment (str): The deployment name
+            operation_type (str): The operation type (read or write)
+
+        Returns:
+            BECAccessProfile: The BEC access profile of the user for the deployment
+
+        Raises:
+            HTTPException: If the user does not have access to the deployment
+            ValueError: If the operation is invalid
+        """
+        decision = self.get_access_decision(user, deployment)
+        access = decision.access
 
         # check if the user has access to the deployment
         if access == RemoteAccess.NONE:
@@ -191,19 +444,54 @@ class RedisRouter(BaseRouter):
             raise ValueError("Invalid operation type")
 
         # check if the user has access to the key
-        bec_access = self.db.find_one(
-            "bec_access_profiles",
-            {
-                "deployment_id": ObjectId(deployment),
-                "username": {"$in": [user.email, user.username]},
-            },
-            BECAccessProfile,
-            user=user,
-        )
-        if not bec_access:
+        if not decision.bec_access:
             raise HTTPException(status_code=403, detail="User does not have access to the key")
+        return decision.bec_access
 
-        self.bec_access_profile_allows_op(bec_access, key, redis_op)
+    def get_access_decision(self, user: User, deployment: str) -> AccessDecision:
+        """
+        Get the remote access level and the BEC access profile of the user for the
+        specified deployment. Decisions are cached until the access of the deployment
+        is updated.
+
+        Args:
+            user (User): The user object
+            deployment (str): The deployment id
+
+        Returns:
+            AccessDecision: The access decision
+
+        Raises:
+            ValueError: If the deployment does not exist
+        """
+        cache = self.datasources.access_cache
+        deployment = str(deployment)
+        cache_key = (user.email, user.username, tuple(sorted(user.groups)))
+        decision = cache.get(deployment, cache_key)
+        if decision is not None:
+            return decision
+
+        generation = cache.generation(deployment)
+        deployment_access = self.db.find_one(
+            "deployment_access", {"_id": ObjectId(deployment)}, DeploymentAccess
+        )
+        if not deployment_access:
+            raise ValueError("Deployment not found")
+        access = self.get_access(user, deployment_access)
+        bec_access = None
+        if access != RemoteAccess.NONE:
+            bec_access = self.db.find_one(
+                "bec_access_profiles",
+                {
+                    "deployment_id": ObjectId(deployment),
+                    "username": {"$in": [user.email, user.username]},
+                },
+                BECAccessProfile,
+                user=user,
+            )
+        decision = AccessDecision(access=access, bec_access=bec_access)
+        cache.set(deployment, cache_key, decision, generation)
+        return decision
 
     def bec_access_profile_allows_op(self, bec_access: BECAccessProfile, key: str, redis_op: str):
         """
@@ -218,24 +506,23 @@ class RedisRouter(BaseRouter):
             HTTPException: If the user does not have access to the key
             ValueError: If the operation is invalid
         """
+        matcher = compile_access_patterns(tuple(bec_access.keys), tuple(bec_access.channels))
         if redis_op in ["lpush", "rpush", "set", "xadd", "delete"]:
-            access = self.get_key_pattern_access(key, bec_access.keys)
-            if access not in [RemoteAccess.WRITE, RemoteAccess.READ_WRITE]:
+            _, can_write = matcher.key_access(key)
+            if not can_write:
                 raise HTTPException(status_code=403, detail="User does not have access to the key")
         elif redis_op == "send":
-            access = self.get_channel_pattern_access(key, bec_access.channels)
-            if access not in [RemoteAccess.WRITE, RemoteAccess.READ_WRITE]:
+            if not matcher.channel_access(key):
                 raise HTTPException(status_code=403, detail="User does not have access to the key")
         elif redis_op == "set_and_publish":
-            access = self.get_key_pattern_access(key, bec_access.keys)
-            if access not in [RemoteAccess.WRITE, RemoteAccess.READ_WRITE]:
+            _, can_write = matcher.key_access(key)
+            if not can_write:
                 raise HTTPException(status_code=403, detail="User does not have access to the key")
-            access = self.get_channel_pattern_access(key, bec_access.channels)
-            if access not in [RemoteAccess.WRITE, RemoteAccess.READ_WRITE]:
+            if not matcher.channel_access(key):
                 raise HTTPException(status_code=403, detail="User does not have access to the key")
         elif redis_op == "get":
-            access = self.get_key_pattern_access(key, bec_access.keys)
-            if access not in [RemoteAccess.READ, RemoteAccess.READ_WRITE]:
+            can_read, _ = matcher.key_access(key)
+            if not can_read:
                 raise HTTPException(status_code=403, detail="User does not have access to the key")
         else:
             raise ValueError("Invalid operation")
@@ -252,19 +539,13 @@ class RedisRouter(BaseRouter):
         Returns:
             RemoteAccess: The access level if the key matches the pattern, RemoteAccess.NONE otherwise
         """
-        if "*" in patterns:
+        can_read, can_write = compile_access_patterns(tuple(patterns), ()).key_access(key)
+        if can_read and can_write:
             return RemoteAccess.READ_WRITE
-        for pattern in patterns:
-            components = pattern.split("~")
-            rule = components[0]
-            subpattern = "".join(components[1:]).split("*", maxsplit=1)[0]
-            if subpattern in key:
-                if rule == "%R":
-                    return RemoteAccess.READ
-                if rule == "%W":
-                    return RemoteAccess.WRITE
-                if rule == "%RW":
-                    return RemoteAccess.READ_WRITE
+        if can_read:
+            return RemoteAccess.READ
+        if can_write:
+            return RemoteAccess.WRITE
         return RemoteAccess.NONE
 
     @staticmethod
@@ -279,10 +560,8 @@ class RedisRouter(BaseRouter):
         Returns:
             RemoteAccess: The access level if the channel matches the pattern, RemoteAccess.NONE otherwise
         """
-        for pattern in patterns:
-            prefix = pattern.split("*")[0]
-            if prefix in channel:
-                return RemoteAccess.READ_WRITE
+        if compile_access_patterns((), tuple(patterns)).channel_access(channel):
+            return RemoteAccess.READ_WRITE
         return RemoteAccess.NONE
 
     @staticmethod
@@ -340,6 +619,48 @@ class BECAsyncRedisManager(socketio.AsyncRedisManager):
         self.started_update_loop = False
         self.known_deployments = set()
 
+    async def emit(
+        self,
+        event,
+        data,
+        namespace=None,
+        room=None,
+        skip_sid=None,
+        callback=None,
+        to=None,
+        **kwargs,
+    ):
+        """
+        Emit a message to a single client, a room, or all the clients. Messages for rooms
+        that only need to be delivered by this host are emitted directly instead of being
+        published to all other hosts:
+
+        - Endpoint rooms: every host with members in the room subscribes to the redis
+          data of the endpoint itself and emits it to its own members.
+        - Single clients that are connected to this host.
+
+        All other messages are distributed through the message queue.
+        """
+        room = to or room
+        if not kwargs.get("ignore_queue") and self._is_local_room(room, namespace):
+            kwargs["ignore_queue"] = True
+        return await super().emit(
+            event,
+            data,
+            namespace=namespace,
+            room=room,
+            skip_sid=skip_sid,
+            callback=callback,
+            **kwargs,
+        )
+
+    def _is_local_room(self, room, namespace) -> bool:
+        if not isinstance(room, str):
+            return False
+        if RedisAtlasEndpoints.is_socketio_endpoint_room(room):
+            return True
+        return self.is_connected(room, namespace or "/")
+
     def start_update_loop(self) -> asyncio.Task:
         """
         Start the update loop for the websocket state information.
@@ -423,15 +744,45 @@ class BECAsyncRedisManager(socketio.AsyncRedisManager):
             if deployment not in deployments:
                 deployments[deployment] = {}
                 self.known_deployments.add(deployment)
-            deployments[deployment][user] = self.parent.users[user]
+            deployments[deployment][user] = self.parent.get_client_state(user)
         for name, data in deployments.items():
             data_json = json.dumps(data)
-            await self.redis.set(
-                RedisAtlasEndpoints.websocket_state(name, self.host_id), data_json, ex=30
-            )
-            await self.redis.publish(
-                RedisAtlasEndpoints.websocket_state(name, self.host_id), data_json
-            )
+            state_key = RedisAtlasEndpoints.websocket_state(name, self.host_id)
+            index_key = RedisAtlasEndpoints.websocket_state_index(name)
+            pipe = self.redis.pipeline()
+            pipe.set(state_key, data_json, ex=30)
+            pipe.sadd(index_key, state_key)
+            pipe.expire(index_key, 60)
+            pipe.publish(state_key, data_json)
+            await pipe.execute()
+
+    async def get_websocket_states(self, deployment: str) -> list[dict]:
+        """
+        Get the websocket state information of all backend hosts for a deployment.
+        The state keys are looked up through the per-deployment index instead of
+        scanning the keyspace. Keys of hosts whose state expired are removed from the index.
+
+        Args:
+            deployment (str): The deployment id
+
+        Returns:
+            list[dict]: The state information per backend host
+        """
+        index_key = RedisAtlasEndpoints.websocket_state_index(deployment)
+        state_keys = sorted(await self.redis.smembers(index_key))
+        if not state_keys:
+            return []
+        state_data = await self.redis.mget(*state_keys)
+        states = []
+        expired_keys = []
+        for state_key, data in zip(state_keys, state_data):
+            if not data:
+                expired_keys.append(state_key)
+                continue
+            states.append(json.loads(data))
+        if expired_keys:
+            await self.redis.srem(index_key, *expired_keys)
+        return states
 
     async def update_websocket_states(self):
         loop = asyncio.get_event_loop()
@@ -469,6 +820,14 @@ class RedisWebsocket:
         redis_username = datasources.redis.config.get("username", "ingestor")
         redis_password = datasources.redis.config.get("password")
         self.db = datasources.mongodb
+        self.admission = ConnectionAdmission.from_config(
+            datasources.config.get("websocket_admission")
+        )
+        self.quotas = WebsocketQuotas.from_config(datasources.config.get("websocket_quotas"))
+        self.client_stats: dict[str, ConnectionStats] = {}
+        self.stream_clients: dict[str, asyncio.Queue] = {}
+        # stream clients whose end of stream was already queued
+        self.closed_stream_clients: set[str] = set()
         self.socket = AtlasSocketioServer(
             transports=["websocket"],
             ping_timeout=60,
@@ -482,11 +841,19 @@ class RedisWebsocket:
         )
         self.app = socketio.ASGIApp(self.socket, socketio_path=f"{prefix}/ws")
         self.loop = asyncio.get_event_loop()
+        self.message_bridge = ThreadToLoopBridge(self.loop, self._emit_messages)
+        self.stream_reader = StreamReader(datasources.redis.client, cb=self.on_redis_message)
         self.users = {}
+        self.room_subscribers: dict[str, set[str]] = {}
+        self.room_cursors: dict[str, str] = {}
+        self._pending_snapshots: list[tuple[str, str, str, str, list | None]] = []
+        self._snapshot_task: asyncio.Task | None = None
+        self._pending_reads: list[tuple[str, asyncio.Future]] = []
+        self._read_task: asyncio.Task | None = None
 
         self.socket.on("connect", self.connect_client)
         self.socket.on("register", self.redis_register)
-        self.socket.on("unregister", self.redis.unregister)
+        self.socket.on("unregister", self.redis_unregister)
         self.socket.on("disconnect", self.disconnect_client)
         print("Redis websocket started")
 
@@ -519,13 +886,7 @@ class RedisWebsocket:
         if not deployment:
             raise ValueError("Deployment not found in query parameters")
 
-        deployment_access = self.db.find_one(
-            "deployment_access", {"_id": ObjectId(deployment)}, DeploymentAccess
-        )
-        if not deployment_access:
-            raise ValueError("Deployment not found")
-
-        access = self.redis_router.get_access(user, deployment_access)
+        access = self.redis_router.get_access_decision(user, deployment).access
         if access == RemoteAccess.NONE:
             raise ValueError("User does not have remote access to the deployment")
 
@@ -562,38 +923,63 @@ class RedisWebsocket:
             return
 
         try:
-            user, deployment, access = self._validate_new_user(http_query, auth_token)
+            async with self.admission.admit():
+                await self._setup_client(sid, http_query, auth_token)
+        except AdmissionRejected as exc:
+            logger.warning(f"Rejected websocket connection {sid}: {exc}")
+            await self.disconnect_client(
+                sid, reason="Server busy", retry_after=round(exc.retry_after, 1)
+            )
+
+    async def _setup_client(self, sid: str, http_query: str | dict | None, auth_token: str):
+        """
+        Validate a new client and restore its previous subscriptions.
+
+        Args:
+            sid (str): The socket id of the client
+            http_query (str | dict | None): The query parameters of the websocket connection
+            auth_token (str): The authentication token of the user
+        """
+        try:
+            # token decoding and database lookups must not block the event loop
+            user, deployment, access = await asyncio.to_thread(
+                self._validate_new_user, http_query, auth_token
+            )
         except ValueError:
             await self.disconnect_client(sid, reason="Invalid user or deployment")
             return
 
         # check if the user was already registered in redis
-        socketio_server_keys = await self.socket.manager.redis.keys(
-            RedisAtlasEndpoints.websocket_state(deployment, "*")
-        )
-        if not socketio_server_keys:
-            state_data = []
-        else:
-            state_data = await self.socket.manager.redis.mget(*socketio_server_keys)
+        state_data = await self.socket.manager.get_websocket_states(deployment)
+        connections = [value for obj in state_data for value in obj.values()]
+        try:
+            self._check_connection_quota(user.email, connections)
+        except ValueError as exc:
+            await self.disconnect_client(sid, reason=str(exc))
+            return
+
         info = {}
-        for data in state_data:
-            if not data:
-                continue
-            obj = json.loads(data)
-            for value in obj.values():
-                info[value["user"]] = value["subscriptions"]
+        for value in connections:
+            info[value["user"]] = value["subscriptions"]
 
+        self.client_stats[sid] = ConnectionStats()
         if user.email in info:
             self.users[sid] = {"user": user.email, "subscriptions": [], "deployment": deployment}
-            for endpoint, endpoint_request in info[user]:
+            for endpoint, endpoint_request in info[user.email]:
                 print(f"Registering {endpoint}")
-                await self._update_user_subscriptions(sid, endpoint, endpoint_request)
+                try:
+                    await self._update_user_subscriptions(sid, endpoint, endpoint_request)
+                except ValueError as exc:
+                    logger.warning(f"Stopped restoring subscriptions of {sid}: {exc}")
+                    break
         else:
             self.users[sid] = {"user": user.email, "subscriptions": [], "deployment": deployment}
 
         await self.socket.manager.update_websocket_states()
 
-    async def disconnect_client(self, sid, reason: str = None, _environ=None):
+    async def disconnect_client(
+        self, sid, reason: str = None, _environ=None, retry_after: float | None = None
+    ):
         """
         Disconnect a client from the websocket.
 
@@ -601,29 +987,69 @@ class RedisWebsocket:
             sid (str): The socket id of the client
             reason (str): The reason for disconnection
             _environ (dict): The environment of the websocket connection
+            retry_after (float | None): The delay in seconds after which the client
+                should reconnect
         """
         is_exit = self.fastapi_app.server.should_exit
         if is_exit:
             return
         if reason:
-            await self.socket.emit("error", {"error": reason}, room=sid)
+            error = {"error": reason}
+            if retry_after is not None:
+                error["retry_after"] = retry_after
+            await self.socket.emit("error", error, room=sid)
+        self.active_connections.discard(sid)
         if sid in self.users:
+            for endpoint, _ in list(self.users[sid]["subscriptions"]):
+                self._release_room(sid, self.users[sid]["deployment"], endpoint)
             del self.users[sid]
+        self.client_stats.pop(sid, None)
         await self.socket.disconnect(sid)
 
     @safe_socket
-    async def redis_register(self, sid: str, msg: str):
+    async def redis_register(self, sid: str, msg: str, last_id: str | None = None):
         """
         Register a client to a redis channel.
 
         Args:
             sid (str): The socket id of the client
             msg (str): The message sent by the client
+            last_id (str | None): The last stream id received by the client. If given,
+                the client receives all entries of the stream after this id.
         """
         if sid not in self.active_connections:
             self.active_connections.add(sid)
+        endpoint = self._get_endpoint_from_request(msg)
+        if last_id is not None:
+            self._validate_stream_id(last_id)
+            # resume an existing subscription from the given stream id
+            await self._remove_user_subscription(sid, endpoint.endpoint)
+        await self._update_user_subscriptions(sid, endpoint.endpoint, msg, last_id=last_id)
+
+    @safe_socket
+    async def redis_unregister(self, sid: str, msg: str):
+        """
+        Unregister a client from a redis channel.
+
+        Args:
+            sid (str): The socket id of the client
+            msg (str): The message sent by the client
+        """
+        endpoint = self._get_endpoint_from_request(msg)
+        await self._remove_user_subscription(sid, endpoint.endpoint)
+
+    @staticmethod
+    def _get_endpoint_from_request(msg: str) -> EndpointInfo:
+        """
+        Get the endpoint from a register or unregister request.
+
+        Args:
+            msg (str): The message sent by the client
+
+        Returns:
+            EndpointInfo: The requested endpoint
+        """
         try:
-            print(msg)
             data = json.loads(msg)
         except json.JSONDecodeError as exc:
             raise ValueError("Invalid JSON message") from exc
@@ -637,47 +1063,495 @@ class RedisWebsocket:
             args = data.get("args", [])
             if not isinstance(args, list):
                 args = [args]
-            endpoint: MessageEndpoints = endpoint(*args)
-        else:
-            endpoint: MessageEndpoints = endpoint()
+            return endpoint(*args)
+        return endpoint()
+
+    @staticmethod
+    def _validate_stream_id(stream_id: str):
+        """
+        Validate a stream id sent by a client.
 
-        await self._update_user_subscriptions(sid, endpoint.endpoint, msg)
+        Args:
+            stream_id (str): The stream id
+
+        Raises:
+            ValueError: If the stream id is invalid
+        """
+        try:
+            stream_id_key(stream_id)
+        except (AttributeError, ValueError) as exc:
+            raise ValueError(f"Invalid stream id {stream_id}") from exc
 
-    async def _update_user_subscriptions(self, sid: str, endpoint: str, endpoint_request: str):
+    async def _update_user_subscriptions(
+        self, sid: str, endpoint: str, endpoint_request: str, last_id: str | None = None
+    ):
         deployment = self.users[sid]["deployment"]
+        if any(sub_endpoint == endpoint for sub_endpoint, _ in self.users[sid]["subscriptions"]):
+            return
+        self._check_subscription_quota(sid)
 
-        endpoint_info = EndpointInfo(
-            RedisAtlasEndpoints.redis_data(deployment, endpoint), Any, MessageOp.STREAM
-        )
+        room = await self._join_room(sid, deployment, endpoint, endpoint_request, last_id)
+        # no await may suspend between the replay and entering the room
+        await self.socket.enter_room(sid, room)
+        self.users[sid]["subscriptions"].append((endpoint, endpoint_request))
+        await self.socket.manager.update_websocket_states()
 
+    async def _join_room(
+        self,
+        sid: str,
+        deployment: str,
+        endpoint: str,
+        endpoint_request: str,
+        last_id: str | None = None,
+    ) -> str:
+        """
+        Add a client to the subscribers of a room. The redis stream of the room is read
+        once the first subscriber joined. The client receives the entries it missed since
+        last_id or, without a last_id, the most recent entry of the stream.
+
+        Args:
+            sid (str): The socket id of the client
+            deployment (str): The deployment id
+            endpoint (str): The endpoint of the room
+            endpoint_request (str): The register request of the client
+            last_id (str | None): The last stream id received by the client
+
+        Returns:
+            str: The room
+        """
         room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
-        self.redis.register(
-            endpoint_info,
-            cb=self.on_redis_message,
-            parent=self,
-            room=room,
-            endpoint_request=endpoint_request,
+        stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+        last_entry = None
+        if last_id is None and not self.room_subscribers.get(room):
+            # the most recent entry is both the start of the room and the client's snapshot
+            last_entry = await self._read_last_entry(stream)
+        subscribers = self.room_subscribers.setdefault(room, set())
+        is_new_room = not subscribers
+        subscribers.add(sid)
+        if is_new_room:
+            # first subscriber of the room; read the redis stream from the client's last id
+            # or, without a last id, after the most recent entry
+            start_id = last_id
+            if start_id is None:
+                start_id = last_entry[0][0].decode() if last_entry else "0-0"
+            self.room_cursors[room] = self.stream_reader.add(
+                stream, start_id, parent=self, room=room, endpoint_request=endpoint_request
+            )
+        elif last_id is not None:
+            await self._replay_stream(sid, room, stream, last_id, endpoint_request)
+        if last_id is None:
+            self._queue_snapshot(sid, room, stream, endpoint_request, last_entry)
+        return room
+
+    async def add_stream_client(
+        self, deployment: str, endpoint: str, endpoint_request: str, last_id: str | None = None
+    ) -> tuple[str, asyncio.Queue]:
+        """
+        Add a read-only stream client, e.g. of a server-sent events connection, to the
+        room of an endpoint. The messages of the room are put into the returned queue;
+        None marks the end of the stream.
+
+        Args:
+            deployment (str): The deployment id
+            endpoint (str): The endpoint of the room
+            endpoint_request (str): The request of the client
+            last_id (str | None): The last stream id received by the client
+
+        Returns:
+            tuple[str, asyncio.Queue]: The client id and the message queue of the client
+        """
+        if last_id is not None:
+            self._validate_stream_id(last_id)
+        client_id = f"stream/{uuid.uuid4()}"
+        queue = asyncio.Queue()
+        self.stream_clients[client_id] = queue
+        self.client_stats[client_id] = ConnectionStats()
+        try:
+            await self._join_room(client_id, deployment, endpoint, endpoint_request, last_id)
+        except BaseException:
+            # also release a partially joined room if the request was cancelled
+            self.remove_stream_client(client_id, deployment, endpoint)
+            raise
+        return client_id, queue
+
+    def remove_stream_client(self, client_id: str, deployment: str, endpoint: str):
+        """
+        Remove a read-only stream client from the room of an endpoint.
+
+        Args:
+            client_id (str): The id of the stream client
+            deployment (str): The deployment id
+            endpoint (str): The endpoint of the room
+        """
+        self.stream_clients.pop(client_id, None)
+        self.closed_stream_clients.discard(client_id)
+        self.client_stats.pop(client_id, None)
+        self._release_room(client_id, deployment, endpoint)
+
+    async def _remove_user_subscription(self, sid: str, endpoint: str):
+        if sid not in self.users:
+            return
+        subscriptions = self.users[sid]["subscriptions"]
+        remaining = [sub for sub in subscriptions if sub[0] != endpoint]
+        if len(remaining) == len(subscriptions):
+            return
+        self.users[sid]["subscriptions"] = remaining
+        deployment = self.users[sid]["deployment"]
+        self._release_room(sid, deployment, endpoint)
+        await self.socket.leave_room(
+            sid, RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
         )
-        if endpoint not in self.users[sid]["subscriptions"]:
-            await self.socket.enter_room(sid, room)
-            self.users[sid]["subscriptions"].append((endpoint, endpoint_request))
-            await self.socket.manager.update_websocket_states()
+
+    def _release_room(self, sid: str, deployment: str, endpoint: str):
+        """
+        Remove a client from the subscribers of a room. The redis subscription of the
+        room is removed once the last subscriber left.
+
+        Args:
+            sid (str): The socket id of the client
+            deployment (str): The deployment id
+            endpoint (str): The endpoint of the room
+        """
+        room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+        subscribers = self.room_subscribers.get(room)
+        if subscribers is None:
+            return
+        subscribers.discard(sid)
+        if subscribers:
+            return
+        del self.room_subscribers[room]
+        self.room_cursors.pop(room, None)
+        self.stream_reader.remove(RedisAtlasEndpoints.redis_data(deployment, endpoint))
+
+    async def _replay_stream(
+        self, sid: str, room: str, stream: str, last_id: str, endpoint_request: str
+    ):
+        """
+        Send the entries of a stream that a client missed since its last id. Only
+        entries that were already emitted to the room are replayed; all later entries
+        reach the client through the room once it entered it.
+
+        Args:
+            sid (str): The socket id of the client
+            room (str): The room of the stream
+            stream (str): The stream key
+            last_id (str): The last stream id received by the client
+            endpoint_request (str): The register request of the client
+        """
+        sent_id = last_id
+        while True:
+            cursor = self.room_cursors.get(room)
+            if cursor is None or stream_id_key(cursor) <= stream_id_key(sent_id):
+                return
+            entries = await self.redis_router.redis.xrange(
+                stream, f"({sent_id}", cursor, count=1000
+            )
+            if not entries:
+                return
+            for entry_id, fields in entries:
+                sent_id = entry_id.decode()
+                outgoing = self._serialize_message(
+                    sent_id, self._decode_stream_entry(fields), room, endpoint_request
+                )
+                await self._emit_to_client(sid, sent_id, outgoing)
+
+    def _queue_snapshot(
+        self,
+        sid: str,
+        room: str,
+        stream: str,
+        endpoint_request: str,
+        last_entry: list | None = None,
+    ):
+        """
+        Queue sending the most recent entry of a stream to a newly subscribed client.
+
+        Args:
+            sid (str): The socket id of the client
+            room (str): The room of the stream
+            stream (str): The stream key
+            endpoint_request (str): The register request of the client
+            last_entry (list | None): The most recent entry if it was already read, as
+                returned by XREVRANGE. If None, the entry is read before it is sent.
+        """
+        self._pending_snapshots.append((sid, room, stream, endpoint_request, last_entry))
+        if self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._send_snapshots())
+
+    async def _send_snapshots(self):
+        """
+        Send the most recent stream entries to newly subscribed clients. All subscriptions
+        registered until the event loop runs this task are fetched in one pipelined read.
+        """
+        try:
+            while self._pending_snapshots:
+                await asyncio.sleep(0)
+                pending, self._pending_snapshots = self._pending_snapshots, []
+                await self._emit_snapshots(pending)
+        finally:
+            self._snapshot_task = None
+
+    async def _emit_snapshots(self, pending: list[tuple[str, str, str, str, list | None]]):
+        """
+        Read the most recent entries of the given streams and emit them to the clients.
+        Entries that were already read are not read again.
+
+        Args:
+            pending (list[tuple[str, str, str, str, list | None]]): The socket ids, rooms,
+                stream keys, register requests and already read entries of the new
+                subscriptions
+        """
+        streams = [stream for _, _, stream, _, entries in pending if entries is None]
+        results = iter([])
+        if streams:
+            try:
+                results = iter(await self._read_last_entries(streams))
+            # pylint: disable=broad-except
+            except Exception as exc:
+                logger.error(f"Failed to read stream snapshots: {exc}")
+                pending = [item for item in pending if item[4] is not None]
+
+        for sid, room, _, endpoint_request, entries in pending:
+            if entries is None:
+                entries = next(results)
+            if not entries or sid not in self.room_subscribers.get(room, ()):
+                continue
+            entry_id, fields = entries[0]
+            entry_id = entry_id.decode()
+            cursor = self.room_cursors.get(room)
+            if cursor is not None and stream_id_key(cursor) > stream_id_key(entry_id):
+                # the client already received a newer entry through the room
+                continue
+            outgoing = self._serialize_message(
+                entry_id, self._decode_stream_entry(fields), room, endpoint_request
+            )
+            await self._emit_to_client(sid, entry_id, outgoing)
+
+    async def _read_last_entry(self, stream: str) -> list:
+        """
+        Read the most recent entry of a stream. The reads of all streams requested until
+        the event loop runs the read task are fetched in one pipelined read.
+
+        Args:
+            stream (str): The stream key
+
+        Returns:
+            list: The entry id and fields of the most recent entry as returned by
+                XREVRANGE; empty if the stream has no entries
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending_reads.append((stream, future))
+        if self._read_task is None:
+            self._read_task = asyncio.create_task(self._read_pending_entries())
+        return await future
+
+    async def _read_pending_entries(self):
+        try:
+            while self._pending_reads:
+                await asyncio.sleep(0)
+                pending, self._pending_reads = self._pending_reads, []
+                try:
+                    results = await self._read_last_entries([stream for stream, _ in pending])
+                # pylint: disable=broad-except
+                except Exception as exc:
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+                for (_, future), entries in zip(pending, results):
+                    if not future.done():
+                        future.set_result(entries)
+        finally:
+            self._read_task = None
+
+    async def _read_last_entries(self, streams: list[str]) -> list:
+        async with self.redis_router.redis.pipeline(transaction=False) as pipe:
+            for stream in streams:
+                pipe.xrevrange(stream, count=1)
+            return await pipe.execute()
+
+    @staticmethod
+    def _decode_stream_entry(fields: dict) -> dict:
+        return {key.decode(): MsgpackSerialization.loads(val) for key, val in fields.items()}
 
     @staticmethod
-    def on_redis_message(message, parent, room, endpoint_request):
-        async def emit_message(message):
-            if "pubsub_data" in message:
-                msg = message["pubsub_data"]
+    def _serialize_message(stream_id: str, message: dict, room: str, endpoint_request: str) -> str:
+        if "pubsub_data" in message:
+            msg = message["pubsub_data"]
+        else:
+            msg = message["data"]
+        outgoing = {
+            "data": msg.content,
+            "metadata": msg.metadata,
+            "endpoint": room.split("/", 3)[-1],
+            "endpoint_request": endpoint_request,
+            "stream_id": stream_id,
+        }
+        return json_ext.dumps(outgoing)
+
+    @staticmethod
+    def on_redis_message(stream_id, message, parent, room, endpoint_request):
+        """
+        Callback for entries of subscribed redis streams. It is called on the
+        stream reader thread; the serialized message is handed over to the event loop
+        through the message bridge and emitted to the room from there.
+        """
+        outgoing = parent._serialize_message(stream_id, message, room, endpoint_request)
+        parent.message_bridge.put((room, stream_id, outgoing))
+
+    async def _emit_messages(self, batch: list[tuple[str, str, str]]):
+        """
+        Emit a batch of serialized messages to their rooms.
+
+        Args:
+            batch (list[tuple[str, str, str]]): The rooms, stream ids and serialized messages
+        """
+        slow_sids = set()
+        for room, stream_id, outgoing in batch:
+            cursor = self.room_cursors.get(room)
+            if cursor is not None and stream_id_key(stream_id) > stream_id_key(cursor):
+                self.room_cursors[room] = stream_id
+            skip_sids = []
+            for sid in self.room_subscribers.get(room, ()):
+                throttle_time = self._account_message(sid, len(outgoing))
+                if throttle_time is None:
+                    continue
+                skip_sids.append(sid)
+                if throttle_time > self.quotas.max_throttle_time:
+                    slow_sids.add(sid)
+            await self.socket.emit("message", data=outgoing, room=room, skip_sid=skip_sids or None)
+            for sid in self.room_subscribers.get(room, ()):
+                if sid in self.stream_clients and sid not in skip_sids:
+                    self.stream_clients[sid].put_nowait((stream_id, outgoing))
+        for sid in slow_sids:
+            logger.warning(f"Disconnecting slow websocket client {sid}")
+            if sid in self.stream_clients:
+                # end the stream once; the client is removed when its response closes
+                if sid not in self.closed_stream_clients:
+                    self.closed_stream_clients.add(sid)
+                    self.stream_clients[sid].put_nowait(None)
             else:
-                msg = message["data"]
-            outgoing = {
-                "data": msg.content,
-                "metadata": msg.metadata,
-                "endpoint": room.split("/", 3)[-1],
-                "endpoint_request": endpoint_request,
-            }
-            outgoing = json_ext.dumps(outgoing)
-            await parent.socket.emit("message", data=outgoing, room=room)
+                await self.disconnect_client(sid, reason="Client too slow")
+
+    async def _emit_to_client(self, sid: str, stream_id: str, outgoing: str):
+        """
+        Emit a serialized message to a single client, unless the client is throttled.
 
-        # Run the coroutine in this loop
-        asyncio.run_coroutine_threadsafe(emit_message(message), parent.loop)
+        Args:
+            sid (str): The socket id of the client
+            stream_id (str): The stream id of the message
+            outgoing (str): The serialized message
+        """
+        if self._account_message(sid, len(outgoing)) is not None:
+            return
+        if sid in self.stream_clients:
+            self.stream_clients[sid].put_nowait((stream_id, outgoing))
+            return
+        await self.socket.emit("message", data=outgoing, room=sid)
+
+    def _account_message(self, sid: str, size: int) -> float | None:
+        """
+        Account an outbound message of a client. Messages for clients whose outbound
+        queue exceeds the quota are dropped.
+
+        Args:
+            sid (str): The socket id of the client
+            size (int): The size of the message
+
+        Returns:
+            float | None: The time in seconds the client has been throttled or None if
+                the message can be sent
+        """
+        stats = self.client_stats.get(sid)
+        if stats is None:
+            return None
+        throttle_time = stats.update_queue(
+            self._get_queued_messages(sid), self.quotas.max_queued_messages
+        )
+        if throttle_time is not None:
+            stats.record_dropped()
+        else:
+            stats.record_sent(size)
+        return throttle_time
+
+    def _get_queued_messages(self, sid: str) -> int:
+        """
+        Get the number of queued outbound packets of a client.
+
+        Args:
+            sid (str): The socket id of the client
+
+        Returns:
+            int: The number of queued packets, 0 if the client is not connected to this host
+        """
+        if sid in self.stream_clients:
+            return self.stream_clients[sid].qsize()
+        eio_sid = self.socket.manager.eio_sid_from_sid(sid, "/")
+        eio_socket = self.socket.eio.sockets.get(eio_sid) if eio_sid else None
+        if eio_socket is None:
+            return 0
+        return eio_socket.queue.qsize()
+
+    def _check_connection_quota(self, user: str, connections: list[dict]):
+        """
+        Check the connection quotas of a new client.
+
+        Args:
+            user (str): The email of the user
+            connections (list[dict]): The clients of the deployment on all backend hosts
+
+        Raises:
+            ValueError: If a connection quota is exceeded
+        """
+        if len(connections) >= self.quotas.max_connections_per_deployment:
+            raise ValueError("Connection limit of the deployment reached")
+        user_connections = sum(1 for value in connections if value["user"] == user)
+        if user_connections >= self.quotas.max_connections_per_user:
+            raise ValueError("Connection limit of the user reached")
+
+    def _check_subscription_quota(self, sid: str):
+        """
+        Check the subscription quotas of a client before adding a subscription.
+
+        Args:
+            sid (str): The socket id of the client
+
+        Raises:
+            ValueError: If a subscription quota is exceeded
+        """
+        deployment = self.users[sid]["deployment"]
+        user = self.users[sid]["user"]
+        deployment_subscriptions = 0
+        user_subscriptions = 0
+        for info in self.users.values():
+            if info["deployment"] != deployment:
+                continue
+            deployment_subscriptions += len(info["subscriptions"])
+            if info["user"] == user:
+                user_subscriptions += len(info["subscriptions"])
+        if deployment_subscriptions >= self.quotas.max_subscriptions_per_deployment:
+            raise ValueError("Subscription limit of the deployment reached")
+        if user_subscriptions >= self.quotas.max_subscriptions_per_user:
+            raise ValueError("Subscription limit of the user reached")
+
+    def get_client_state(self, sid: str) -> dict:
+        """
+        Get the websocket state of a client, including its outbound accounting.
+
+        Args:
+            sid (str): The socket id of the client
+
+        Returns:
+            dict: The user, deployment, subscriptions and stats of the client
+        """
+        state = dict(self.users[sid])
+        stats = self.client_stats.get(sid)
+        if stats is not None:
+            state["stats"] = {**stats.to_dict(), "subscriptions": len(state["subscriptions"])}
+        return state
+
+    def shutdown(self):
+        """
+        Shutdown the websocket handler.
+        """
+        self.stream_reader.shutdown()
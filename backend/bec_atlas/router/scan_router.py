@@ -144,7 +144,7 @@ class ScanRouter(BaseRouter):
             scan_id (str): The scan id
             user_data (dict): The user data to update
         """
-        current_user = self.get_user_from_db(current_user.token, current_user.email)
+        current_user = await self.get_user(current_user)
         out = self.db.patch(
             "scans",
             id=scan_id,
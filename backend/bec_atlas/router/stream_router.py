@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, AsyncIterator
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from bec_atlas.authentication import convert_to_user, get_current_user
+from bec_atlas.model.model import User
+from bec_atlas.router.base_router import BaseRouter
+from bec_atlas.router.redis_router import RedisWebsocket, RemoteAccess
+
+if TYPE_CHECKING:  # pragma: no cover
+    from bec_atlas.datasources.datasource_manager import DatasourceManager
+
+
+class StreamRouter(BaseRouter):
+    """
+    Read-only server-sent events access to the endpoints of a deployment. Clients are
+    added to the same rooms as the websocket clients and resume a stream through the
+    Last-Event-ID header, which the browser sends automatically on reconnect.
+    """
+
+    KEEP_ALIVE_INTERVAL = 15
+
+    def __init__(self, datasources: DatasourceManager, websocket: RedisWebsocket, prefix="/api/v1"):
+        super().__init__(datasources, prefix)
+        self.websocket = websocket
+        self.router = APIRouter(prefix=prefix)
+        self.router.add_api_route(
+            "/stream",
+            self.stream,
+            methods=["GET"],
+            description="Stream the messages of an endpoint as server-sent events",
+            response_class=StreamingResponse,
+        )
+
+    @convert_to_user
+    async def stream(
+        self,
+        deployment: str,
+        endpoint: str,
+        args: list[str] = Query(default=[]),
+        last_event_id: str | None = Header(default=None),
+        current_user: User = Depends(get_current_user),
+    ) -> StreamingResponse:
+        """
+        Stream the messages of an endpoint of the specified deployment.
+
+        Args:
+            deployment (str): The deployment id
+            endpoint (str): The name of the message endpoint
+            args (list[str]): The arguments of the message endpoint
+            last_event_id (str | None): The last stream id received by the client
+            current_user (User): The current user
+
+        Returns:
+            StreamingResponse: The event stream
+        """
+        if not ObjectId.is_valid(deployment):
+            raise HTTPException(status_code=400, detail="Invalid deployment ID")
+        endpoint_request = json.dumps({"endpoint": endpoint, "args": args})
+        try:
+            endpoint_info = RedisWebsocket._get_endpoint_from_request(endpoint_request)
+            access = self.websocket.redis_router.get_access_decision(current_user, deployment)
+        except (ValueError, TypeError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if access.access == RemoteAccess.NONE:
+            raise HTTPException(
+                status_code=403, detail="User does not have remote access to the deployment"
+            )
+
+        if last_event_id is not None:
+            try:
+                self.websocket._validate_stream_id(last_event_id)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        return StreamingResponse(
+            self._event_stream(deployment, endpoint_info.endpoint, endpoint_request, last_event_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def _event_stream(
+        self, deployment: str, endpoint: str, endpoint_request: str, last_id: str | None
+    ) -> AsyncIterator[str]:
+        """
+        Add a stream client to the room of the endpoint and format its messages as
+        server-sent events. The client is only added once the response is streamed, so
+        that a client that disconnects before is never registered. A comment is sent if
+        no message arrived within the keep-alive interval, so that idle connections are
+        not closed by proxies.
+
+        Args:
+            deployment (str): The deployment id
+            endpoint (str): The endpoint of the room
+            endpoint_request (str): The request of the client
+            last_id (str | None): The last stream id received by the client
+
+        Yields:
+            str: The server-sent events
+        """
+        client_id, queue = await self.websocket.add_stream_client(
+            deployment, endpoint, endpoint_request, last_id=last_id
+        )
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=self.KEEP_ALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                stream_id, outgoing = item
+                yield f"id: {stream_id}\nevent: message\ndata: {outgoing}\n\n"
+        finally:
+            self.websocket.remove_stream_client(client_id, deployment, endpoint)
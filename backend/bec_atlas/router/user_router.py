@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import TYPE_CHECKING, Annotated
 
 from fastapi import APIRouter, Depends, Query, Response
@@ -11,6 +12,7 @@ from pydantic import BaseModel
 from bec_atlas.authentication import (
     convert_to_user,
     create_access_token,
+    create_claims_token,
     get_current_user,
     verify_password,
 )
@@ -18,6 +20,8 @@ from bec_atlas.datasources.mongodb.mongodb import MongoDBDatasource
 from bec_atlas.model import UserInfo
 from bec_atlas.model.model import TokenResponse, User
 from bec_atlas.router.base_router import BaseRouter
+from bec_atlas.utils.admission import AdmissionRejected
+from bec_atlas.utils.bounded_executor import BoundedExecutor
 from bec_atlas.utils.ldap_auth import LDAPUserService
 
 logger = logging.getLogger(__name__)
@@ -36,8 +40,21 @@ class UserRouter(BaseRouter):
         super().__init__(datasources, prefix)
         self.use_ssl = use_ssl
         self.db: MongoDBDatasource = self.datasources.mongodb
-        self.ldap = LDAPUserService(
-            ldap_server="ldaps://d.psi.ch", base_dn="OU=users,OU=psi,DC=d,DC=psi,DC=ch"
+        ldap_config = {
+            "ldap_server": "ldaps://d.psi.ch",
+            "base_dn": "OU=users,OU=psi,DC=d,DC=psi,DC=ch",
+            **(self.datasources.config.get("ldap") or {}),
+        }
+        self.ldap = LDAPUserService(**ldap_config)
+        # password hashing and LDAP binds block for a long time, so they are run on a
+        # separate pool to keep the event loop responsive during login bursts
+        self.login_pool = BoundedExecutor.from_config(
+            self.datasources.config.get("login_pool"), name="login"
+        )
+        # lifetime in minutes of claims-carrying tokens; None to issue tokens with the email only
+        claims_tokens = self.datasources.config.get("claims_tokens")
+        self.claims_token_lifetime = (
+            claims_tokens.get("expire_minutes", 15) if claims_tokens else None
         )
         self.router = APIRouter(prefix=prefix)
         self.router.add_api_route("/user/me", self.user_me, methods=["GET"])
@@ -88,7 +105,7 @@ class UserRouter(BaseRouter):
         ] = None,
     ):
         logger.info(f"Attempting login for user: {user_login.username}")
-        token = self._user_login(user_login, response, expires_delta)
+        token = await self._user_login(user_login, response, expires_delta)
         logger.info(f"Login successful for user: {user_login.username}")
         return TokenResponse(access_token=token, token_type="bearer")
 
@@ -96,20 +113,57 @@ class UserRouter(BaseRouter):
         response.delete_cookie("access_token")
         return {"message": "Logged out"}
 
-    def _user_login(
+    async def _user_login(
         self,
         user_login: UserLoginRequest,
         response: Response | None,
         expires_delta: int | None = None,
     ) -> str:
-        user = self._get_user(user_login)
+        if self.claims_token_lifetime is not None:
+            # read the version before the groups, so that a concurrent group change
+            # invalidates the claims instead of being missed
+            group_version = await self.datasources.group_version.get()
+        user = await self.verify_login(user_login)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found or password is incorrect")
-        token = create_access_token(data={"email": user.email}, expires_delta=expires_delta)
+        if self.claims_token_lifetime is None:
+            token = create_access_token(data={"email": user.email}, expires_delta=expires_delta)
+        else:
+            lifetime = min(expires_delta or self.claims_token_lifetime, self.claims_token_lifetime)
+            token = create_claims_token(user, group_version, expires_delta=lifetime)
         if response:
             response.set_cookie(key="access_token", value=token, httponly=True, secure=self.use_ssl)
         return token
 
+    async def verify_login(self, user_login: UserLoginRequest) -> User | None:
+        """
+        Verify the credentials of a user on the login pool.
+
+        Args:
+            user_login (UserLoginRequest): The login request
+
+        Raises:
+            HTTPException: If the login pool is saturated
+
+        Returns:
+            User | None: The user or None if the credentials are invalid
+        """
+        try:
+            return await self.login_pool.run(self._get_user, user_login)
+        except AdmissionRejected as exc:
+            logger.warning(f"Rejected login for user {user_login.username}: {exc}")
+            raise HTTPException(
+                status_code=503,
+                detail="Too many concurrent logins, please retry later",
+                headers={"Retry-After": str(math.ceil(exc.retry_after))},
+            ) from exc
+
+    def shutdown(self):
+        """
+        Shut down the login pool.
+        """
+        self.login_pool.shutdown()
+
     def _get_user(self, user_login: UserLoginRequest) -> UserInfo | None:
         user = self._get_functional_account(user_login)
         if user is None:
@@ -149,4 +203,9 @@ class UserRouter(BaseRouter):
             self.db.patch(
                 collection="users", id=user.id, update={"groups": user_info.groups}, dtype=None
             )
+            user_info.id = user.id
+            if set(user.groups) != set(user_info.groups):
+                # invalidate the claims of tokens issued with the previous groups
+                # called on the login pool, outside of the event loop
+                self.datasources.group_version.bump_sync()
         return user_info
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+
+def redis_glob_to_regex(pattern: str) -> str:
+    """
+    Translate a Redis glob-style pattern into a regular expression. The translation
+    follows the rules of Redis' stringmatch: '*' matches any sequence of characters
+    (including '/'), '?' matches a single character, '[...]' matches a character set
+    ('^' negates it, ranges are supported) and '\\' escapes the next character.
+
+    Args:
+        pattern (str): The Redis glob pattern
+
+    Returns:
+        str: The regular expression matching the same strings
+    """
+    out = []
+    ii = 0
+    length = len(pattern)
+    while ii < length:
+        char = pattern[ii]
+        if char == "*":
+            while ii + 1 < length and pattern[ii + 1] == "*":
+                ii += 1
+            out.append(".*")
+        elif char == "?":
+            out.append(".")
+        elif char == "\\" and ii + 1 < length:
+            ii += 1
+            out.append(re.escape(pattern[ii]))
+        elif char == "[" and "]" in pattern[ii + 1 :]:
+            end = pattern.index("]", ii + 1)
+            content = pattern[ii + 1 : end]
+            negate = content.startswith("^")
+            if negate:
+                content = content[1:]
+            members = []
+            jj = 0
+            while jj < len(content):
+                if content[jj] == "\\" and jj + 1 < len(content):
+                    jj += 1
+                    members.append(re.escape(content[jj]))
+                elif jj + 2 < len(content) and content[jj + 1] == "-":
+                    start, stop = sorted((content[jj], content[jj + 2]))
+                    members.append(f"{re.escape(start)}-{re.escape(stop)}")
+                    jj += 2
+                else:
+                    members.append(re.escape(content[jj]))
+                jj += 1
+            if not members:
+                # an empty set never matches, an empty negated set matches any character
+                out.append("." if negate else "(?!)")
+            else:
+                out.append(f"[{'^' if negate else ''}{''.join(members)}]")
+            ii = end
+        else:
+            out.append(re.escape(char))
+        ii += 1
+    return "".join(out)
+
+
+def _compile(patterns: list[str]) -> re.Pattern | None:
+    if not patterns:
+        return None
+    combined = "|".join(f"(?:{redis_glob_to_regex(pattern)})" for pattern in set(patterns))
+    return re.compile(f"(?:{combined})\\Z", re.DOTALL)
+
+
+class AccessPatternMatcher:
+    """
+    Matcher for the key and channel rules of a Redis ACL profile. All patterns are
+    compiled once into a combined regular expression per permission, so checks do not
+    depend on re-parsing the rules.
+
+    Key rules follow the Redis ACL syntax: '~pattern' and '%RW~pattern' grant read and
+    write access, '%R~pattern' read access and '%W~pattern' write access. '*' and
+    'allkeys' grant full access. Channel rules are plain patterns, optionally prefixed
+    with '&'. Permissions of all matching rules are combined.
+    """
+
+    def __init__(self, key_patterns: Iterable[str], channel_patterns: Iterable[str]):
+        read_patterns = []
+        write_patterns = []
+        for rule in key_patterns:
+            if rule in ("*", "allkeys"):
+                read_patterns.append("*")
+                write_patterns.append("*")
+                continue
+            permission, separator, pattern = rule.partition("~")
+            if not separator:
+                continue
+            if permission in ("", "%RW", "%WR"):
+                read_patterns.append(pattern)
+                write_patterns.append(pattern)
+            elif permission == "%R":
+                read_patterns.append(pattern)
+            elif permission == "%W":
+                write_patterns.append(pattern)
+
+        channels = []
+        for rule in channel_patterns:
+            if rule == "allchannels":
+                rule = "*"
+            channels.append(rule[1:] if rule.startswith("&") else rule)
+
+        self._read_keys = _compile(read_patterns)
+        self._write_keys = _compile(write_patterns)
+        self._channels = _compile(channels)
+
+    def key_access(self, key: str) -> tuple[bool, bool]:
+        """
+        Get the access to a key.
+
+        Args:
+            key (str): The key
+
+        Returns:
+            tuple[bool, bool]: Whether the key can be read and whether it can be written
+        """
+        can_read = self._read_keys is not None and self._read_keys.match(key) is not None
+        can_write = self._write_keys is not None and self._write_keys.match(key) is not None
+        return can_read, can_write
+
+    def channel_access(self, channel: str) -> bool:
+        """
+        Get the access to a channel.
+
+        Args:
+            channel (str): The channel
+
+        Returns:
+            bool: Whether the channel can be used
+        """
+        return self._channels is not None and self._channels.match(channel) is not None
+
+
+@lru_cache(maxsize=1024)
+def compile_access_patterns(
+    key_patterns: tuple[str, ...], channel_patterns: tuple[str, ...]
+) -> AccessPatternMatcher:
+    """
+    Get the compiled matcher for the given key and channel rules. Matchers are cached
+    per set of rules, so profiles with the same rules share a single matcher.
+
+    Args:
+        key_patterns (tuple[str, ...]): The key rules
+        channel_patterns (tuple[str, ...]): The channel rules
+
+    Returns:
+        AccessPatternMatcher: The compiled matcher
+    """
+    return AccessPatternMatcher(key_patterns, channel_patterns)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from typing import AsyncIterator
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised if a request could not be admitted.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Server busy, retry after {retry_after:.1f} s")
+        self.retry_after = retry_after
+
+
+class ConnectionAdmission:
+    """
+    Admission control for expensive connection setups. At most max_concurrent setups run
+    at the same time; up to max_queued further setups wait for a slot for at most
+    queue_timeout seconds. All other setups are rejected with a randomized retry delay,
+    so that a reconnect storm is spread out instead of saturating the process.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 20,
+        max_queued: int = 500,
+        queue_timeout: float = 10,
+        reconnect_delay: tuple[float, float] = (1, 10),
+    ):
+        """
+        Args:
+            max_concurrent (int): The maximum number of concurrently admitted setups
+            max_queued (int): The maximum number of setups waiting for a slot
+            queue_timeout (float): The maximum time in seconds a setup waits for a slot
+            reconnect_delay (tuple[float, float]): The range in seconds of the retry delay
+                suggested to rejected clients
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.reconnect_delay = tuple(reconnect_delay)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> ConnectionAdmission:
+        """
+        Create the admission control from the service config.
+
+        Args:
+            config (dict | None): The admission config with the keyword arguments of the class
+
+        Returns:
+            ConnectionAdmission: The admission control
+        """
+        return cls(**(config or {}))
+
+    def get_retry_after(self) -> float:
+        """
+        Get a randomized retry delay for rejected clients.
+
+        Returns:
+            float: The retry delay in seconds
+        """
+        return random.uniform(*self.reconnect_delay)
+
+    @contextlib.asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Wait for an admission slot and hold it for the duration of the context.
+
+        Raises:
+            AdmissionRejected: If the queue is full or no slot got free in time
+        """
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.queued >= self.max_queued:
+            self.rejected += 1
+            raise AdmissionRejected(self.get_retry_after())
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError as exc:
+                self.rejected += 1
+                raise AdmissionRejected(self.get_retry_after()) from exc
+            finally:
+                self.queued -= 1
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Get the admission metrics.
+
+        Returns:
+            dict[str, int]: The number of active, queued, admitted and rejected setups
+        """
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
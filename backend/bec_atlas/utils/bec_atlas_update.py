@@ -6,6 +6,7 @@ import yaml
 
 from bec_atlas.ingestor.deployment_ingestor import DeploymentIngestor
 from bec_atlas.ingestor.proposal_ingestor import ProposalIngestor
+from bec_atlas.utils.env_loader import load_env
 
 app = typer.Typer(add_completion=False)
 
@@ -28,12 +29,19 @@ def update_deployments(file_path: str = typer.Argument(None, help="Path to the Y
 
         files = glob.glob(realm_path)
 
+    config = {"host": "localhost", "port": 27017}
+    try:
+        # the redis config is used to notify the API workers about changed deployment access
+        config["redis"] = load_env().get("redis")
+    except FileNotFoundError:
+        typer.echo("No .env.yaml file found; the API workers are not notified about changes.")
+
     for file in files:
         with open(file, "r") as f:
             data = yaml.safe_load(f)
             # Process the YAML data
             typer.echo(f"Updating deployments with data from {file}")
-        DeploymentIngestor({"host": "localhost", "port": 27017}).load(data)
+        DeploymentIngestor(config).load(data)
 
 
 @app.command("experiments")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from bec_atlas.utils.admission import ConnectionAdmission
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking calls, e.g. password hashing or LDAP binds, that must not
+    run on the event loop. At most max_workers calls run at the same time; up to
+    max_queued further calls wait for a worker for at most queue_timeout seconds and
+    all other calls are rejected, so that a burst of calls cannot pile up unbounded.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queued: int = 100,
+        queue_timeout: float = 30,
+        retry_delay: tuple[float, float] = (1, 5),
+        name: str = "bounded_executor",
+    ):
+        """
+        Args:
+            max_workers (int): The number of worker threads
+            max_queued (int): The maximum number of calls waiting for a worker
+            queue_timeout (float): The maximum time in seconds a call waits for a worker
+            retry_delay (tuple[float, float]): The range in seconds of the retry delay
+                suggested to rejected callers
+            name (str): The name prefix of the worker threads
+        """
+        self.admission = ConnectionAdmission(
+            max_concurrent=max_workers,
+            max_queued=max_queued,
+            queue_timeout=queue_timeout,
+            reconnect_delay=retry_delay,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    @classmethod
+    def from_config(cls, config: dict | None, **kwargs) -> BoundedExecutor:
+        """
+        Create the executor from the service config.
+
+        Args:
+            config (dict | None): The executor config with the keyword arguments of the class
+            **kwargs: Defaults for keyword arguments that are not part of the config
+
+        Returns:
+            BoundedExecutor: The executor
+        """
+        return cls(**{**kwargs, **(config or {})})
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on a worker thread.
+
+        Args:
+            func (Callable[..., Any]): The function to run
+            *args: The positional arguments of the function
+            **kwargs: The keyword arguments of the function
+
+        Returns:
+            Any: The return value of the function
+
+        Raises:
+            AdmissionRejected: If the queue is full or no worker got free in time
+        """
+        loop = asyncio.get_running_loop()
+        async with self.admission.admit():
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Get the executor metrics.
+
+        Returns:
+            dict[str, int]: The number of active, queued, admitted and rejected calls
+        """
+        return self.admission.metrics()
+
+    def shutdown(self):
+        """
+        Shut down the worker threads.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,19 +1,93 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
 
-from ldap3 import ALL, SUBTREE, Connection, Server
+from ldap3 import ALL, NONE, SAFE_RESTARTABLE, SUBTREE, Connection, Server
 from ldap3.core.exceptions import LDAPBindError, LDAPSocketOpenError
 
 logger = logging.getLogger(__name__)
 
+USER_ATTRIBUTES = ["cn", "mail", "givenName", "sn", "memberOf"]
+
+
+class DirectoryCache:
+    """
+    TTL cache for the directory attributes and group memberships of users, keyed by
+    the login principal.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, principal: str) -> dict | None:
+        """
+        Get the cached user details of a principal.
+
+        Args:
+            principal (str): The login principal
+
+        Returns:
+            dict | None: The user details or None if not cached or expired
+        """
+        key = principal.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user_data = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            return user_data
+
+    def add(self, principal: str, user_data: dict):
+        """
+        Cache the user details of a principal.
+
+        Args:
+            principal (str): The login principal
+            user_data (dict): The user details
+        """
+        key = principal.lower()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user_data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
 
 class LDAPUserService:
-    def __init__(self, ldap_server, base_dn):
+    def __init__(
+        self, ldap_server, base_dn, service_user=None, service_password=None, cache_ttl: float = 300
+    ):
+        """
+        Args:
+            ldap_server (str): The URL of the LDAP server
+            base_dn (str): The base DN of the user entries
+            service_user (str | None): The DN of the service account used for directory
+                searches. If None, the directory is searched with the user's credentials.
+            service_password (str | None): The password of the service account
+            cache_ttl (float): The time in seconds directory attributes are cached
+        """
         self.server = Server(ldap_server, get_info=ALL, connect_timeout=5)
+        # credential checks only bind, so they do not need the schema of the server
+        self.bind_server = Server(ldap_server, get_info=NONE, connect_timeout=5)
         self.base_dn = base_dn
+        self.service_user = service_user
+        self.service_password = service_password
+        self.directory_cache = DirectoryCache(ttl=cache_ttl)
+        self._service_conn = None
+        self._service_lock = threading.Lock()
 
     def authenticate_and_get_info(self, principal, password):
         """
         Authenticate the user against the LDAP server and extract user details.
+        The credentials are always verified with a bind; the user details are
+        taken from the directory cache if available.
         """
         # Determine DN based on input type
         if "@" in principal:
@@ -28,38 +102,100 @@ class LDAPUserService:
             search_filter = "(objectClass=*)"
 
         try:
-            # Authenticate the user
-            with Connection(self.server, user=bind_dn, password=password) as user_conn:
-                if not user_conn.bind():
+            user_data = self.directory_cache.get(principal)
+            if user_data is not None or self.service_user:
+                if not self._verify_credentials(bind_dn, password):
                     raise LDAPBindError("Invalid credentials")
-
-                # Search for user information
-                user_conn.search(
-                    search_base,
-                    search_filter,
-                    search_scope=SUBTREE,
-                    attributes=["cn", "mail", "givenName", "sn", "memberOf"],
-                )
-                entry = user_conn.entries[0]
-
-                # Extract user details
-                user_data = {
-                    "username": entry.cn.value,
-                    "email": entry.mail.value if "mail" in entry else None,
-                    "first_name": entry.givenName.value if "givenName" in entry else None,
-                    "last_name": entry.sn.value if "sn" in entry else None,
-                    "roles": (
-                        [group.split(",")[0][3:] for group in entry.memberOf]
-                        if "memberOf" in entry
-                        else []
-                    ),
-                }
-                return user_data
+                if user_data is None:
+                    user_data = self._search_user(
+                        self._get_service_connection(), search_base, search_filter
+                    )
+            else:
+                # without a service account, the directory is read with the user's credentials
+                # entering the context binds the connection and raises if the bind fails
+                with Connection(self.server, user=bind_dn, password=password) as user_conn:
+                    user_data = self._search_user(user_conn, search_base, search_filter)
+            self.directory_cache.add(principal, user_data)
+            return user_data
 
         except Exception as e:
             logger.error(f"LDAP authentication failed: {e}")
             return None
 
+    def _verify_credentials(self, bind_dn: str, password: str) -> bool:
+        """
+        Verify the credentials of a user with a single bind.
+
+        Args:
+            bind_dn (str): The DN or user principal name to bind with
+            password (str): The password of the user
+
+        Returns:
+            bool: True if the bind succeeded
+        """
+        conn = Connection(self.bind_server, user=bind_dn, password=password, read_only=True)
+        try:
+            return conn.bind()
+        finally:
+            conn.unbind()
+
+    def _get_service_connection(self) -> Connection:
+        """
+        Get the shared connection of the service account. The connection is thread-safe
+        and reconnects automatically if the server closed it.
+
+        Returns:
+            Connection: The service connection
+        """
+        with self._service_lock:
+            if self._service_conn is None:
+                self._service_conn = Connection(
+                    self.server,
+                    user=self.service_user,
+                    password=self.service_password,
+                    client_strategy=SAFE_RESTARTABLE,
+                    read_only=True,
+                    auto_bind=True,
+                )
+            return self._service_conn
+
+    @staticmethod
+    def _search_user(conn: Connection, search_base: str, search_filter: str) -> dict:
+        """
+        Search the directory for the details of a user.
+
+        Args:
+            conn (Connection): A bound connection
+            search_base (str): The search base
+            search_filter (str): The search filter
+
+        Returns:
+            dict: The user details
+        """
+        out = conn.search(
+            search_base, search_filter, search_scope=SUBTREE, attributes=USER_ATTRIBUTES
+        )
+        # thread-safe strategies return the response instead of storing it on the connection
+        response = out[2] if isinstance(out, tuple) else conn.response
+        entries = [entry for entry in response or [] if entry.get("type") == "searchResEntry"]
+        if not entries:
+            raise ValueError("User not found in the directory")
+        attributes = entries[0]["attributes"]
+
+        def first(name):
+            value = attributes.get(name)
+            if isinstance(value, list):
+                return value[0] if value else None
+            return value
+
+        return {
+            "username": first("cn"),
+            "email": first("mail"),
+            "first_name": first("givenName"),
+            "last_name": first("sn"),
+            "roles": [group.split(",")[0][3:] for group in attributes.get("memberOf") or []],
+        }
+
 
 if __name__ == "__main__":  # pragma: no cover
     ldap_service = LDAPUserService(
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+from typing import Any, Awaitable, Callable
+
+from bec_lib.logger import bec_logger
+
+logger = bec_logger.logger
+
+
+class ThreadToLoopBridge:
+    """
+    Bridge to hand over items from worker threads to an asyncio event loop in batches.
+
+    Threads append items to a bounded queue. The event loop is only woken up when the
+    queue transitions from idle to pending; a single loop-side task then drains the queue
+    in batches until it is empty. If the queue is full, the oldest items are dropped and
+    counted, so that slow consumers cannot grow the memory of the process.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        handler: Callable[[list[Any]], Awaitable[None]],
+        max_size: int = 10000,
+        max_batch_size: int = 500,
+    ):
+        """
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop to hand the items over to
+            handler (Callable[[list[Any]], Awaitable[None]]): Coroutine function called
+                on the event loop with each batch of items
+            max_size (int): The maximum number of queued items
+            max_batch_size (int): The maximum number of items passed to the handler at once
+        """
+        self.loop = loop
+        self.handler = handler
+        self.max_size = max_size
+        self.max_batch_size = max_batch_size
+        self.dropped = 0
+        self.batches = 0
+        self._queue: collections.deque = collections.deque()
+        self._lock = threading.Lock()
+        self._drain_pending = False
+        self._reported_drops = 0
+
+    @property
+    def queue_size(self) -> int:
+        """
+        The number of items waiting to be handled.
+        """
+        return len(self._queue)
+
+    def put(self, item: Any) -> None:
+        """
+        Queue an item. Safe to call from any thread.
+
+        Args:
+            item (Any): The item to queue
+        """
+        with self._lock:
+            if len(self._queue) >= self.max_size:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(item)
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        self.loop.call_soon_threadsafe(self._start_drain)
+
+    def _start_drain(self) -> None:
+        self.loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            with self._lock:
+                batch = []
+                while self._queue and len(batch) < self.max_batch_size:
+                    batch.append(self._queue.popleft())
+                if not batch:
+                    self._drain_pending = False
+                    break
+                dropped = self.dropped
+            if dropped != self._reported_drops:
+                logger.warning(
+                    f"Dropped {dropped - self._reported_drops} queued items; "
+                    f"{dropped} items dropped in total."
+                )
+                self._reported_drops = dropped
+            self.batches += 1
+            try:
+                await self.handler(batch)
+            # pylint: disable=broad-except
+            except Exception as exc:
+                logger.error(f"Failed to handle batch of {len(batch)} items: {exc}")
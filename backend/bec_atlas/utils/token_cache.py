@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache for the claims of verified access tokens. Entries are keyed by a
+    hash of the token, so that the cache does not hold the tokens themselves, and
+    expire together with the exp claim of the token. The cache stores and returns
+    copies of the claims, so that callers cannot modify the claims of other requests.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Args:
+            max_size (int): The maximum number of cached tokens
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        """
+        Get the claims of a verified token.
+
+        Args:
+            token (str): The access token
+
+        Returns:
+            dict | None: A copy of the claims or None if the token is not cached or expired
+        """
+        key = self._get_key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            if payload["exp"] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(payload)
+
+    def add(self, token: str, payload: dict):
+        """
+        Add the claims of a verified token. Tokens without an expiry are not cached.
+
+        Args:
+            token (str): The access token
+            payload (dict): The verified claims of the token
+        """
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        key = self._get_key(token)
+        payload = copy.deepcopy(payload)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached tokens, e.g. after the signing key changed.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        Get the cache metrics.
+
+        Returns:
+            dict[str, int | float]: The number of cached tokens, hits and misses and the
+                hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class WebsocketQuotas:
+    """
+    Limits for websocket clients. Connections are counted across all backend hosts,
+    subscriptions per host.
+    """
+
+    max_connections_per_user: int = 20
+    max_connections_per_deployment: int = 1000
+    max_subscriptions_per_user: int = 500
+    max_subscriptions_per_deployment: int = 10000
+    # messages for clients with more queued outbound messages are dropped
+    max_queued_messages: int = 1000
+    # clients that stay above the queue limit for longer are disconnected
+    max_throttle_time: float = 30
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> WebsocketQuotas:
+        """
+        Create the quotas from the service config.
+
+        Args:
+            config (dict | None): The quota config with the fields of the class
+
+        Returns:
+            WebsocketQuotas: The quotas
+        """
+        return cls(**(config or {}))
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Outbound accounting of a single websocket client.
+    """
+
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    messages_dropped: int = 0
+    bytes_per_second: float = 0
+    queued_messages: int = 0
+    throttled_since: float | None = None
+    _window_start: float = field(default_factory=time.monotonic, repr=False)
+    _window_bytes: int = field(default=0, repr=False)
+
+    def record_sent(self, size: int):
+        """
+        Record a message sent to the client.
+
+        Args:
+            size (int): The size of the message in bytes
+        """
+        self.messages_sent += 1
+        self.bytes_sent += size
+        self._window_bytes += size
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= 1:
+            self.bytes_per_second = self._window_bytes / elapsed
+            self._window_start = now
+            self._window_bytes = 0
+
+    def record_dropped(self):
+        """
+        Record a message that was dropped because the client is throttled.
+        """
+        self.messages_dropped += 1
+
+    def update_queue(self, queued_messages: int, max_queued_messages: int) -> float | None:
+        """
+        Update the number of queued outbound messages of the client.
+
+        Args:
+            queued_messages (int): The number of queued outbound messages
+            max_queued_messages (int): The queue limit above which the client is throttled
+
+        Returns:
+            float | None: The time in seconds the client has been throttled or None if it
+                is not throttled
+        """
+        self.queued_messages = queued_messages
+        if queued_messages <= max_queued_messages:
+            self.throttled_since = None
+            return None
+        now = time.monotonic()
+        if self.throttled_since is None:
+            self.throttled_since = now
+        return now - self.throttled_since
+
+    def to_dict(self) -> dict:
+        """
+        Get the stats as a JSON serializable dict.
+
+        Returns:
+            dict: The stats
+        """
+        stats = asdict(self)
+        del stats["_window_start"]
+        del stats["_window_bytes"]
+        stats["throttled"] = stats.pop("throttled_since") is not None
+        return stats
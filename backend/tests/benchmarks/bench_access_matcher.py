@@ -0,0 +1,43 @@
+"""
+Benchmark of the BEC access profile checks for profiles with many patterns.
+Compares the compiled matcher with re-parsing the patterns on every check,
+as done before the matcher was introduced.
+
+Run with:
+    python tests/benchmarks/bench_access_matcher.py
+"""
+
+import timeit
+
+from bec_atlas.utils.access_matcher import compile_access_patterns
+
+
+def split_based_key_access(key: str, patterns: tuple[str, ...]) -> str | None:
+    for pattern in patterns:
+        components = pattern.split("~")
+        rule = components[0]
+        subpattern = "".join(components[1:]).split("*", maxsplit=1)[0]
+        if subpattern in key:
+            return rule
+    return None
+
+
+def main():
+    number = 10000
+    for num_patterns in (10, 100, 500):
+        keys = tuple(f"%R~user/{ii}/*" for ii in range(num_patterns))
+        channels = tuple(f"user/{ii}/*" for ii in range(num_patterns))
+        # worst case: the key only matches the last pattern
+        key = f"user/{num_patterns - 1}/some/key"
+        compiled = timeit.timeit(
+            lambda: compile_access_patterns(keys, channels).key_access(key), number=number
+        )
+        split_based = timeit.timeit(lambda: split_based_key_access(key, keys), number=number)
+        print(
+            f"{num_patterns:4d} patterns: compiled {compiled / number * 1e6:8.2f} us/check, "
+            f"split-based {split_based / number * 1e6:8.2f} us/check"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of the authentication dependency under concurrent load. A dashboard
+presents the same token on every request; compares verifying the signature on
+every request with the verified-token cache.
+
+Run with:
+    python tests/benchmarks/bench_token_cache.py
+"""
+
+import asyncio
+import time
+from unittest import mock
+
+from fastapi import Request
+
+from bec_atlas import authentication
+from bec_atlas.authentication import create_access_token, get_current_user
+from bec_atlas.utils.token_cache import VerifiedTokenCache
+
+
+async def run_requests(tokens: list[str], num_requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    mock_request = mock.Mock(spec=Request)
+    mock_request.cookies = {}
+
+    async def request(ii: int):
+        async with semaphore:
+            await get_current_user(mock_request, tokens[ii % len(tokens)])
+            # let other requests run, as the event loop would between requests
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(ii) for ii in range(num_requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    num_requests = 20000
+    concurrency = 100
+    for num_users in (1, 10, 100):
+        tokens = [
+            create_access_token({"email": f"user{ii}@bec_atlas.ch"}) for ii in range(num_users)
+        ]
+        results = {}
+        for name, cache in (
+            ("uncached", VerifiedTokenCache(max_size=0)),
+            ("cached", VerifiedTokenCache()),
+        ):
+            with mock.patch.object(authentication, "token_cache", cache):
+                results[name] = asyncio.run(run_requests(tokens, num_requests, concurrency))
+                hit_rate = cache.metrics()["hit_rate"]
+        uncached, cached = (results[name] / num_requests * 1e6 for name in ("uncached", "cached"))
+        print(
+            f"{num_users:4d} users: uncached {uncached:8.2f} us/request, "
+            f"cached {cached:8.2f} us/request (hit rate {hit_rate:.3f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import json
 import os
 from unittest import mock
@@ -11,7 +12,7 @@ from bec_lib.redis_connector import RedisConnector
 from bson import ObjectId
 from fastapi.testclient import TestClient
 
-from bec_atlas.main import AtlasApp
+from bec_atlas.main import AtlasApp, AtlasWebsocketApp
 from bec_atlas.router.redis_router import BECAsyncRedisManager
 
 
@@ -86,8 +87,8 @@ def redis_server():
     yield redis_server
 
 
-@pytest.fixture()
-def backend(redis_server):
+@contextlib.contextmanager
+def _run_app(redis_server, app_cls=AtlasApp):
 
     def _fake_redis(host, port, **kwargs):
         return fakeredis.FakeStrictRedis(server=redis_server)
@@ -96,6 +97,9 @@ def backend(redis_server):
     fake_async_redis = TestRedis(server=redis_server, username="ingestor", password="ingestor")
     fake_async_redis.connection_pool.connection_kwargs["username"] = "ingestor"
     fake_async_redis.connection_pool.connection_kwargs["password"] = "ingestor"
+    fake_redis = fakeredis.FakeStrictRedis(
+        server=redis_server, username="ingestor", password="ingestor"
+    )
 
     config = {
         "redis": {
@@ -105,6 +109,7 @@ def backend(redis_server):
             "password": "ingestor",
             "sync_instance": RedisConnector("localhost:1", redis_cls=_fake_redis),
             "async_instance": fake_async_redis,
+            "client_instance": fake_redis,
         },
         "mongodb": {"host": "localhost", "port": 27027, "mongodb_client": mongo_client},
         "scilog": {"username": "test_user", "password": "test_password"},
@@ -117,7 +122,7 @@ def backend(redis_server):
     with mock.patch("bec_atlas.ingestor.scilog_logbook_manager.requests.post") as mock_post:
         mock_post.return_value.status_code = 200
         mock_post.return_value.json.return_value = {"token": "test_token"}
-        app = AtlasApp(config)
+        app = app_cls(config)
 
     class PatchedBECAsyncRedisManager(BECAsyncRedisManager):
         def _redis_connect(self):
@@ -129,10 +134,23 @@ def backend(redis_server):
         "bec_atlas.router.redis_router.BECAsyncRedisManager", PatchedBECAsyncRedisManager
     ):
         with TestClient(app.app) as _client:
-            app.user_router.use_ssl = False  # disable ssl to allow for httponly cookies
+            if hasattr(app, "user_router"):
+                app.user_router.use_ssl = False  # disable ssl to allow for httponly cookies
             yield _client, app
 
 
+@pytest.fixture()
+def backend(redis_server):
+    with _run_app(redis_server) as (client, app):
+        yield client, app
+
+
+@pytest.fixture()
+def websocket_backend(redis_server):
+    with _run_app(redis_server, AtlasWebsocketApp) as (client, app):
+        yield client, app
+
+
 @pytest.fixture
 def logged_in_client(backend):
     client, _ = backend
@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+
+from bec_atlas.datasources.access_cache import AccessDecisionCache
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+
+
+@pytest.fixture
+def access_cache():
+    return AccessDecisionCache(mock.MagicMock(), max_size=3)
+
+
+def test_access_cache_set_get(access_cache):
+    generation = access_cache.generation("dep")
+    access_cache.set("dep", "user", "decision", generation)
+    assert access_cache.get("dep", "user") == "decision"
+    assert access_cache.get("dep", "other_user") is None
+    assert access_cache.get("other_dep", "user") is None
+
+
+def test_access_cache_invalidate_deployment(access_cache):
+    access_cache.set("dep", "user", "decision", access_cache.generation("dep"))
+    access_cache.set("dep2", "user", "decision", access_cache.generation("dep2"))
+    access_cache.invalidate("dep")
+    assert access_cache.get("dep", "user") is None
+    assert access_cache.get("dep2", "user") == "decision"
+    access_cache.connector.send.assert_not_called()
+
+    access_cache.invalidate()
+    assert access_cache.get("dep2", "user") is None
+
+
+def test_access_cache_drops_outdated_decisions(access_cache):
+    generation = access_cache.generation("dep")
+    access_cache.invalidate("dep")
+    access_cache.set("dep", "user", "decision", generation)
+    assert access_cache.get("dep", "user") is None
+
+    generation = access_cache.generation("dep")
+    access_cache.invalidate()
+    access_cache.set("dep", "user", "decision", generation)
+    assert access_cache.get("dep", "user") is None
+
+
+def test_access_cache_expires(access_cache):
+    access_cache.ttl = -1
+    access_cache.set("dep", "user", "decision", access_cache.generation("dep"))
+    assert access_cache.get("dep", "user") is None
+
+
+def test_access_cache_max_size(access_cache):
+    for ii in range(5):
+        access_cache.set("dep", f"user_{ii}", ii, access_cache.generation("dep"))
+    assert len(access_cache._entries) == 3
+    assert access_cache.get("dep", "user_0") is None
+    assert access_cache.get("dep", "user_4") == 4
+
+
+def test_access_cache_broadcast(access_cache):
+    access_cache.invalidate("dep", broadcast=True)
+    endpoint, msg = access_cache.connector.send.call_args.args
+    assert endpoint == RedisAtlasEndpoints.bec_access_updates()
+    assert msg.value == {"deployment_id": "dep"}
+
+
+def test_access_cache_on_invalidation(access_cache):
+    access_cache.set("dep", "user", "decision", access_cache.generation("dep"))
+    msg = mock.MagicMock()
+    msg.value.value = {"deployment_id": "dep"}
+    AccessDecisionCache._on_invalidation(msg, parent=access_cache)
+    assert access_cache.get("dep", "user") is None
@@ -0,0 +1,78 @@
+import re
+
+import pytest
+
+from bec_atlas.utils.access_matcher import (
+    AccessPatternMatcher,
+    compile_access_patterns,
+    redis_glob_to_regex,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, value, matches",
+    [
+        ("public/*", "public/some/key", True),
+        ("public/*", "other/public/key", False),
+        ("*/key", "public/some/key", True),
+        ("user/?/key", "user/a/key", True),
+        ("user/?/key", "user/ab/key", False),
+        ("user/[ab]/key", "user/b/key", True),
+        ("user/[^ab]/key", "user/b/key", False),
+        ("user/[a-c]/key", "user/c/key", True),
+        ("user/\\*", "user/*", True),
+        ("user/\\*", "user/a", False),
+        ("user.key", "userXkey", False),
+        ("user/[", "user/[", True),
+    ],
+)
+def test_redis_glob_to_regex(pattern, value, matches):
+    assert (re.fullmatch(redis_glob_to_regex(pattern), value) is not None) == matches
+
+
+@pytest.mark.parametrize(
+    "key, access",
+    [
+        ("public/some/key", (True, False)),
+        ("write_only/key", (False, True)),
+        ("personal/test_username/key", (True, True)),
+        ("personal/other_username/key", (False, False)),
+        ("shared/key", (True, True)),
+        ("somewhere/public/key", (False, False)),
+    ],
+)
+def test_access_pattern_matcher_key_access(key, access):
+    matcher = AccessPatternMatcher(
+        [
+            "%R~public/*",
+            "%W~write_only/*",
+            "%RW~personal/test_username/*",
+            "%R~shared/*",
+            "%W~shared/*",
+        ],
+        [],
+    )
+    assert matcher.key_access(key) == access
+
+
+def test_access_pattern_matcher_full_access():
+    matcher = AccessPatternMatcher(["*"], ["allchannels"])
+    assert matcher.key_access("any/key") == (True, True)
+    assert matcher.channel_access("any/channel")
+
+
+def test_access_pattern_matcher_channels():
+    matcher = AccessPatternMatcher([], ["&public/*", "info/*"])
+    assert matcher.channel_access("public/channel")
+    assert matcher.channel_access("info/channel")
+    assert not matcher.channel_access("internal/channel")
+    assert matcher.key_access("public/channel") == (False, False)
+
+
+def test_access_pattern_matcher_many_patterns():
+    keys = [f"%R~user_{ii}/*" for ii in range(500)] + [f"%RW~shared_{ii}/*" for ii in range(500)]
+    matcher = compile_access_patterns(tuple(keys), ())
+    assert matcher.key_access("user_499/some/key") == (True, False)
+    assert matcher.key_access("shared_250/some/key") == (True, True)
+    assert matcher.key_access("user_500/some/key") == (False, False)
+    assert compile_access_patterns(tuple(keys), ()) is matcher
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from bec_atlas.utils.admission import AdmissionRejected, ConnectionAdmission
+
+
+async def test_admission_limits_concurrency():
+    admission = ConnectionAdmission(max_concurrent=2)
+    running = 0
+    max_running = 0
+
+    async def setup():
+        nonlocal running, max_running
+        async with admission.admit():
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(setup() for _ in range(10)))
+    assert max_running == 2
+    assert admission.metrics() == {"active": 0, "queued": 0, "admitted": 10, "rejected": 0}
+
+
+async def test_admission_rejects_if_queue_is_full():
+    admission = ConnectionAdmission(max_concurrent=1, max_queued=1, reconnect_delay=(2, 3))
+    release = asyncio.Event()
+
+    async def setup():
+        async with admission.admit():
+            await release.wait()
+
+    tasks = [asyncio.create_task(setup()) for _ in range(2)]
+    while admission.active < 1 or admission.queued < 1:
+        await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        async with admission.admit():
+            pass
+    assert 2 <= exc_info.value.retry_after <= 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert admission.metrics() == {"active": 0, "queued": 0, "admitted": 2, "rejected": 1}
+
+
+async def test_admission_rejects_after_queue_timeout():
+    admission = ConnectionAdmission(max_concurrent=1, queue_timeout=0.01)
+    async with admission.admit():
+        with pytest.raises(AdmissionRejected):
+            async with admission.admit():
+                pass
+    assert admission.metrics()["rejected"] == 1
+    assert admission.metrics()["queued"] == 0
+
+
+def test_admission_from_config():
+    admission = ConnectionAdmission.from_config({"max_concurrent": 5, "reconnect_delay": [1, 2]})
+    assert admission.max_concurrent == 5
+    assert admission.reconnect_delay == (1, 2)
+    assert ConnectionAdmission.from_config(None).max_concurrent == 20
@@ -0,0 +1,168 @@
+import base64
+import io
+import json
+from unittest import mock
+
+import pytest
+from bec_lib import messages
+
+from bec_atlas.ingestor import attachments
+from bec_atlas.ingestor.attachments import AttachmentPipeline, StreamingJsonBody
+
+
+def _file(data: bytes, filename: str = "plot.png", mime_type: str = "image/png"):
+    return messages.MessagingServiceFileContent(filename=filename, data=data, mime_type=mime_type)
+
+
+def _message(*parts, service_name="signal"):
+    return messages.MessagingServiceMessage(
+        service_name=service_name,
+        message=[messages.MessagingServiceTextContent(content="Plot"), *parts],
+        scope=["scope"],
+    )
+
+
+def _png(width: int, height: int) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color="red").save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_pipeline_skips_attachments_exceeding_the_size_limit():
+    pipeline = AttachmentPipeline(max_size=10)
+    small = _file(b"small", filename="small.txt", mime_type="text/plain")
+    large = _file(b"x" * 11, filename="large.txt", mime_type="text/plain")
+
+    prepared = pipeline.prepare(_message(small, large))
+
+    assert [(part.filename, attachment.data) for part, attachment in prepared] == [
+        ("small.txt", b"small")
+    ]
+    assert pipeline.metrics()["rejected"] == 1
+
+
+def test_pipeline_limits_the_attachment_size_per_message():
+    pipeline = AttachmentPipeline(max_size=10, max_message_size=15)
+    parts = [_file(bytes([i]) * 8, filename=f"{i}.txt", mime_type="text/plain") for i in range(3)]
+
+    prepared = pipeline.prepare(_message(*parts))
+
+    assert [part.filename for part, _ in prepared] == ["0.txt"]
+    assert pipeline.metrics()["rejected"] == 2
+
+
+def test_pipeline_deduplicates_attachments_by_content():
+    pipeline = AttachmentPipeline(max_image_dimension=16)
+    data = _png(64, 32)
+
+    with mock.patch.object(pipeline, "_downscale", wraps=pipeline._downscale) as downscale:
+        [(_, first)] = pipeline.prepare(_message(_file(data)))
+        [(_, second)] = pipeline.prepare(_message(_file(data), service_name="scilog"))
+        [(_, renamed)] = pipeline.prepare(_message(_file(data, filename="copy.png")))
+
+    downscale.assert_called_once()
+    assert second is first
+    assert renamed.filename == "copy.png"
+    assert renamed.data is first.data
+    assert pipeline.metrics()["cache_hits"] == 2
+    assert pipeline.metrics()["processed"] == 1
+
+
+def test_pipeline_evicts_cached_attachments():
+    pipeline = AttachmentPipeline(cache_size=10)
+    for data in (b"a" * 6, b"b" * 6):
+        pipeline.prepare(_message(_file(data, mime_type="text/plain")))
+
+    metrics = pipeline.metrics()
+    assert metrics["cached"] == 1
+    assert metrics["cached_bytes"] == 6
+
+
+def test_pipeline_downscales_large_images():
+    pipeline = AttachmentPipeline(max_image_dimension=20)
+
+    [(_, attachment)] = pipeline.prepare(_message(_file(_png(100, 50))))
+
+    Image = pytest.importorskip("PIL.Image")
+    with Image.open(io.BytesIO(attachment.data)) as image:
+        assert image.size == (20, 10)
+    assert pipeline.metrics()["downscaled"] == 1
+
+
+def test_pipeline_keeps_small_images_and_other_files():
+    pipeline = AttachmentPipeline(max_image_dimension=200)
+    image = _png(100, 50)
+    text = b"not an image"
+
+    prepared = pipeline.prepare(_message(_file(image), _file(text, mime_type="text/plain")))
+
+    assert [attachment.data for _, attachment in prepared] == [image, text]
+    assert pipeline.metrics()["downscaled"] == 0
+
+
+def test_pipeline_warns_if_images_cannot_be_downscaled(caplog):
+    with mock.patch.object(attachments, "Image", None):
+        AttachmentPipeline(max_image_dimension=20)
+        AttachmentPipeline(max_image_dimension=None)
+
+    assert [record.message for record in caplog.records] == [
+        "Pillow is not installed, images are not downscaled and are subject to the size limits as they are."
+    ]
+
+
+def test_pipeline_keeps_images_that_cannot_be_decoded():
+    pipeline = AttachmentPipeline(max_image_dimension=20)
+
+    [(_, attachment)] = pipeline.prepare(_message(_file(b"broken")))
+
+    assert attachment.data == b"broken"
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, attachments.ENCODING_CHUNK_SIZE + 1])
+def test_streaming_json_body_matches_json_encoding(size):
+    pipeline = AttachmentPipeline()
+    data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+    [(_, attachment)] = pipeline.prepare(
+        _message(_file(data, filename='plot "1".bin', mime_type="application/octet-stream"))
+    )
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "send",
+        "params": {"message": "Plot", "groupId": "group", "attachments": [attachment]},
+    }
+
+    body = StreamingJsonBody(payload)
+    chunks = []
+    while chunk := body.read(1000):
+        chunks.append(chunk)
+    raw = b"".join(chunks)
+
+    assert len(raw) == len(body)
+    expected = {
+        **payload,
+        "params": {
+            **payload["params"],
+            "attachments": [
+                'data:application/octet-stream;filename=plot "1".bin;base64,'
+                + base64.b64encode(data).decode()
+            ],
+        },
+    }
+    assert json.loads(raw) == expected
+
+
+def test_streaming_json_body_reads_in_bounded_chunks():
+    pipeline = AttachmentPipeline()
+    [(_, attachment)] = pipeline.prepare(
+        _message(_file(b"x" * 2**20, mime_type="application/octet-stream"))
+    )
+    body = StreamingJsonBody({"params": {"attachments": [attachment]}})
+
+    with mock.patch.object(
+        attachments.base64, "b64encode", wraps=attachments.base64.b64encode
+    ) as b64encode:
+        body.read(100)
+    b64encode.assert_called_once()
+    assert len(body._buffer) <= 4 * attachments.ENCODING_CHUNK_SIZE // 3
+    assert len(b"".join(iter(lambda: body.read(8192), b""))) == len(body) - 100
@@ -49,8 +49,11 @@ def temp_yaml_file(sample_deployment_yaml):
 
 
 @pytest.mark.timeout(60)
+@mock.patch("bec_atlas.utils.bec_atlas_update.load_env", side_effect=FileNotFoundError)
 @mock.patch("bec_atlas.utils.bec_atlas_update.DeploymentIngestor")
-def test_update_deployments_success(mock_deployment_ingestor, cli_runner, temp_yaml_file):
+def test_update_deployments_success(
+    mock_deployment_ingestor, mock_load_env, cli_runner, temp_yaml_file
+):
     """Test successful deployment update command."""
     # Mock the ingestor
     mock_ingestor_instance = mock.Mock()
@@ -73,6 +76,24 @@ def test_update_deployments_success(mock_deployment_ingestor, cli_runner, temp_y
     assert call_args["test_realm"]["xname"] == "x99za"
 
 
+@pytest.mark.timeout(60)
+@mock.patch("bec_atlas.utils.bec_atlas_update.load_env")
+@mock.patch("bec_atlas.utils.bec_atlas_update.DeploymentIngestor")
+def test_update_deployments_passes_redis_config(
+    mock_deployment_ingestor, mock_load_env, cli_runner, temp_yaml_file
+):
+    """Test that the redis config of the environment is passed to the ingestor."""
+    redis_config = {"host": "localhost", "port": 6380, "username": "user", "password": "pw"}
+    mock_load_env.return_value = {"redis": redis_config}
+
+    result = cli_runner.invoke(app, ["deployments", temp_yaml_file])
+
+    assert result.exit_code == 0
+    mock_deployment_ingestor.assert_called_once_with(
+        {"host": "localhost", "port": 27017, "redis": redis_config}
+    )
+
+
 @pytest.mark.timeout(60)
 def test_update_deployments_file_not_found(cli_runner):
     """Test deployment update command with non-existent file."""
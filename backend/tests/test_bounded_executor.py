@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+
+from bec_atlas.utils.admission import AdmissionRejected
+from bec_atlas.utils.bounded_executor import BoundedExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(max_workers=2, max_queued=1, queue_timeout=1)
+    yield executor
+    executor.shutdown()
+
+
+async def test_bounded_executor_runs_calls_on_worker_threads(executor):
+    thread = await executor.run(threading.current_thread)
+    assert thread is not threading.current_thread()
+    assert thread.name.startswith("bounded_executor")
+    assert await executor.run(pow, 2, exp=3) == 8
+    assert executor.metrics() == {"active": 0, "queued": 0, "admitted": 2, "rejected": 0}
+
+
+async def test_bounded_executor_rejects_calls_if_queue_is_full(executor):
+    release = threading.Event()
+    calls = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+    while executor.metrics()["queued"] < 1:
+        await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejected):
+        await executor.run(release.wait)
+    assert executor.metrics()["active"] == 2
+
+    release.set()
+    assert await asyncio.gather(*calls) == [True, True, True]
+    assert executor.metrics() == {"active": 0, "queued": 0, "admitted": 3, "rejected": 1}
+
+
+def test_bounded_executor_from_config():
+    executor = BoundedExecutor.from_config({"max_queued": 5}, max_workers=3, max_queued=10)
+    assert executor.admission.max_concurrent == 3
+    assert executor.admission.max_queued == 5
+    executor.shutdown()
@@ -0,0 +1,134 @@
+import time
+from unittest import mock
+
+import pytest
+
+from bec_atlas.authentication import decode_token, get_current_user_sync
+from bec_atlas.datasources.group_version import UserGroupVersion
+from bec_atlas.model.model import User
+from bec_atlas.router.user_router import UserLoginRequest
+
+
+@pytest.fixture
+def claims_backend(backend):
+    client, app = backend
+    app.user_router.claims_token_lifetime = 15
+    return client, app
+
+
+def _login(client) -> str:
+    response = client.post(
+        "/api/v1/user/login", json={"username": "admin@bec_atlas.ch", "password": "admin"}
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+async def test_group_version_is_shared_and_bumped(backend):
+    _, app = backend
+    group_version = app.datasources.group_version
+    assert await group_version.get() == 0
+    assert await group_version.bump() == 1
+    assert await group_version.get() == 1
+
+    # bumps of other workers are picked up once the cached version expired
+    other_worker = UserGroupVersion(group_version.client, group_version.async_connector)
+    assert other_worker.bump_sync() == 2
+    assert await group_version.get() == 1
+    with mock.patch(
+        "bec_atlas.datasources.group_version.time.monotonic", return_value=time.monotonic() + 2
+    ):
+        assert await group_version.get() == 2
+
+
+async def test_group_version_does_not_use_the_sync_client(backend):
+    _, app = backend
+    group_version = app.datasources.group_version
+    with mock.patch.object(group_version, "client") as client:
+        await group_version.bump()
+        group_version._expires = 0
+        assert await group_version.get() == 1
+    client.assert_not_called()
+    assert not client.mock_calls
+
+
+async def test_login_issues_claims_tokens(claims_backend):
+    client, app = claims_backend
+    payload = decode_token(_login(client))
+    assert payload["email"] == "admin@bec_atlas.ch"
+    assert payload["gv"] == await app.datasources.group_version.get()
+    assert "admin" in payload["groups"]
+    assert "uid" in payload
+
+
+def test_login_issues_plain_tokens_by_default(backend):
+    client, _ = backend
+    payload = decode_token(_login(client))
+    assert "gv" not in payload
+    assert get_current_user_sync(_login(client)).claims is None
+
+
+async def test_claims_tokens_skip_user_lookup(claims_backend):
+    client, app = claims_backend
+    user_info = get_current_user_sync(_login(client))
+    db_user = app.datasources.mongodb.get_user_by_email("admin@bec_atlas.ch")
+    router = app.deployment_router
+
+    with mock.patch.object(router, "get_user_from_db") as get_user_from_db:
+        user = await router.get_user(user_info)
+    get_user_from_db.assert_not_called()
+    assert isinstance(user, User)
+    assert user.email == db_user.email
+    assert user.groups == db_user.groups
+    assert user.username == db_user.username
+    assert str(user.id) == str(db_user.id)
+    # the user is usable for the access filters of the database
+    assert app.datasources.mongodb.add_user_filter(user, None) == (
+        app.datasources.mongodb.add_user_filter(db_user, None)
+    )
+
+
+async def test_claims_tokens_are_invalidated_by_version_bump(claims_backend):
+    client, app = claims_backend
+    user_info = get_current_user_sync(_login(client))
+    app.datasources.group_version.bump_sync()
+    router = app.deployment_router
+
+    with mock.patch.object(router, "get_user_from_db", return_value=None) as get_user_from_db:
+        assert await router.get_user(user_info) is None
+    get_user_from_db.assert_called_once_with(user_info.token, user_info.email)
+
+
+def test_claims_token_lifetime_is_bounded(claims_backend):
+    client, _ = claims_backend
+    response = client.post(
+        "/api/v1/user/login",
+        params={"expires_delta": 600},
+        json={"username": "admin@bec_atlas.ch", "password": "admin"},
+    )
+    payload = decode_token(response.json()["access_token"])
+    assert payload["exp"] <= time.time() + 15 * 60 + 1
+
+
+async def test_ad_group_change_bumps_group_version(backend):
+    _, app = backend
+    router = app.user_router
+    ldap_user = {
+        "username": "doe_j",
+        "email": "john.doe@psi.ch",
+        "first_name": "John",
+        "last_name": "Doe",
+        "roles": ["group1"],
+    }
+    login = UserLoginRequest(username="doe_j", password="password")
+    with mock.patch.object(router.ldap, "authenticate_and_get_info", return_value=ldap_user):
+        router._get_ad_account(login)
+        router._get_ad_account(login)
+        assert await app.datasources.group_version.get() == 0
+
+        ldap_user["roles"] = ["group1", "group2"]
+        user = router._get_ad_account(login)
+    group_version = app.datasources.group_version
+    group_version._expires = 0
+    assert await group_version.get() == 1
+    assert user.id is not None
@@ -4,6 +4,7 @@ import mongomock
 import pymongo
 import pytest
 
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
 from bec_atlas.ingestor.deployment_ingestor import DeploymentIngestor
 
 
@@ -306,6 +307,41 @@ def test_load_deployment_access_document_groups_update(deployment_ingestor, samp
     assert access["owner_groups"] == ["admin", "updated_group"]
 
 
+@pytest.mark.timeout(60)
+def test_load_publishes_access_invalidations(deployment_ingestor, sample_deployment_data):
+    """Test that the API workers are notified about deployments whose access was written."""
+    deployment_ingestor.config["redis"] = {"host": "localhost", "port": 6380}
+    with mock.patch("bec_atlas.ingestor.deployment_ingestor.RedisConnector") as connector_cls:
+        deployment_ingestor.load(sample_deployment_data)
+        connector = connector_cls.return_value
+        assert connector.send.call_count == 3
+        connector.shutdown.assert_called_once()
+
+        # unchanged access is not published again
+        connector_cls.reset_mock()
+        deployment_ingestor.load(sample_deployment_data)
+        connector_cls.assert_not_called()
+
+        sample_deployment_data["test_realm"]["deployments"]["test-host-001.psi.ch"][
+            "deployment_access"
+        ] = ["updated_group"]
+        deployment_ingestor.load(sample_deployment_data)
+
+    deployment = deployment_ingestor.db["deployments"].find_one({"name": "test-host-001.psi.ch"})
+    connector.send.assert_called_once()
+    endpoint, msg = connector.send.call_args.args
+    assert endpoint == RedisAtlasEndpoints.bec_access_updates()
+    assert msg.value == {"deployment_id": str(deployment["_id"])}
+
+
+@pytest.mark.timeout(60)
+def test_load_without_redis_config_does_not_publish(deployment_ingestor, sample_deployment_data):
+    """Test that loading works without a redis config."""
+    with mock.patch("bec_atlas.ingestor.deployment_ingestor.RedisConnector") as connector_cls:
+        deployment_ingestor.load(sample_deployment_data)
+    connector_cls.assert_not_called()
+
+
 @pytest.mark.timeout(60)
 def test_load_minimal_data(deployment_ingestor):
     """Test loading minimal deployment data with default values."""
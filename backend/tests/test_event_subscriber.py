@@ -382,3 +382,147 @@ class TestEventSubscriberIntegration:
 
                 # Both events should have been attempted despite first callback failing
                 assert call_count >= 1
+
+
+def _event(source: str, index: int) -> str:
+    return json.dumps({"envelope": {"sourceNumber": source}, "index": index})
+
+
+def _wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Condition not met in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def worker_subscriber():
+    """Create an EventSubscriber with running workers but without an SSE connection."""
+    handled = []
+    subscriber = EventSubscriber(
+        host="http://test-host.com", on_event=handled.append, num_workers=2
+    )
+    for worker in subscriber._workers:
+        worker.start()
+    yield subscriber, handled
+    subscriber.stop()
+
+
+class TestEventSubscriberWorkers:
+    """Tests for the concurrent event handling."""
+
+    def test_events_of_a_source_are_handled_in_order(self, worker_subscriber):
+        subscriber, handled = worker_subscriber
+        for index in range(50):
+            subscriber._dispatch(_event(f"+{index % 3}", index))
+
+        _wait_for(lambda: len(handled) == 50)
+        for source in ("+0", "+1", "+2"):
+            indices = [e["index"] for e in handled if e["envelope"]["sourceNumber"] == source]
+            assert indices == sorted(indices)
+        metrics = subscriber.metrics()
+        assert metrics["received"] == 50
+        assert metrics["processed"] == 50
+        assert metrics["queued"] == 0
+
+    def test_events_of_a_group_are_handled_in_order(self, worker_subscriber):
+        subscriber, handled = worker_subscriber
+        for index in range(50):
+            event = json.loads(_event(f"+{index % 3}", index))
+            event["envelope"]["dataMessage"] = {"groupInfo": {"groupId": "group-1"}}
+            subscriber._dispatch(json.dumps(event))
+
+        _wait_for(lambda: len(handled) == 50)
+        assert [e["index"] for e in handled] == list(range(50))
+
+    def test_slow_source_does_not_block_other_sources(self, worker_subscriber):
+        subscriber, handled = worker_subscriber
+        release = threading.Event()
+
+        def on_event(event):
+            if event["envelope"]["sourceNumber"] == "+slow":
+                release.wait(timeout=2)
+            handled.append(event)
+
+        subscriber.on_event = on_event
+        for index in range(10):
+            subscriber._dispatch(_event("+slow", index))
+        subscriber._dispatch(_event("+fast", 0))
+
+        # the slow source occupies one worker, the other worker handles the fast source
+        _wait_for(lambda: [e["envelope"]["sourceNumber"] for e in handled] == ["+fast"])
+        assert subscriber.metrics()["queued"] == 9
+        release.set()
+        _wait_for(lambda: len(handled) == 11)
+
+    def test_events_are_dropped_if_the_queue_is_full(self):
+        subscriber = EventSubscriber(
+            host="http://test-host.com", on_event=mock.Mock(), max_queued=2
+        )
+        for index in range(3):
+            subscriber._dispatch(_event("+1", index))
+
+        metrics = subscriber.metrics()
+        assert metrics["queued"] == 2
+        assert metrics["dropped"] == 1
+
+    def test_handler_exceptions_are_counted(self, worker_subscriber):
+        subscriber, _ = worker_subscriber
+        subscriber.on_event = mock.Mock(side_effect=[ValueError("failed"), None])
+        subscriber._dispatch(_event("+1", 0))
+        subscriber._dispatch(_event("+1", 1))
+
+        _wait_for(lambda: subscriber.metrics()["processed"] == 2)
+        assert subscriber.metrics()["failed"] == 1
+
+    def test_invalid_events_are_skipped(self, worker_subscriber):
+        subscriber, handled = worker_subscriber
+        subscriber._dispatch("invalid json{{")
+        subscriber._dispatch(json.dumps({"no": "envelope"}))
+
+        _wait_for(lambda: len(handled) == 1)
+        assert handled == [{"no": "envelope"}]
+        assert subscriber.metrics()["received"] == 1
+
+
+class TestEventSubscriberReconnect:
+    """Tests for the reconnect backoff."""
+
+    def test_reconnect_delay_grows_exponentially_with_jitter(self):
+        subscriber = EventSubscriber(
+            host="http://test-host.com", on_event=mock.Mock(), reconnect_delay=(1, 8)
+        )
+        for attempt, delay in enumerate([1, 2, 4, 8, 8]):
+            for _ in range(20):
+                assert delay / 2 <= subscriber._get_reconnect_delay(attempt) <= delay
+        assert subscriber._get_reconnect_delay(1000) <= 8
+
+    def test_backoff_resets_after_events_were_received(self, mock_sse_response):
+        subscriber = EventSubscriber(
+            host="http://test-host.com", on_event=mock.Mock(), reconnect_delay=(1, 30)
+        )
+        responses = [
+            requests.exceptions.ConnectionError("failed"),
+            requests.exceptions.ConnectionError("failed"),
+            mock_sse_response(iter([f"data:{_event('+1', 0)}"])),
+            requests.exceptions.ConnectionError("failed"),
+        ]
+        attempts = []
+
+        def sleep(delay):
+            if len(attempts) == len(responses):
+                subscriber.stop()
+
+        with (
+            mock.patch("bec_atlas.ingestor.signal_manager.requests.get", side_effect=responses),
+            mock.patch("bec_atlas.ingestor.signal_manager.time.sleep", side_effect=sleep),
+            mock.patch.object(
+                subscriber,
+                "_get_reconnect_delay",
+                side_effect=lambda attempt: attempts.append(attempt) or 0,
+            ),
+        ):
+            subscriber._run()
+
+        assert attempts == [0, 1, 0, 1]
+        assert subscriber.metrics()["reconnects"] == 4
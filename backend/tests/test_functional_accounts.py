@@ -0,0 +1,103 @@
+from unittest import mock
+
+import mongomock
+import pytest
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from bec_atlas.authentication import verify_password
+from bec_atlas.datasources.mongodb.mongodb import MongoDBDatasource
+
+ACCOUNTS = [
+    {
+        "email": "func@bec_atlas.ch",
+        "password": "secret",
+        "groups": ["demo"],
+        "first_name": "Func",
+        "last_name": "Account",
+        "owner_groups": ["admin"],
+    },
+    {
+        "email": "other@bec_atlas.ch",
+        "password": "other_secret",
+        "groups": ["demo"],
+        "first_name": "Other",
+        "last_name": "Account",
+        "owner_groups": ["admin"],
+    },
+]
+
+
+@pytest.fixture
+def datasource():
+    datasource = MongoDBDatasource({"mongodb_client": mongomock.MongoClient()})
+    datasource.connect(include_setup=False)
+    return datasource
+
+
+def _load(datasource, accounts):
+    with mock.patch(
+        "bec_atlas.datasources.mongodb.mongodb.json.load",
+        side_effect=lambda _: [
+            dict(account, groups=list(account["groups"])) for account in accounts
+        ],
+    ):
+        datasource.load_functional_accounts()
+
+
+def _get_hash(datasource, email) -> str:
+    user = datasource.db["users"].find_one({"email": email})
+    return datasource.db["user_credentials"].find_one({"user_id": user["_id"]})["password"]
+
+
+def test_functional_accounts_are_created(datasource):
+    _load(datasource, ACCOUNTS)
+    assert datasource.functional_accounts_changed
+    user = datasource.get_user_by_email("func@bec_atlas.ch")
+    assert user.groups == ["demo", "atlas_func_account"]
+    assert verify_password("secret", _get_hash(datasource, "func@bec_atlas.ch"))
+    assert datasource.db["user_credentials"].count_documents({}) == 2
+
+
+def test_functional_account_sync_is_idempotent(datasource):
+    _load(datasource, ACCOUNTS)
+    with mock.patch("bec_atlas.datasources.mongodb.mongodb.get_password_hash") as get_password_hash:
+        with mock.patch.object(datasource.db["users"], "bulk_write") as users_write:
+            with mock.patch.object(
+                datasource.db["user_credentials"], "bulk_write"
+            ) as credentials_write:
+                _load(datasource, ACCOUNTS)
+    get_password_hash.assert_not_called()
+    users_write.assert_not_called()
+    credentials_write.assert_not_called()
+    assert not datasource.functional_accounts_changed
+
+
+def test_functional_account_changes_are_synced(datasource):
+    _load(datasource, ACCOUNTS)
+    changed = [dict(ACCOUNTS[0], password="new_secret", groups=["demo", "operators"])]
+    _load(datasource, changed)
+
+    assert datasource.functional_accounts_changed
+    assert verify_password("new_secret", _get_hash(datasource, "func@bec_atlas.ch"))
+    user = datasource.get_user_by_email("func@bec_atlas.ch")
+    assert set(user.groups) == {"demo", "operators", "atlas_func_account"}
+    # accounts that were removed from the file are removed from the database
+    assert datasource.get_user_by_email("other@bec_atlas.ch") is None
+    assert datasource.db["user_credentials"].count_documents({}) == 1
+
+
+def test_functional_account_hashes_are_upgraded(datasource):
+    _load(datasource, ACCOUNTS)
+    user = datasource.db["users"].find_one({"email": "func@bec_atlas.ch"})
+    weak_hash = PasswordHash((Argon2Hasher(time_cost=1),)).hash("secret")
+    datasource.db["user_credentials"].update_one(
+        {"user_id": user["_id"]}, {"$set": {"password": weak_hash}}
+    )
+
+    _load(datasource, ACCOUNTS)
+    upgraded_hash = _get_hash(datasource, "func@bec_atlas.ch")
+    assert upgraded_hash != weak_hash
+    assert verify_password("secret", upgraded_hash)
+    # an upgraded hash of the same password does not invalidate issued tokens
+    assert not datasource.functional_accounts_changed
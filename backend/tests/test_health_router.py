@@ -48,3 +48,22 @@ def test_health_endpoint_structure(backend_client):
         assert "message" in service_data
         assert service_data["status"] in ["healthy", "unhealthy"]
         assert isinstance(service_data["message"], str)
+
+
+@pytest.mark.timeout(20)
+def test_health_endpoint_reports_websocket_admission_metrics(backend_client):
+    response = backend_client.get("/api/v1/health")
+    metrics = response.json()["metrics"]
+    assert metrics["websocket_admission"] == {
+        "active": 0,
+        "queued": 0,
+        "admitted": 0,
+        "rejected": 0,
+    }
+
+
+@pytest.mark.timeout(20)
+def test_health_endpoint_reports_token_cache_metrics(backend_client):
+    response = backend_client.get("/api/v1/health")
+    metrics = response.json()["metrics"]["token_cache"]
+    assert set(metrics) == {"size", "hits", "misses", "hit_rate"}
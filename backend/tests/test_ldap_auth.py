@@ -0,0 +1,117 @@
+from unittest import mock
+
+import pytest
+from ldap3 import SAFE_RESTARTABLE
+
+from bec_atlas.utils.ldap_auth import DirectoryCache, LDAPUserService
+
+SEARCH_RESPONSE = [
+    {
+        "type": "searchResEntry",
+        "attributes": {
+            "cn": "doe_j",
+            "mail": "john.doe@psi.ch",
+            "givenName": "John",
+            "sn": "Doe",
+            "memberOf": [
+                "CN=unx-group1,OU=groups,DC=psi,DC=ch",
+                "CN=group2,OU=groups,DC=psi,DC=ch",
+            ],
+        },
+    }
+]
+
+USER_DATA = {
+    "username": "doe_j",
+    "email": "john.doe@psi.ch",
+    "first_name": "John",
+    "last_name": "Doe",
+    "roles": ["unx-group1", "group2"],
+}
+
+
+@pytest.fixture
+def connections():
+    """
+    Patch the LDAP connections. Bind connections succeed for the password "password";
+    the service connection returns the search response like thread-safe strategies do.
+    """
+    created = []
+
+    def create_connection(server, user=None, password=None, **kwargs):
+        conn = mock.MagicMock()
+        conn.kwargs = {"user": user, "password": password, **kwargs}
+        conn.bind.return_value = password == "password"
+        conn.__enter__.return_value = conn
+        conn.response = SEARCH_RESPONSE
+        if kwargs.get("client_strategy") == SAFE_RESTARTABLE:
+            conn.search.return_value = (True, {}, SEARCH_RESPONSE, {})
+        created.append(conn)
+        return conn
+
+    with mock.patch("bec_atlas.utils.ldap_auth.Connection", side_effect=create_connection):
+        yield created
+
+
+def _get_service(**kwargs) -> LDAPUserService:
+    return LDAPUserService(
+        ldap_server="ldaps://ldap.example.com", base_dn="OU=users,DC=psi,DC=ch", **kwargs
+    )
+
+
+def test_ldap_service_account_searches_once_per_principal(connections):
+    service = _get_service(service_user="CN=atlas", service_password="service")
+
+    assert service.authenticate_and_get_info("doe_j", "password") == USER_DATA
+    assert service.authenticate_and_get_info("doe_j", "password") == USER_DATA
+
+    bind_conns = [conn for conn in connections if "client_strategy" not in conn.kwargs]
+    service_conns = [conn for conn in connections if "client_strategy" in conn.kwargs]
+    # every login verifies the credentials with a bind of the user
+    assert len(bind_conns) == 2
+    assert all(conn.kwargs["user"] == "CN=doe_j,OU=users,DC=psi,DC=ch" for conn in bind_conns)
+    assert all(conn.search.call_count == 0 for conn in bind_conns)
+    # the directory is read once through the shared service connection
+    assert len(service_conns) == 1
+    service_conns[0].search.assert_called_once()
+
+
+def test_ldap_invalid_credentials_are_rejected_with_warm_cache(connections):
+    service = _get_service(service_user="CN=atlas", service_password="service")
+    assert service.authenticate_and_get_info("doe_j", "password") == USER_DATA
+    assert service.authenticate_and_get_info("doe_j", "wrong") is None
+
+
+def test_ldap_without_service_account_binds_once_with_warm_cache(connections):
+    service = _get_service()
+
+    assert service.authenticate_and_get_info("john.doe@psi.ch", "password") == USER_DATA
+    assert len(connections) == 1
+    connections[0].search.assert_called_once()
+    assert "(userPrincipalName=john.doe@psi.ch)" in connections[0].search.call_args.args
+
+    assert service.authenticate_and_get_info("John.Doe@psi.ch", "password") == USER_DATA
+    assert len(connections) == 2
+    connections[1].bind.assert_called_once()
+    connections[1].search.assert_not_called()
+
+
+def test_ldap_failed_login_is_not_cached(connections):
+    service = _get_service()
+    connections_before = len(connections)
+    with mock.patch.object(service, "_search_user", side_effect=ValueError("not found")):
+        assert service.authenticate_and_get_info("doe_j", "password") is None
+    assert service.directory_cache.get("doe_j") is None
+    assert len(connections) == connections_before + 1
+
+
+def test_directory_cache_expires_entries():
+    cache = DirectoryCache(ttl=0)
+    cache.add("doe_j", USER_DATA)
+    assert cache.get("doe_j") is None
+
+    cache = DirectoryCache(ttl=60, max_size=1)
+    cache.add("doe_j", USER_DATA)
+    assert cache.get("DOE_J") == USER_DATA
+    cache.add("other", USER_DATA)
+    assert cache.get("doe_j") is None
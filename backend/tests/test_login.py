@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 
@@ -30,3 +32,36 @@ def test_login_unknown_user(backend_client):
     )
     assert response.status_code == 401
     assert response.json() == {"detail": "User not found or password is incorrect"}
+
+
+@pytest.mark.timeout(20)
+def test_login_is_verified_off_the_event_loop(backend):
+    """
+    Test that the credentials are verified on the login pool.
+    """
+    client, app = backend
+    response = client.post(
+        "/api/v1/user/login", json={"username": "admin@bec_atlas.ch", "password": "admin"}
+    )
+    assert response.status_code == 200
+    assert app.user_router.login_pool.metrics()["admitted"] == 1
+    metrics = client.get("/api/v1/health").json()["metrics"]
+    assert metrics["login_pool"]["admitted"] == 1
+
+
+@pytest.mark.timeout(20)
+def test_login_rejected_if_login_pool_is_saturated(backend):
+    """
+    Test that the login returns a 503 with a retry delay when the login pool is saturated.
+    """
+    client, app = backend
+    admission = app.user_router.login_pool.admission
+    admission.max_queued = 0
+    admission.reconnect_delay = (2, 2)
+    with mock.patch.object(admission._semaphore, "locked", return_value=True):
+        response = client.post(
+            "/api/v1/user/login", json={"username": "admin@bec_atlas.ch", "password": "admin"}
+        )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+    assert admission.metrics()["rejected"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+from bec_atlas.utils.loop_bridge import ThreadToLoopBridge
+
+
+async def _wait_for(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError
+
+
+async def test_loop_bridge_batches_items_from_threads():
+    received = []
+
+    async def handler(batch):
+        received.append(batch)
+
+    bridge = ThreadToLoopBridge(asyncio.get_running_loop(), handler, max_batch_size=150)
+    threads = [
+        threading.Thread(target=lambda: [bridge.put(ii) for ii in range(100)]) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    await _wait_for(lambda: sum(len(batch) for batch in received) == 400)
+    assert [len(batch) for batch in received] == [150, 150, 100]
+    assert bridge.batches == 3
+    assert bridge.queue_size == 0
+    assert bridge.dropped == 0
+
+
+async def test_loop_bridge_wakes_loop_once_per_batch():
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    bridge = ThreadToLoopBridge(asyncio.get_running_loop(), handler)
+    wakeups = 0
+    original = bridge.loop.call_soon_threadsafe
+
+    def call_soon_threadsafe(*args):
+        nonlocal wakeups
+        wakeups += 1
+        return original(*args)
+
+    bridge.loop.call_soon_threadsafe = call_soon_threadsafe
+    try:
+        thread = threading.Thread(target=lambda: [bridge.put(ii) for ii in range(1000)])
+        thread.start()
+        thread.join()
+        await _wait_for(lambda: len(received) == 1000)
+    finally:
+        del bridge.loop.call_soon_threadsafe
+    assert received == list(range(1000))
+    assert wakeups == 1
+
+
+async def test_loop_bridge_drops_oldest_items_when_full():
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    bridge = ThreadToLoopBridge(asyncio.get_running_loop(), handler, max_size=10, max_batch_size=3)
+    for ii in range(25):
+        bridge.put(ii)
+    assert bridge.queue_size == 10
+    assert bridge.dropped == 15
+    await _wait_for(lambda: len(received) == 10)
+    assert received == list(range(15, 25))
+    assert bridge.batches == 4
+
+
+async def test_loop_bridge_continues_after_handler_error():
+    received = []
+
+    async def handler(batch):
+        if batch == [0]:
+            raise ValueError("handler failed")
+        received.extend(batch)
+
+    bridge = ThreadToLoopBridge(asyncio.get_running_loop(), handler, max_batch_size=1)
+    bridge.put(0)
+    bridge.put(1)
+    await _wait_for(lambda: received == [1])
@@ -0,0 +1,39 @@
+import pytest
+from starlette.routing import Mount
+
+from bec_atlas.main import AtlasApp
+
+
+@pytest.mark.timeout(20)
+def test_websocket_app_serves_health_endpoint(websocket_backend):
+    client, app = websocket_backend
+    response = client.get("/api/v1/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert app.redis_websocket is not None
+
+
+@pytest.mark.timeout(20)
+def test_websocket_app_does_not_serve_rest_routes(websocket_backend):
+    client, app = websocket_backend
+    assert not hasattr(app, "user_router")
+    response = client.post(
+        "/api/v1/user/login", json={"username": "admin@bec_atlas.ch", "password": "admin"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.timeout(20)
+def test_websocket_app_mounts_socketio(websocket_backend):
+    client, _ = websocket_backend
+    response = client.get("/api/v1/ws/", params={"EIO": "4", "transport": "polling"})
+    # only the websocket transport is allowed
+    assert response.status_code == 400
+
+
+def test_atlas_app_without_websocket(backend):
+    _, app = backend
+    app_without_websocket = AtlasApp(app.config, websocket=False)
+    app_without_websocket.add_routers()
+    assert app_without_websocket.redis_websocket is None
+    assert not any(isinstance(route, Mount) for route in app_without_websocket.app.routes)
@@ -38,7 +38,9 @@ def ingestor(backend):
         "bec_atlas.ingestor.message_service_ingestor.SignalManager"
     ) as MockSignalManager:
         ingestor = MessageServiceIngestor(config=app.config)
-        MockSignalManager.assert_called_once_with(ingestor, app.config.get("signal", {}))
+        MockSignalManager.assert_called_once_with(
+            ingestor, app.config.get("signal", {}), attachment_pipeline=ingestor.attachment_pipeline
+        )
         yield ingestor
         ingestor.shutdown()
 
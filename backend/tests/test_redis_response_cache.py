@@ -0,0 +1,92 @@
+import asyncio
+from unittest import mock
+
+import fakeredis
+import pytest
+
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
+from bec_atlas.datasources.redis_response_cache import RedisResponseCache
+
+
+@pytest.fixture
+def response_cache():
+    redis = fakeredis.FakeAsyncRedis()
+    return RedisResponseCache(redis, patterns={"public/*": 1, "info/*": 5})
+
+
+@pytest.mark.parametrize(
+    "key, ttl", [("public/some/key", 1), ("info/some/key", 5), ("private/some/key", None)]
+)
+def test_response_cache_get_ttl(response_cache, key, ttl):
+    assert response_cache.get_ttl(key) == ttl
+
+
+def test_response_cache_is_opt_in():
+    cache = RedisResponseCache(mock.MagicMock())
+    assert cache.get_ttl("public/some/key") is None
+
+
+async def test_response_cache_coalesces_concurrent_reads(response_cache):
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "response"
+
+    out = await asyncio.gather(
+        *[response_cache.get_or_fetch("dep", "public/key", 1, fetch) for _ in range(10)]
+    )
+    assert out == ["response"] * 10
+    assert calls == 1
+
+    # subsequent reads are served from the cache
+    assert await response_cache.get_or_fetch("dep", "public/key", 1, fetch) == "response"
+    assert calls == 1
+    assert not response_cache._in_flight
+
+
+async def test_response_cache_does_not_cache_none(response_cache):
+    fetch = mock.AsyncMock(return_value=None)
+    assert await response_cache.get_or_fetch("dep", "public/key", 1, fetch) is None
+    assert await response_cache.get_or_fetch("dep", "public/key", 1, fetch) is None
+    assert fetch.await_count == 2
+
+
+async def test_response_cache_waits_for_other_worker(response_cache):
+    lock_key = RedisAtlasEndpoints.redis_response_cache_lock("dep", "public/key")
+    cache_key = RedisAtlasEndpoints.redis_response_cache("dep", "public/key")
+    await response_cache.redis.set(lock_key, "1")
+
+    async def other_worker():
+        await asyncio.sleep(0.05)
+        await response_cache.redis.set(cache_key, "from other worker")
+        await response_cache.redis.delete(lock_key)
+
+    fetch = mock.AsyncMock(return_value="response")
+    out, _ = await asyncio.gather(
+        response_cache.get_or_fetch("dep", "public/key", 1, fetch), other_worker()
+    )
+    assert out == "from other worker"
+    fetch.assert_not_awaited()
+
+
+async def test_response_cache_does_not_release_lock_of_other_worker(response_cache):
+    lock_key = RedisAtlasEndpoints.redis_response_cache_lock("dep", "public/key")
+
+    async def fetch():
+        # the lock expired during the fetch and was acquired by another worker
+        await response_cache.redis.set(lock_key, "other worker")
+        return "response"
+
+    assert await response_cache.get_or_fetch("dep", "public/key", 1, fetch) == "response"
+    assert await response_cache.redis.get(lock_key) == b"other worker"
+
+
+async def test_response_cache_releases_own_lock(response_cache):
+    lock_key = RedisAtlasEndpoints.redis_response_cache_lock("dep", "public/key")
+    fetch = mock.AsyncMock(return_value="response")
+
+    assert await response_cache.get_or_fetch("dep", "public/key", 1, fetch) == "response"
+    assert not await response_cache.redis.exists(lock_key)
@@ -1,12 +1,17 @@
+import asyncio
+import functools
+import json
 from unittest import mock
 
 import pytest
 from bec_lib import messages
 from bec_lib.serialization import MsgpackSerialization
 from bson import ObjectId
+from fastapi import HTTPException
 
+from bec_atlas.datasources.endpoints import RedisAtlasEndpoints
 from bec_atlas.model.model import BECAccessProfile, DeploymentAccess, User
-from bec_atlas.router.redis_router import RemoteAccess
+from bec_atlas.router.redis_router import RedisWriteOperation, RemoteAccess
 
 
 @pytest.fixture
@@ -344,6 +349,8 @@ async def test_redis_get(logged_in_client, deployment, backend):
         }
 
         pubsub_mock().subscribe = mock.AsyncMock()
+        pubsub_mock().unsubscribe = mock.AsyncMock()
+        pubsub_mock().aclose = mock.AsyncMock()
         ret_msg = pubsub_mock().get_message = mock.AsyncMock()
         ret_msg.side_effect = [None, response]
         response = client.get(
@@ -352,3 +359,258 @@ async def test_redis_get(logged_in_client, deployment, backend):
         assert response.status_code == 200
         test_response = {"data": {"data": {"test_key": "test"}}, "metadata": {"message": "test"}}
         assert response.json() == test_response
+
+
+async def test_redis_batch_get(backend):
+    _, app = backend
+    deployment = "68beba57a1ba24b03cb3b8b3"
+    bec_access = BECAccessProfile(
+        deployment_id=ObjectId(deployment),
+        username="reader",
+        owner_groups=["readers"],
+        keys=["%R~*"],
+        channels=["*"],
+        commands=["*"],
+    )
+    redis = app.redis_router.redis
+    remote_data = {
+        "test_key": messages.RawMessage(data={"test_key": "test"}, metadata={"message": "test"})
+    }
+    requests = []
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(RedisAtlasEndpoints.redis_request(deployment))
+
+    async def _respond():
+        # answer the single get requests in reverse order, as the BEC instance would
+        while len(requests) < 3:
+            msg = await pubsub.get_message(timeout=1)
+            if msg is not None:
+                requests.append(json.loads(msg["data"]))
+        for request in reversed(requests):
+            if request["key"] == "unanswered_key":
+                continue
+            await redis.publish(
+                request["response_endpoint"],
+                MsgpackSerialization.dumps(remote_data.get(request["key"])),
+            )
+
+    responder = asyncio.create_task(_respond())
+    with mock.patch.object(
+        app.redis_router, "get_user_bec_access_profile", return_value=bec_access
+    ):
+        with mock.patch.object(app.redis_router, "_send_remote_request") as send_request:
+            with mock.patch.object(
+                app.redis_router,
+                "_send_remote_requests",
+                functools.partial(app.redis_router._send_remote_requests, timeout=1),
+            ):
+                out = await app.redis_router.redis_batch_get(
+                    deployment=deployment,
+                    keys=["test_key", "missing_key", "unanswered_key"],
+                    current_user=None,
+                )
+    await responder
+    await pubsub.aclose()
+
+    send_request.assert_not_called()
+    assert [request["action"] for request in requests] == ["get"] * 3
+    assert len({request["response_endpoint"] for request in requests}) == 3
+    assert json.loads(out) == {
+        "data": {
+            "test_key": {"data": {"data": {"test_key": "test"}}, "metadata": {"message": "test"}},
+            "missing_key": None,
+            "unanswered_key": None,
+        }
+    }
+
+
+async def test_redis_batch_get_times_out_without_responses(backend):
+    _, app = backend
+    with mock.patch.object(app.redis_router, "get_user_bec_access_profile"):
+        with mock.patch.object(app.redis_router, "bec_access_profile_allows_op"):
+            with mock.patch.object(
+                app.redis_router,
+                "_send_remote_requests",
+                new_callable=mock.AsyncMock,
+                return_value={},
+            ):
+                out = await app.redis_router.redis_batch_get(
+                    deployment="68beba57a1ba24b03cb3b8b3", keys=["a", "b"], current_user=None
+                )
+    assert json.loads(out) == {"error": "Timeout waiting for response"}
+
+
+async def test_redis_batch_get_returns_none_for_empty_responses(backend):
+    _, app = backend
+    with mock.patch.object(app.redis_router, "get_user_bec_access_profile"):
+        with mock.patch.object(app.redis_router, "bec_access_profile_allows_op"):
+            with mock.patch.object(
+                app.redis_router,
+                "_send_remote_requests",
+                new_callable=mock.AsyncMock,
+                return_value={0: None, 1: None},
+            ):
+                out = await app.redis_router.redis_batch_get(
+                    deployment="68beba57a1ba24b03cb3b8b3", keys=["a", "b"], current_user=None
+                )
+    assert json.loads(out) == {"data": {"a": None, "b": None}}
+
+
+async def test_redis_batch_get_rejects_batch_with_forbidden_key(backend):
+    _, app = backend
+    bec_access = BECAccessProfile(
+        deployment_id=ObjectId("68beba57a1ba24b03cb3b8b3"),
+        username="reader",
+        owner_groups=["readers"],
+        keys=["%R~data/*"],
+        channels=["*"],
+        commands=["*"],
+    )
+    with mock.patch.object(
+        app.redis_router, "get_user_bec_access_profile", return_value=bec_access
+    ):
+        with mock.patch.object(app.redis_router, "_send_remote_request") as send_request:
+            with pytest.raises(HTTPException):
+                await app.redis_router.redis_batch_get(
+                    deployment="68beba57a1ba24b03cb3b8b3",
+                    keys=["data/sensor1", "secret/key"],
+                    current_user=None,
+                )
+            send_request.assert_not_called()
+
+
+async def test_redis_batch_post_publishes_valid_operations_in_order(backend):
+    _, app = backend
+    deployment = "68beba57a1ba24b03cb3b8b3"
+    bec_access = BECAccessProfile(
+        deployment_id=ObjectId(deployment),
+        username="writer",
+        owner_groups=["writers"],
+        keys=["%RW~user/*"],
+        channels=["*"],
+        commands=["*"],
+    )
+    operations = [
+        RedisWriteOperation(
+            key="user/first", value={"value": 1}, redis_op="set", msg_type="VariableMessage"
+        ),
+        RedisWriteOperation(
+            key="secret/key", value={"value": 2}, redis_op="set", msg_type="VariableMessage"
+        ),
+        RedisWriteOperation(
+            key="user/invalid", value={"value": 3}, redis_op="set", msg_type="NotAMessage"
+        ),
+        RedisWriteOperation(
+            key="user/second", value={"value": 4}, redis_op="send", msg_type="VariableMessage"
+        ),
+    ]
+    pubsub = app.redis_router.redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(RedisAtlasEndpoints.redis_request(deployment))
+    with mock.patch.object(
+        app.redis_router, "get_user_bec_access_profile", return_value=bec_access
+    ):
+        with mock.patch.object(app.redis_router.redis, "publish") as publish:
+            out = await app.redis_router.redis_batch_post(
+                deployment=deployment, operations=operations, current_user=None
+            )
+    # the operations are published through a single pipeline
+    publish.assert_not_called()
+
+    assert out["results"] == [
+        {"status": "success"},
+        {"status": "error", "detail": "User does not have access to the key"},
+        {"status": "error", "detail": "Invalid message type."},
+        {"status": "success"},
+    ]
+    published = []
+    while len(published) < 2:
+        msg = await pubsub.get_message(timeout=1)
+        if msg is not None:
+            published.append(MsgpackSerialization.loads(msg["data"]).data)
+    await pubsub.aclose()
+    assert [(data["action"], data["key"]) for data in published] == [
+        ("set", "user/first"),
+        ("send", "user/second"),
+    ]
+    assert published[1]["value"].value == 4
+
+
+async def test_redis_batch_post_requires_write_access(backend):
+    _, app = backend
+    with mock.patch.object(
+        app.redis_router,
+        "get_user_bec_access_profile",
+        side_effect=HTTPException(status_code=403, detail="User does not have write access"),
+    ):
+        with mock.patch.object(app.redis_router.redis, "pipeline") as pipeline:
+            with pytest.raises(HTTPException):
+                await app.redis_router.redis_batch_post(
+                    deployment="68beba57a1ba24b03cb3b8b3",
+                    operations=[
+                        RedisWriteOperation(
+                            key="user/key", value={"value": 1}, redis_op="set", msg_type="Foo"
+                        )
+                    ],
+                    current_user=None,
+                )
+            pipeline.assert_not_called()
+
+
+async def test_redis_get_cached_response_checks_access(backend):
+    _, app = backend
+    app.redis_router.response_cache.patterns = {"public/*": 1}
+    with mock.patch.object(app.redis_router, "validate_user_bec_access") as validate:
+        with mock.patch.object(
+            app.redis_router, "_fetch_remote_key", return_value='{"data": 1}'
+        ) as fetch:
+            for _ in range(2):
+                out = await app.redis_router.redis_get(
+                    deployment="68beba57a1ba24b03cb3b8b3", key="public/key", current_user=None
+                )
+                assert out == '{"data": 1}'
+            fetch.assert_called_once()
+            assert validate.call_count == 2
+
+        validate.side_effect = HTTPException(status_code=403)
+        with pytest.raises(HTTPException):
+            await app.redis_router.redis_get(
+                deployment="68beba57a1ba24b03cb3b8b3", key="public/key", current_user=None
+            )
+
+
+def test_access_decision_is_cached(backend):
+    _, app = backend
+    user = app.datasources.mongodb.get_user_by_email("admin@bec_atlas.ch")
+    deployment_access = app.datasources.mongodb.find("deployment_access", {}, DeploymentAccess)[0]
+    deployment = str(deployment_access.id)
+    with mock.patch.object(
+        app.redis_router.db, "find_one", wraps=app.redis_router.db.find_one
+    ) as find_one:
+        first = app.redis_router.get_access_decision(user, deployment)
+        assert find_one.call_count > 0
+        find_one.reset_mock()
+        assert app.redis_router.get_access_decision(user, deployment) is first
+        find_one.assert_not_called()
+
+        app.datasources.access_cache.invalidate(deployment)
+        app.redis_router.get_access_decision(user, deployment)
+        assert find_one.call_count > 0
+
+
+def test_access_decision_invalidated_on_access_update(logged_in_client, deployment, backend):
+    client = logged_in_client
+    _, app = backend
+    user = app.datasources.mongodb.get_user_by_email("admin@bec_atlas.ch")
+    assert app.redis_router.get_access_decision(user, deployment["_id"]).access == RemoteAccess.NONE
+    response = client.patch(
+        "/api/v1/deployment_access",
+        params={"deployment_id": deployment["_id"]},
+        json={
+            "user_read_access": ["admin@bec_atlas.ch"],
+            "remote_read_access": ["admin@bec_atlas.ch"],
+        },
+    )
+    assert response.status_code == 200
+    decision = app.redis_router.get_access_decision(user, deployment["_id"])
+    assert decision.access == RemoteAccess.READ
+    assert decision.bec_access is not None
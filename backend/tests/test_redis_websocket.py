@@ -1,11 +1,16 @@
+import asyncio
 import json
 from unittest import mock
 
 import pytest
 import pytest_asyncio
+from bec_lib import messages
 from bec_lib.endpoints import MessageEndpoints
+from bec_lib.serialization import MsgpackSerialization
 
 from bec_atlas.router.redis_router import RedisAtlasEndpoints, RemoteAccess
+from bec_atlas.utils.admission import ConnectionAdmission
+from bec_atlas.utils.websocket_quotas import WebsocketQuotas
 
 
 @pytest.fixture
@@ -120,3 +125,391 @@ async def test_redis_websocket_register(connected_ws):
             )
 
             assert mock.call("error", mock.ANY, room="sid") not in emit.mock_calls
+
+
+async def test_redis_websocket_state_index(connected_ws):
+    _, app = connected_ws
+    manager = app.redis_websocket.socket.manager
+    deployment = app.redis_websocket.users["sid"]["deployment"]
+    await manager.update_state_info()
+
+    states = await manager.get_websocket_states(deployment)
+    assert len(states) == 1
+    assert states[0]["sid"]["user"] == "admin@bec_atlas.ch"
+
+    # expired host states are removed from the index
+    await manager.redis.sadd(
+        RedisAtlasEndpoints.websocket_state_index(deployment),
+        RedisAtlasEndpoints.websocket_state(deployment, "expired_host"),
+    )
+    states = await manager.get_websocket_states(deployment)
+    assert len(states) == 1
+    index = await manager.redis.smembers(RedisAtlasEndpoints.websocket_state_index(deployment))
+    assert index == {RedisAtlasEndpoints.websocket_state(deployment, manager.host_id).encode()}
+
+
+async def test_redis_websocket_connect_does_not_scan_keys(connected_ws):
+    client, app = connected_ws
+    deployment = app.redis_websocket.users["sid"]["deployment"]
+    await app.redis_websocket.socket.manager.update_state_info()
+    with mock.patch.object(app.redis_websocket.socket.manager.redis, "keys") as keys:
+        await app.redis_websocket.socket.handlers["/"]["connect"](
+            "sid2",
+            {
+                "HTTP_QUERY": json.dumps({"deployment": deployment}),
+                "HTTP_COOKIE": f"access_token={client.cookies.get('access_token')}",
+            },
+        )
+        keys.assert_not_called()
+    assert "sid2" in app.redis_websocket.users
+
+
+async def test_redis_websocket_connect_restores_subscriptions(connected_ws):
+    client, app = connected_ws
+    deployment = app.redis_websocket.users["sid"]["deployment"]
+    request = json.dumps({"endpoint": "scan_status"})
+    await app.redis_websocket.socket.handlers["/"]["register"]("sid", request)
+    await app.redis_websocket.socket.handlers["/"]["connect"](
+        "sid2",
+        {
+            "HTTP_QUERY": json.dumps({"deployment": deployment}),
+            "HTTP_COOKIE": f"access_token={client.cookies.get('access_token')}",
+        },
+    )
+    assert app.redis_websocket.users["sid2"]["subscriptions"] == [
+        (MessageEndpoints.scan_status().endpoint, request)
+    ]
+
+
+async def test_redis_websocket_subscriptions_are_refcounted(connected_ws):
+    client, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    room = RedisAtlasEndpoints.socketio_endpoint_room(
+        deployment, MessageEndpoints.scan_status().endpoint
+    )
+    ws.users["sid2"] = {"user": "admin@bec_atlas.ch", "subscriptions": [], "deployment": deployment}
+    request = json.dumps({"endpoint": "scan_status"})
+
+    stream = RedisAtlasEndpoints.redis_data(deployment, MessageEndpoints.scan_status().endpoint)
+
+    with mock.patch.object(ws, "stream_reader") as stream_reader:
+        stream_reader.add.return_value = "0-0"
+        await ws.socket.handlers["/"]["register"]("sid", request)
+        await ws.socket.handlers["/"]["register"]("sid", request)
+        await ws.socket.handlers["/"]["register"]("sid2", request)
+        stream_reader.add.assert_called_once()
+        assert ws.room_subscribers[room] == {"sid", "sid2"}
+        assert len(ws.users["sid"]["subscriptions"]) == 1
+
+        await ws.socket.handlers["/"]["unregister"]("sid", request)
+        stream_reader.remove.assert_not_called()
+        assert ws.users["sid"]["subscriptions"] == []
+        assert ws.room_subscribers[room] == {"sid2"}
+
+        await ws.socket.handlers["/"]["disconnect"]("sid2")
+        stream_reader.remove.assert_called_once_with(stream)
+        assert room not in ws.room_subscribers
+        assert room not in ws.room_cursors
+
+
+async def test_redis_websocket_disconnect_removes_redis_subscription(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    await ws.socket.handlers["/"]["register"]("sid", json.dumps({"endpoint": "scan_status"}))
+    assert len(ws.stream_reader._streams) == 1
+    await ws.socket.handlers["/"]["disconnect"]("sid")
+    assert not ws.stream_reader._streams
+
+
+async def test_redis_websocket_on_redis_message(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    room = RedisAtlasEndpoints.socketio_endpoint_room("deployment", "info/scans/scan_status")
+    msg = messages.ScanStatusMessage(scan_id="scan_id", status="open", info={})
+    with mock.patch.object(ws.socket, "emit") as emit:
+        ws.on_redis_message("1-0", {"data": msg}, parent=ws, room=room, endpoint_request="request")
+        for _ in range(100):
+            if emit.called:
+                break
+            await asyncio.sleep(0.01)
+    emit.assert_called_once_with("message", data=mock.ANY, room=room, skip_sid=None)
+    outgoing = json.loads(emit.call_args.kwargs["data"])
+    assert outgoing["endpoint"] == "info/scans/scan_status"
+    assert outgoing["endpoint_request"] == "request"
+    assert outgoing["data"]["scan_id"] == "scan_id"
+    assert outgoing["stream_id"] == "1-0"
+
+
+def _add_stream_entry(app, stream: str, scan_id: str) -> str:
+    msg = messages.ScanStatusMessage(scan_id=scan_id, status="open", info={})
+    redis = app.redis_websocket.stream_reader.redis
+    return redis.xadd(stream, {"data": MsgpackSerialization.dumps(msg)}).decode()
+
+
+async def _wait_for_snapshots(ws):
+    while ws._snapshot_task is not None:
+        await asyncio.sleep(0.01)
+
+
+async def test_redis_websocket_register_resumes_new_room_from_last_id(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    endpoint = MessageEndpoints.scan_status().endpoint
+    stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+    last_id = _add_stream_entry(app, stream, "seen")
+    _add_stream_entry(app, stream, "missed")
+
+    with mock.patch.object(ws.stream_reader, "add", return_value=last_id) as add:
+        await ws.socket.handlers["/"]["register"](
+            "sid", json.dumps({"endpoint": "scan_status"}), last_id
+        )
+    add.assert_called_once_with(
+        stream, last_id, parent=ws, room=mock.ANY, endpoint_request=mock.ANY
+    )
+
+
+async def test_redis_websocket_register_replays_missed_entries(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    endpoint = MessageEndpoints.scan_status().endpoint
+    stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+    room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+    ws.users["sid2"] = {"user": "admin@bec_atlas.ch", "subscriptions": [], "deployment": deployment}
+    last_id = _add_stream_entry(app, stream, "seen")
+    missed_id = _add_stream_entry(app, stream, "missed")
+
+    with mock.patch.object(ws, "stream_reader") as stream_reader:
+        stream_reader.add.return_value = missed_id
+        await ws.socket.handlers["/"]["register"]("sid2", json.dumps({"endpoint": "scan_status"}))
+        await _wait_for_snapshots(ws)
+        # entries after the room cursor reach the client through the room
+        _add_stream_entry(app, stream, "live")
+        with mock.patch.object(ws.socket, "emit") as emit:
+            await ws.socket.handlers["/"]["register"](
+                "sid", json.dumps({"endpoint": "scan_status"}), last_id
+            )
+    emit.assert_called_once_with("message", data=mock.ANY, room="sid")
+    outgoing = json.loads(emit.call_args.kwargs["data"])
+    assert outgoing["stream_id"] == missed_id
+    assert outgoing["data"]["scan_id"] == "missed"
+    assert ws.room_subscribers[room] == {"sid", "sid2"}
+
+
+async def test_redis_websocket_register_rejects_invalid_last_id(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    with mock.patch.object(ws.socket, "emit") as emit:
+        await ws.socket.handlers["/"]["register"](
+            "sid", json.dumps({"endpoint": "scan_status"}), "invalid"
+        )
+    assert mock.call("error", mock.ANY, room="sid") in emit.mock_calls
+    assert ws.users["sid"]["subscriptions"] == []
+
+
+@pytest.mark.parametrize(
+    "room, published",
+    [
+        (RedisAtlasEndpoints.socketio_endpoint_room("deployment", "info/scans/scan_status"), False),
+        ("unknown_sid", True),
+        (None, True),
+    ],
+)
+async def test_redis_websocket_manager_routes_emits(backend_client, room, published):
+    _, app = backend_client
+    manager = app.redis_websocket.socket.manager
+    with mock.patch.object(manager, "_publish") as publish:
+        await manager.emit("message", data="data", room=room)
+    assert publish.called == published
+
+
+async def test_redis_websocket_manager_emits_to_local_sid_directly(backend_client):
+    _, app = backend_client
+    manager = app.redis_websocket.socket.manager
+    with mock.patch.object(manager, "is_connected", return_value=True):
+        with mock.patch.object(manager, "_publish") as publish:
+            await manager.emit("error", data="data", room="local_sid")
+    publish.assert_not_called()
+
+
+async def test_redis_websocket_register_sends_snapshot(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    endpoint = MessageEndpoints.scan_status().endpoint
+    stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+    _add_stream_entry(app, stream, "old")
+    last_id = _add_stream_entry(app, stream, "latest")
+    request = json.dumps({"endpoint": "scan_status"})
+
+    with mock.patch.object(ws.socket, "emit") as emit:
+        await ws.socket.handlers["/"]["register"]("sid", request)
+        await _wait_for_snapshots(ws)
+    emit.assert_called_once_with("message", data=mock.ANY, room="sid")
+    outgoing = json.loads(emit.call_args.kwargs["data"])
+    assert outgoing["stream_id"] == last_id
+    assert outgoing["data"]["scan_id"] == "latest"
+    assert outgoing["endpoint_request"] == request
+
+
+async def test_redis_websocket_new_room_reads_last_entry_once_without_blocking(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    endpoint = MessageEndpoints.scan_status().endpoint
+    stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+    last_id = _add_stream_entry(app, stream, "latest")
+    sync_redis = ws.stream_reader.redis
+
+    with mock.patch.object(ws.socket, "emit") as emit:
+        with mock.patch.object(sync_redis, "xrevrange") as sync_xrevrange:
+            with mock.patch.object(
+                ws.redis_router.redis, "pipeline", wraps=ws.redis_router.redis.pipeline
+            ) as pipeline:
+                await ws.socket.handlers["/"]["register"](
+                    "sid", json.dumps({"endpoint": "scan_status"})
+                )
+                await _wait_for_snapshots(ws)
+    sync_xrevrange.assert_not_called()
+    # the entry read for the start of the room is reused for the snapshot
+    assert pipeline.call_args_list.count(mock.call(transaction=False)) == 1
+    assert ws.room_cursors[RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)] == (
+        last_id
+    )
+    emit.assert_called_once_with("message", data=mock.ANY, room="sid")
+    assert json.loads(emit.call_args.kwargs["data"])["stream_id"] == last_id
+
+
+async def test_redis_websocket_snapshots_are_fetched_in_one_read(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    for endpoint in [MessageEndpoints.scan_status(), MessageEndpoints.scan_queue_status()]:
+        _add_stream_entry(app, RedisAtlasEndpoints.redis_data(deployment, endpoint.endpoint), "id")
+
+    with mock.patch.object(ws.socket, "emit") as emit:
+        with mock.patch.object(
+            ws.redis_router.redis, "pipeline", wraps=ws.redis_router.redis.pipeline
+        ) as pipeline:
+            await asyncio.gather(
+                ws.socket.handlers["/"]["register"]("sid", json.dumps({"endpoint": "scan_status"})),
+                ws.socket.handlers["/"]["register"](
+                    "sid", json.dumps({"endpoint": "scan_queue_status"})
+                ),
+            )
+            await _wait_for_snapshots(ws)
+    assert pipeline.call_args_list.count(mock.call(transaction=False)) == 1
+    assert emit.call_count == 2
+
+
+async def test_redis_websocket_snapshot_skipped_for_newer_room_data(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    endpoint = MessageEndpoints.scan_status().endpoint
+    room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+    _add_stream_entry(app, RedisAtlasEndpoints.redis_data(deployment, endpoint), "latest")
+
+    # the room already received a newer entry than the one read for the snapshot
+    with mock.patch.object(ws.stream_reader, "add", return_value="99999999999999-0"):
+        with mock.patch.object(ws.socket, "emit") as emit:
+            await ws.socket.handlers["/"]["register"](
+                "sid", json.dumps({"endpoint": "scan_status"})
+            )
+            await _wait_for_snapshots(ws)
+    emit.assert_not_called()
+    assert ws.room_cursors[room] == "99999999999999-0"
+
+
+async def test_redis_websocket_connect_rejected_when_busy(backend_client):
+    client, app = backend_client
+    ws = app.redis_websocket
+    deployment = client.get("/api/v1/deployments/realm", params={"realm": "demo_beamline_1"}).json()
+    environ = {
+        "HTTP_QUERY": json.dumps({"deployment": deployment[0]["_id"]}),
+        "HTTP_COOKIE": f"access_token={client.cookies.get('access_token')}",
+    }
+    ws.admission = ConnectionAdmission(max_concurrent=1, max_queued=0, reconnect_delay=(1, 2))
+    with mock.patch.object(ws.socket, "emit") as emit:
+        with mock.patch.object(ws.socket, "disconnect") as disconnect:
+            async with ws.admission.admit():
+                await ws.socket.handlers["/"]["connect"]("sid", environ)
+    emit.assert_called_once_with("error", mock.ANY, room="sid")
+    error = emit.call_args.args[1]
+    assert error["error"] == "Server busy"
+    assert 1 <= error["retry_after"] <= 2
+    disconnect.assert_called_once_with("sid")
+    assert "sid" not in ws.users
+    assert ws.admission.metrics()["rejected"] == 1
+
+
+async def test_redis_websocket_subscription_quota(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    ws.quotas = WebsocketQuotas(max_subscriptions_per_user=1)
+    with mock.patch.object(ws.socket, "emit") as emit:
+        await ws.socket.handlers["/"]["register"]("sid", json.dumps({"endpoint": "scan_status"}))
+        await ws.socket.handlers["/"]["register"](
+            "sid", json.dumps({"endpoint": "scan_queue_status"})
+        )
+    emit.assert_any_call("error", {"error": "Subscription limit of the user reached"}, room="sid")
+    assert len(ws.users["sid"]["subscriptions"]) == 1
+    assert len(ws.room_subscribers) == 1
+
+
+async def test_redis_websocket_connection_quota(connected_ws):
+    client, app = connected_ws
+    ws = app.redis_websocket
+    ws.quotas = WebsocketQuotas(max_connections_per_user=1)
+    await ws.socket.manager.update_state_info()
+    with mock.patch.object(ws.socket, "emit") as emit:
+        await ws.socket.handlers["/"]["connect"](
+            "sid2",
+            {
+                "HTTP_QUERY": json.dumps({"deployment": ws.users["sid"]["deployment"]}),
+                "HTTP_COOKIE": f"access_token={client.cookies.get('access_token')}",
+            },
+        )
+    emit.assert_any_call("error", {"error": "Connection limit of the user reached"}, room="sid2")
+    assert "sid2" not in ws.users
+    assert "sid2" not in ws.client_stats
+
+
+async def test_redis_websocket_state_contains_client_stats(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    await ws.socket.handlers["/"]["register"]("sid", json.dumps({"endpoint": "scan_status"}))
+    states = await ws.socket.manager.get_websocket_states(ws.users["sid"]["deployment"])
+    stats = states[0]["sid"]["stats"]
+    assert stats["subscriptions"] == 1
+    assert stats["messages_dropped"] == 0
+    assert stats["throttled"] is False
+
+
+async def test_redis_websocket_throttles_slow_clients(connected_ws):
+    _, app = connected_ws
+    ws = app.redis_websocket
+    deployment = ws.users["sid"]["deployment"]
+    room = RedisAtlasEndpoints.socketio_endpoint_room(
+        deployment, MessageEndpoints.scan_status().endpoint
+    )
+    await ws.socket.handlers["/"]["register"]("sid", json.dumps({"endpoint": "scan_status"}))
+    ws.quotas = WebsocketQuotas(max_queued_messages=10, max_throttle_time=60)
+
+    with mock.patch.object(ws, "_get_queued_messages", return_value=11):
+        with mock.patch.object(ws.socket, "emit") as emit:
+            await ws._emit_messages([(room, "1-0", "message")])
+    emit.assert_called_once_with("message", data="message", room=room, skip_sid=["sid"])
+    assert ws.client_stats["sid"].messages_dropped == 1
+    assert "sid" in ws.users
+
+    # clients that stay throttled for too long are disconnected
+    ws.quotas.max_throttle_time = 0
+    with mock.patch.object(ws, "_get_queued_messages", return_value=11):
+        with mock.patch.object(ws.socket, "emit") as emit:
+            await ws._emit_messages([(room, "2-0", "message")])
+    emit.assert_any_call("error", {"error": "Client too slow"}, room="sid")
+    assert "sid" not in ws.users
+    assert "sid" not in ws.client_stats
@@ -1,9 +1,10 @@
+import threading
 from unittest import mock
 
 import pytest
 
-from bec_atlas.ingestor.signal.model import SignalGroupInfo
-from bec_atlas.ingestor.signal.utils import SignalGroupManager
+from bec_atlas.ingestor.signal.model import SignalGroupInfo, SignalJsonGroupInfo
+from bec_atlas.ingestor.signal.utils import SignalGroupDirectory, SignalGroupManager
 
 
 @pytest.fixture
@@ -15,6 +16,19 @@ def group_manager():
         yield manager
 
 
+def test_session_is_not_shared_between_threads():
+    """Test each thread uses its own HTTP session."""
+    with mock.patch("bec_atlas.ingestor.signal.utils.requests.Session", side_effect=mock.Mock):
+        manager = SignalGroupManager(host="http://signal.test", number="+123456789")
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(manager.session))
+        thread.start()
+        thread.join()
+
+        assert manager.session is manager.session
+        assert sessions[0] is not manager.session
+
+
 def test_get_all_groups_returns_list(group_manager, mock_http_response):
     """Test get_all_groups returns a list of SignalGroupInfo."""
     response = mock_http_response(
@@ -409,3 +423,221 @@ def test_set_expiration_time(group_manager, mock_http_response):
     assert result is True
     call_args = group_manager.session.post.call_args
     assert call_args.kwargs["json"]["params"]["expiration"] == 3600
+
+
+def _group(group_id, admins=None, members=None):
+    return SignalGroupInfo(
+        name=group_id,
+        id=group_id,
+        members=members or [],
+        admins=admins or [],
+        pendingMembers=[],
+        requestingMembers=[],
+        banned=[],
+        groupInviteLink=None,
+        permissionAddMember="EVERY_MEMBER",
+        permissionEditDetails="ONLY_ADMINS",
+        permissionSendMessage="EVERY_MEMBER",
+    )
+
+
+def test_run_batch_maps_results_by_id(group_manager, mock_http_response):
+    """Test _run_batch sends distinct ids and maps out-of-order results back to the calls."""
+    response = mock_http_response(
+        [
+            {"jsonrpc": "2.0", "result": {"groupId": "b"}, "id": 1},
+            {"jsonrpc": "2.0", "error": {"code": -1, "message": "failed"}, "id": 2},
+            {"jsonrpc": "2.0", "result": {"groupId": "a"}, "id": 0},
+        ]
+    )
+    group_manager.session.post.return_value = response
+
+    results = group_manager._run_batch(
+        [("joinGroup", {"uri": "a"}), ("joinGroup", {"uri": "b"}), ("joinGroup", {"uri": "c"})]
+    )
+
+    assert results == [{"groupId": "a"}, {"groupId": "b"}, None]
+    payload = group_manager.session.post.call_args.kwargs["json"]
+    assert [call["id"] for call in payload] == [0, 1, 2]
+    assert group_manager.session.post.call_count == 1
+
+
+def test_run_batch_splits_large_batches(group_manager, mock_http_response):
+    """Test _run_batch sends at most MAX_BATCH_SIZE calls per request."""
+    group_manager.MAX_BATCH_SIZE = 2
+    group_manager.session.post.side_effect = [
+        mock_http_response([{"result": {}, "id": 0}, {"result": {}, "id": 1}]),
+        mock_http_response([{"result": {}, "id": 2}]),
+    ]
+
+    results = group_manager._run_batch([("listGroups", {})] * 3)
+
+    assert results == [{}, {}, {}]
+    assert group_manager.session.post.call_count == 2
+
+
+def test_run_batch_rejected_batch(group_manager, mock_http_response):
+    """Test _run_batch returns None for all calls if the server rejects the batch."""
+    group_manager.session.post.return_value = mock_http_response(
+        {"jsonrpc": "2.0", "error": {"code": -32600}, "id": None}
+    )
+
+    assert group_manager._run_batch([("listGroups", {})] * 2) == [None, None]
+
+
+def test_leave_groups_batches_requests(group_manager, mock_http_response):
+    """Test leave_groups leaves many groups with a single request."""
+    groups = [_group(f"group-{i}") for i in range(100)]
+    group_manager.session.post.return_value = mock_http_response(
+        [{"result": {}, "id": i} for i in range(100)]
+    )
+
+    results = group_manager.leave_groups(groups, delete=True)
+
+    assert results == {f"group-{i}": True for i in range(100)}
+    assert group_manager.session.post.call_count == 2
+    payload = group_manager.session.post.call_args_list[0].kwargs["json"]
+    assert payload[0] == {
+        "jsonrpc": "2.0",
+        "method": "quitGroup",
+        "params": {"groupId": "group-0", "delete": True},
+        "id": 0,
+    }
+
+
+def test_leave_groups_skips_groups_with_last_admin(group_manager, mock_http_response):
+    """Test leave_groups does not leave groups in which we are the last admin."""
+    admin = [{"number": "+123456789"}]
+    members = [{"number": "+1"}, {"number": "+2"}]
+    groups = [_group("group-1", admins=admin, members=members), _group("group-2")]
+    group_manager.session.post.return_value = mock_http_response([{"result": {}, "id": 0}])
+
+    results = group_manager.leave_groups(groups)
+
+    assert results == {"group-1": False, "group-2": True}
+    payload = group_manager.session.post.call_args.kwargs["json"]
+    assert [call["params"]["groupId"] for call in payload] == ["group-2"]
+
+
+def _listing(*groups):
+    return {"result": [group.model_dump() for group in groups]}
+
+
+def test_directory_lookups_by_id_and_link():
+    directory = SignalGroupDirectory(ttl=300)
+    assert directory.is_stale
+    group = _group("group-1").model_copy(update={"groupInviteLink": "https://signal.group/1"})
+
+    directory.replace([group, _group("group-2")])
+
+    assert not directory.is_stale
+    assert directory.get("group-1") is group
+    assert directory.get_by_link("https://signal.group/1") is group
+    assert directory.get("group-3") is None
+    directory.remove("group-1")
+    assert directory.get_by_link("https://signal.group/1") is None
+    metrics = directory.metrics()
+    assert metrics["groups"] == 1
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 2
+    assert metrics["refreshes"] == 1
+    assert 0 <= metrics["age"] < 300
+
+
+def test_directory_expires_after_ttl():
+    directory = SignalGroupDirectory(ttl=300)
+    assert directory.metrics()["age"] == -1
+    with mock.patch("bec_atlas.ingestor.signal.utils.time.monotonic", return_value=1000):
+        directory.replace([])
+    with mock.patch("bec_atlas.ingestor.signal.utils.time.monotonic", return_value=1301):
+        assert directory.is_stale
+
+
+def test_directory_applies_group_update_events():
+    directory = SignalGroupDirectory()
+    directory.replace([_group("group-1")])
+
+    directory.apply_event(
+        SignalJsonGroupInfo(groupId="group-1", groupName="Renamed", revision=2, type="UPDATE")
+    )
+    assert directory.invalidated == {"group-1"}
+    assert directory.get("group-1").name == "Renamed"
+
+    # messages and outdated revisions do not invalidate the group again
+    directory.update(_group("group-1"))
+    directory.apply_event(
+        SignalJsonGroupInfo(groupId="group-1", groupName="Renamed", revision=3, type="DELIVER")
+    )
+    directory.apply_event(
+        SignalJsonGroupInfo(groupId="group-1", groupName="Renamed", revision=2, type="UPDATE")
+    )
+    assert directory.invalidated == set()
+    assert directory.metrics()["invalidations"] == 1
+
+
+def test_leave_group_uses_the_directory(group_manager, mock_http_response):
+    """Test leave_group checks the admins without an RPC if the directory is fresh."""
+    group_manager.directory.replace([_group("group-1"), _group("group-2")])
+    group_manager.session.post.return_value = mock_http_response({"result": {}})
+
+    assert group_manager.leave_group("group-1") is True
+    assert group_manager.leave_group("group-3") is False
+
+    group_manager.session.post.assert_called_once()
+    assert group_manager.session.post.call_args.kwargs["json"]["method"] == "quitGroup"
+    assert group_manager.directory.get("group-1") is None
+
+
+def test_get_cached_group_fetches_invalidated_groups(group_manager, mock_http_response):
+    """Test updated groups are fetched again before they are used."""
+    group_manager.directory.replace([_group("group-1")])
+    group_manager.session.post.return_value = mock_http_response({"result": {}})
+    group_manager.add_user_to_group("group-1", "+999999999")
+
+    updated = _group("group-1", members=[{"number": "+999999999"}])
+    group_manager.session.post.return_value = mock_http_response(_listing(updated))
+    group = group_manager.get_cached_group("group-1")
+    assert [member.number for member in group.members] == ["+999999999"]
+    assert group_manager.session.post.call_args.kwargs["json"]["params"] == {"groupId": "group-1"}
+
+    group_manager.session.post.reset_mock()
+    assert group_manager.get_cached_group("group-1") == updated
+    group_manager.session.post.assert_not_called()
+
+
+def test_get_group_by_link_refreshes_stale_directory(group_manager, mock_http_response):
+    """Test get_group_by_link refreshes the directory once and then resolves links locally."""
+    group = _group("group-1").model_copy(update={"groupInviteLink": "https://signal.group/1"})
+    group_manager.session.post.return_value = mock_http_response(_listing(group))
+
+    assert group_manager.get_group_by_link("https://signal.group/1") == group
+    assert group_manager.get_group_by_link("https://signal.group/2") is None
+    group_manager.session.post.assert_called_once()
+
+
+def test_join_group_invalidates_the_group(group_manager, mock_http_response):
+    """Test joined groups are fetched before they are resolved from the directory."""
+    group_manager.directory.replace([])
+    group_manager.session.post.return_value = mock_http_response({"result": {"groupId": "new"}})
+    group_manager.join_group("https://signal.group/new")
+
+    group = _group("new").model_copy(update={"groupInviteLink": "https://signal.group/new"})
+    group_manager.session.post.return_value = mock_http_response(_listing(group))
+    assert group_manager.get_group_by_link("https://signal.group/new") == group
+
+
+def test_get_group_by_link_refreshes_invalidated_groups_at_once(group_manager, mock_http_response):
+    """Test invalidated groups are refreshed with a single group listing."""
+    groups = [_group(f"group-{index}") for index in range(3)]
+    group_manager.directory.replace(groups)
+    for group in groups:
+        group_manager.directory.invalidate(group.id)
+
+    group = groups[1].model_copy(update={"groupInviteLink": "https://signal.group/1"})
+    group_manager.session.post.return_value = mock_http_response(
+        _listing(groups[0], group, groups[2])
+    )
+    assert group_manager.get_group_by_link("https://signal.group/1") == group
+    group_manager.session.post.assert_called_once()
+    assert group_manager.session.post.call_args.kwargs["json"]["params"] == {}
+    assert group_manager.directory.invalidated == set()
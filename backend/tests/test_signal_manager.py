@@ -1,3 +1,5 @@
+import json
+import time
 from unittest import mock
 
 import pytest
@@ -10,10 +12,11 @@ from bec_atlas.ingestor.signal.model import (
     SignalGroupInfo,
     SignalRecipientAddress,
 )
+from bec_atlas.ingestor.signal.outbox import SignalDeliveryError
 
 
 @pytest.fixture
-def signal_manager(backend):
+def signal_manager(backend, mock_http_response):
     """Create a SignalManager using the real backend configuration."""
     client, app = backend
     app.redis_websocket.users = {}
@@ -25,14 +28,25 @@ def signal_manager(backend):
     ):
 
         mock_subscriber.return_value = mock.Mock()
-        mock_session.return_value = mock.Mock()
+        mock_session.side_effect = lambda: mock.Mock()
 
         # Create the full ingestor which will create the SignalManager
         ingestor = MessageServiceIngestor(config=app.config)
+        ingestor.signal_manager.session.post.return_value = mock_http_response(
+            {"jsonrpc": "2.0", "result": {}, "id": 1}
+        )
         yield ingestor.signal_manager
         ingestor.shutdown()
 
 
+def _wait_for_delivery(signal_manager, expected_call, timeout=5):
+    """Wait until the outbox thread delivered the expected call to the Signal server."""
+    deadline = time.monotonic() + timeout
+    while expected_call not in signal_manager.session.post.mock_calls:
+        assert time.monotonic() < deadline, "Message was not delivered"
+        time.sleep(0.01)
+
+
 def test_get_text_from_message(signal_manager):
     msg = messages.MessagingServiceMessage(
         service_name="signal",
@@ -245,10 +259,11 @@ def test_complete_signal_linking_calls_join_group(signal_manager):
                 "message": "Your Signal group has been successfully linked.",
                 "recipients": ["+491234"],
             },
+            "id": 1,
         },
         timeout=10,
     )
-    assert expected_confirm_call in signal_manager.session.post.mock_calls
+    _wait_for_delivery(signal_manager, expected_confirm_call)
     assert "+491234" not in signal_manager.pending_signal_requests
 
 
@@ -395,10 +410,11 @@ def test_complete_signal_linking_banned_user_sends_message(signal_manager):
                 "message": "Your link request has been received, but BEC is currently banned from the group. Please add BEC back to the group.",
                 "recipients": ["+491234"],
             },
+            "id": 1,
         },
         timeout=10,
     )
-    assert expected_call in signal_manager.session.post.mock_calls
+    _wait_for_delivery(signal_manager, expected_call)
 
 
 def test_complete_signal_linking_no_group_sends_message(signal_manager):
@@ -422,10 +438,11 @@ def test_complete_signal_linking_no_group_sends_message(signal_manager):
                 "message": "Your link request has been received, but no matching group was found on the Signal server. Please make sure to send a valid group link.",
                 "recipients": ["+491234"],
             },
+            "id": 1,
         },
         timeout=10,
     )
-    assert expected_call in signal_manager.session.post.mock_calls
+    _wait_for_delivery(signal_manager, expected_call)
 
 
 def test_handle_signal_message_update_join(signal_manager):
@@ -462,3 +479,117 @@ def test_handle_signal_message_update_leave(signal_manager):
 
     mock_send.assert_called_once_with("group-1", "exit")
     mock_leave.assert_called_once_with("group-1")
+
+
+def test_cleanup_groups_leaves_stale_groups_in_one_batch(signal_manager):
+    groups = [
+        SignalGroupInfo(
+            name=group_id,
+            id=group_id,
+            members=[],
+            admins=[],
+            pendingMembers=[],
+            requestingMembers=[],
+            banned=[],
+            groupInviteLink=None,
+            permissionAddMember="EVERY_MEMBER",
+            permissionEditDetails="ONLY_ADMINS",
+            permissionSendMessage="EVERY_MEMBER",
+        )
+        for group_id in ("stale-1", "stale-2")
+    ]
+
+    with (
+        mock.patch.object(signal_manager.ingestor, "available_deployments", []),
+        mock.patch.object(signal_manager.group_manager, "get_all_groups", return_value=groups),
+        mock.patch.object(
+            signal_manager.group_manager,
+            "leave_groups",
+            return_value={"stale-1": True, "stale-2": False},
+        ) as mock_leave,
+        mock.patch.object(
+            signal_manager.shutdown_event,
+            "wait",
+            side_effect=lambda _: signal_manager.shutdown_event.set(),
+        ),
+    ):
+        signal_manager.cleanup_groups()
+
+    mock_leave.assert_called_once_with(groups, delete=True)
+
+
+def test_post_queues_payload_for_delivery(signal_manager):
+    payload = {"jsonrpc": "2.0", "method": "send", "params": {"message": "Hi", "groupId": "g"}}
+    with mock.patch.object(signal_manager.outbox, "enqueue") as mock_enqueue:
+        signal_manager.post(payload)
+    mock_enqueue.assert_called_once_with(payload)
+
+    signal_manager._send(payload)
+    signal_manager.session.post.assert_called_once_with(
+        f"{signal_manager.host}/api/v1/rpc", json={**payload, "id": 1}, timeout=10
+    )
+    signal_manager.session.post.return_value.raise_for_status.assert_called_once()
+
+
+@pytest.mark.parametrize("code, retryable", [(-5, True), (-3, True), (-1, False)])
+def test_send_raises_on_json_rpc_errors(signal_manager, mock_http_response, code, retryable):
+    payload = {"jsonrpc": "2.0", "method": "send", "params": {"message": "Hi", "groupId": "g"}}
+    signal_manager.session.post.return_value = mock_http_response(
+        {"jsonrpc": "2.0", "error": {"code": code, "message": "failed"}, "id": 1}
+    )
+
+    with pytest.raises(SignalDeliveryError) as exc_info:
+        signal_manager._send(payload)
+    assert exc_info.value.code == code
+    assert exc_info.value.retryable is retryable
+
+
+def test_send_streams_attachments(signal_manager):
+    msg = messages.MessagingServiceMessage(
+        service_name="signal",
+        message=[
+            messages.MessagingServiceTextContent(content="Plot"),
+            messages.MessagingServiceFileContent(
+                filename="plot.txt", data=b"data", mime_type="text/plain"
+            ),
+        ],
+        scope=["+491234"],
+    )
+    payload = {"jsonrpc": "2.0", "method": "send", "params": {"message": "Plot"}}
+    signal_manager.add_attachments_to_payload(msg, payload)
+    [attachment] = payload["params"]["attachments"]
+    assert attachment.data == b"data"
+
+    signal_manager._send(payload)
+
+    call_args = signal_manager.session.post.call_args
+    assert call_args.kwargs["headers"] == {"Content-Type": "application/json"}
+    assert json.loads(call_args.kwargs["data"].read())["params"]["attachments"] == [
+        "data:text/plain;filename=plot.txt;base64,ZGF0YQ=="
+    ]
+
+
+def test_handle_event_invalidates_updated_groups(signal_manager):
+    event = {
+        "account": "+491234",
+        "envelope": {
+            "sourceNumber": "+491234",
+            "timestamp": 1,
+            "serverReceivedTimestamp": 1,
+            "serverDeliveredTimestamp": 1,
+            "dataMessage": {
+                "timestamp": 1,
+                "message": None,
+                "groupInfo": {
+                    "groupId": "group-1",
+                    "groupName": "Group",
+                    "revision": 2,
+                    "type": "UPDATE",
+                },
+            },
+        },
+    }
+
+    signal_manager._handle_event(event)
+
+    assert signal_manager.group_manager.directory.invalidated == {"group-1"}
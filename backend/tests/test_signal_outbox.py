@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+from bec_atlas.ingestor.signal.outbox import SignalDeliveryError, SignalOutbox
+
+
+def _text(message: str, group_id: str = "group-1") -> dict:
+    return {"jsonrpc": "2.0", "method": "send", "params": {"message": message, "groupId": group_id}}
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def outbox_factory():
+    outboxes = []
+
+    def _create(send, **kwargs):
+        outbox = SignalOutbox(send, **kwargs)
+        outboxes.append(outbox)
+        return outbox
+
+    yield _create
+    for outbox in outboxes:
+        outbox.shutdown()
+
+
+def test_outbox_enqueue_does_not_block(outbox_factory):
+    release = threading.Event()
+    sent = []
+
+    def send(payload):
+        release.wait()
+        sent.append(payload)
+
+    outbox = outbox_factory(send)
+    start = time.monotonic()
+    outbox.enqueue(_text("first"))
+    outbox.enqueue(_text("second", group_id="group-2"))
+    assert time.monotonic() - start < 1
+
+    release.set()
+    _wait_for(lambda: len(sent) == 2)
+    metrics = outbox.metrics()
+    assert metrics["sent"] == 2
+    assert metrics["queued"] == 0
+    assert metrics["latency_max"] > 0
+
+
+def test_outbox_coalesces_consecutive_text_messages(outbox_factory):
+    release = threading.Event()
+    sent = []
+
+    def send(payload):
+        release.wait()
+        sent.append(payload)
+
+    outbox = outbox_factory(send, coalesce_window=10)
+    outbox.enqueue(_text("in flight"))
+    _wait_for(lambda: outbox.metrics()["queued"] == 0)
+    outbox.enqueue(_text("a"))
+    outbox.enqueue(_text("b"))
+    sticker = _text("c")
+    sticker["params"]["sticker"] = "pack:1"
+    outbox.enqueue(sticker)
+    outbox.enqueue(_text("other", group_id="group-2"))
+
+    release.set()
+    _wait_for(lambda: len(sent) == 4)
+    group_1 = [payload["params"] for payload in sent if payload["params"]["groupId"] == "group-1"]
+    assert [params["message"] for params in group_1] == ["in flight", "a\nb", "c"]
+    assert group_1[2]["sticker"] == "pack:1"
+    assert outbox.metrics()["coalesced"] == 1
+
+
+def test_outbox_does_not_coalesce_outside_the_window(outbox_factory):
+    outbox = outbox_factory(lambda payload: None, coalesce_window=0)
+    with outbox._condition:
+        outbox.enqueue(_text("a"))
+        outbox.enqueue(_text("b"))
+        queue = outbox._queues["group:group-1"]
+        queue.messages[1].enqueued_at += 1
+        message = outbox._pop_message(queue)
+    assert message.payload["params"]["message"] == "a"
+
+
+def test_outbox_rate_limits_per_recipient(outbox_factory):
+    sent = []
+    outbox = outbox_factory(
+        lambda payload: sent.append((time.monotonic(), payload)), rate=10, burst=1
+    )
+    start = time.monotonic()
+    for index in range(3):
+        payload = _text(str(index))
+        payload["params"]["attachments"] = []
+        outbox.enqueue(payload)
+    outbox.enqueue(_text("other", group_id="group-2"))
+
+    _wait_for(lambda: len(sent) == 4)
+    group_1 = [
+        timestamp for timestamp, payload in sent if payload["params"]["groupId"] == "group-1"
+    ]
+    group_2 = [
+        timestamp for timestamp, payload in sent if payload["params"]["groupId"] == "group-2"
+    ]
+    # the first message of each recipient uses the burst, the others wait for new tokens
+    assert group_2[0] - start < 0.1
+    assert group_1[2] - group_1[0] >= 0.15
+
+
+def test_outbox_retries_with_backoff(outbox_factory):
+    attempts = []
+
+    def send(payload):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError("server unavailable")
+
+    outbox = outbox_factory(send, retry_delay=(0.05, 0.1))
+    outbox.enqueue(_text("a"))
+
+    _wait_for(lambda: outbox.metrics()["sent"] == 1)
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+    assert outbox.metrics()["retried"] == 2
+
+
+def test_outbox_drops_messages_after_max_retries(outbox_factory):
+    def send(payload):
+        raise ConnectionError("server unavailable")
+
+    outbox = outbox_factory(send, max_retries=1, retry_delay=(0.01, 0.01))
+    outbox.enqueue(_text("a"))
+
+    _wait_for(lambda: outbox.metrics()["dropped"] == 1)
+    assert outbox.metrics()["sent"] == 0
+    assert outbox.metrics()["queued"] == 0
+
+
+def test_outbox_retries_rate_limited_messages(outbox_factory):
+    attempts = []
+
+    def send(payload):
+        attempts.append(payload)
+        if len(attempts) == 1:
+            raise SignalDeliveryError({"code": -5, "message": "Rate limit exceeded"})
+
+    outbox = outbox_factory(send, retry_delay=(0.01, 0.01))
+    outbox.enqueue(_text("a"))
+
+    _wait_for(lambda: outbox.metrics()["sent"] == 1)
+    assert len(attempts) == 2
+    assert outbox.metrics()["retried"] == 1
+
+
+def test_outbox_drops_messages_rejected_by_the_server(outbox_factory):
+    attempts = []
+
+    def send(payload):
+        attempts.append(payload)
+        raise SignalDeliveryError({"code": -1, "message": "Invalid group id"})
+
+    outbox = outbox_factory(send, retry_delay=(0.01, 0.01))
+    outbox.enqueue(_text("a"))
+
+    _wait_for(lambda: outbox.metrics()["dropped"] == 1)
+    assert len(attempts) == 1
+    assert outbox.metrics()["retried"] == 0
+
+
+def test_outbox_drops_messages_if_full(outbox_factory):
+    release = threading.Event()
+    outbox = outbox_factory(lambda payload: release.wait(), max_queued=1)
+    outbox.enqueue(_text("in flight"))
+    _wait_for(lambda: outbox.metrics()["queued"] == 0)
+    outbox.enqueue(_text("a"))
+    outbox.enqueue(_text("b"))
+    release.set()
+
+    assert outbox.metrics()["dropped"] == 1
+
+
+def test_outbox_keys_recipients_independent_of_order():
+    first = {"params": {"message": "a", "recipients": ["+2", "+1"]}}
+    second = {"params": {"message": "a", "recipients": ["+1", "+2"]}}
+    assert SignalOutbox._get_key(first) == SignalOutbox._get_key(second)
@@ -0,0 +1,83 @@
+import threading
+from unittest import mock
+
+import fakeredis
+import pytest
+from bec_lib import messages
+from bec_lib.serialization import MsgpackSerialization
+
+from bec_atlas.datasources.stream_reader import StreamReader, stream_id_key
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def reader(redis):
+    reader = StreamReader(redis, cb=mock.MagicMock())
+    yield reader
+    reader.shutdown()
+
+
+def _add_entry(redis, stream: str, value: int) -> str:
+    msg = messages.VariableMessage(value=value)
+    return redis.xadd(stream, {"data": MsgpackSerialization.dumps(msg)}).decode()
+
+
+def _wait_for_calls(cb, count: int):
+    event = threading.Event()
+    for _ in range(200):
+        if cb.call_count >= count:
+            return
+        event.wait(0.01)
+    raise TimeoutError(f"Expected {count} callback calls, got {cb.call_count}")
+
+
+def test_stream_id_key_sorts_numerically():
+    assert stream_id_key("10-0") > stream_id_key("9-5")
+    assert stream_id_key("10-10") > stream_id_key("10-9")
+    assert stream_id_key("10") == (10, 0)
+    with pytest.raises(ValueError):
+        stream_id_key("invalid")
+
+
+def test_stream_reader_reads_entries_after_start_id(redis, reader):
+    start_id = _add_entry(redis, "stream", 1)
+    with mock.patch.object(redis, "xrevrange") as xrevrange:
+        assert reader.add("stream", start_id, room="room") == start_id
+    xrevrange.assert_not_called()
+    entry_id = _add_entry(redis, "stream", 2)
+
+    _wait_for_calls(reader.cb, 1)
+    reader.cb.assert_called_once_with(entry_id, mock.ANY, room="room")
+    assert reader.cb.call_args.args[1]["data"].value == 2
+
+
+def test_stream_reader_resumes_from_last_id(redis, reader):
+    last_id = _add_entry(redis, "stream", 1)
+    missed_ids = [_add_entry(redis, "stream", 2), _add_entry(redis, "stream", 3)]
+
+    assert reader.add("stream", last_id) == last_id
+
+    _wait_for_calls(reader.cb, 2)
+    assert [call.args[0] for call in reader.cb.call_args_list] == missed_ids
+
+
+def test_stream_reader_stops_reading_removed_streams(redis, reader):
+    reader.add("stream", "0-0")
+    reader.remove("stream")
+    _add_entry(redis, "stream", 1)
+
+    threading.Event().wait(0.1)
+    reader.cb.assert_not_called()
+
+
+def test_stream_reader_callback_errors_do_not_stop_reading(redis, reader):
+    reader.cb.side_effect = [ValueError("error"), None]
+    reader.add("stream", "0-0")
+    _add_entry(redis, "stream", 1)
+    _add_entry(redis, "stream", 2)
+
+    _wait_for_calls(reader.cb, 2)
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+from bec_lib import messages
+from bec_lib.endpoints import MessageEndpoints
+from bec_lib.serialization import MsgpackSerialization
+
+from bec_atlas.router.redis_router import RedisAtlasEndpoints, RemoteAccess
+
+
+@pytest.fixture
+def stream_client(backend, logged_in_client):
+    client = logged_in_client
+    _, app = backend
+    deployment = client.get("/api/v1/deployments/realm", params={"realm": "demo_beamline_1"}).json()
+    with mock.patch.object(app.redis_router, "get_access", return_value=RemoteAccess.READ):
+        yield client, app, deployment[0]["_id"]
+
+
+def _add_stream_entry(app, stream: str, scan_id: str) -> str:
+    msg = messages.ScanStatusMessage(scan_id=scan_id, status="open", info={})
+    redis = app.redis_websocket.stream_reader.redis
+    return redis.xadd(stream, {"data": MsgpackSerialization.dumps(msg)}).decode()
+
+
+def test_stream_router_streams_events(stream_client):
+    client, app, deployment = stream_client
+    ws = app.redis_websocket
+    queue = asyncio.Queue()
+    queue.put_nowait(("1-0", '{"data": 1}'))
+    queue.put_nowait(None)
+
+    with mock.patch.object(ws, "add_stream_client", return_value=("stream/id", queue)) as add:
+        with mock.patch.object(ws, "remove_stream_client") as remove:
+            response = client.get(
+                "/api/v1/stream",
+                params={"deployment": deployment, "endpoint": "scan_status"},
+                headers={"Last-Event-ID": "0-1"},
+            )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text == 'id: 1-0\nevent: message\ndata: {"data": 1}\n\n'
+    add.assert_called_once_with(
+        deployment,
+        MessageEndpoints.scan_status().endpoint,
+        json.dumps({"endpoint": "scan_status", "args": []}),
+        last_id="0-1",
+    )
+    remove.assert_called_once_with("stream/id", deployment, MessageEndpoints.scan_status().endpoint)
+
+
+def test_stream_router_rejects_unknown_endpoint(stream_client):
+    client, _, deployment = stream_client
+    response = client.get(
+        "/api/v1/stream", params={"deployment": deployment, "endpoint": "does_not_exist"}
+    )
+    assert response.status_code == 400
+
+
+def test_stream_router_rejects_invalid_deployment_id(stream_client):
+    client, _, _ = stream_client
+    response = client.get(
+        "/api/v1/stream", params={"deployment": "invalid", "endpoint": "scan_status"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid deployment ID"
+
+
+def test_stream_router_rejects_invalid_last_event_id(stream_client):
+    client, _, deployment = stream_client
+    response = client.get(
+        "/api/v1/stream",
+        params={"deployment": deployment, "endpoint": "scan_status"},
+        headers={"Last-Event-ID": "invalid"},
+    )
+    assert response.status_code == 400
+
+
+def test_stream_router_rejects_users_without_access(stream_client):
+    client, app, deployment = stream_client
+    app.datasources.access_cache.invalidate(deployment)
+    with mock.patch.object(app.redis_router, "get_access", return_value=RemoteAccess.NONE):
+        response = client.get(
+            "/api/v1/stream", params={"deployment": deployment, "endpoint": "scan_status"}
+        )
+    assert response.status_code == 403
+
+
+async def test_stream_client_receives_room_messages(stream_client):
+    _, app, deployment = stream_client
+    ws = app.redis_websocket
+    endpoint = MessageEndpoints.scan_status().endpoint
+    room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+
+    with mock.patch.object(ws, "stream_reader") as stream_reader:
+        stream_reader.add.return_value = "0-0"
+        events = app.stream_router._event_stream(deployment, endpoint, "request", None)
+        # the client is only added once the response is streamed
+        assert not ws.stream_clients
+        next_event = asyncio.ensure_future(anext(events))
+        while not ws.stream_clients:
+            await asyncio.sleep(0.01)
+        [client_id] = ws.stream_clients
+        assert client_id in ws.room_subscribers[room]
+        with mock.patch.object(ws.socket, "emit"):
+            await ws._emit_messages([(room, "1-0", "message")])
+        assert await next_event == "id: 1-0\nevent: message\ndata: message\n\n"
+        assert ws.client_stats[client_id].messages_sent == 1
+
+        ws.stream_clients[client_id].put_nowait(None)
+        with pytest.raises(StopAsyncIteration):
+            await anext(events)
+    assert client_id not in ws.stream_clients
+    assert room not in ws.room_subscribers
+
+
+async def test_stream_client_replays_missed_entries(stream_client):
+    _, app, deployment = stream_client
+    ws = app.redis_websocket
+    endpoint = MessageEndpoints.scan_status().endpoint
+    stream = RedisAtlasEndpoints.redis_data(deployment, endpoint)
+    last_id = _add_stream_entry(app, stream, "seen")
+    missed_id = _add_stream_entry(app, stream, "missed")
+
+    with mock.patch.object(ws, "stream_reader") as stream_reader:
+        stream_reader.add.return_value = missed_id
+        other_id, _ = await ws.add_stream_client(deployment, endpoint, "request")
+        client_id, queue = await ws.add_stream_client(
+            deployment, endpoint, "request", last_id=last_id
+        )
+        ws.remove_stream_client(other_id, deployment, endpoint)
+        ws.remove_stream_client(client_id, deployment, endpoint)
+
+    stream_id, outgoing = queue.get_nowait()
+    assert stream_id == missed_id
+    assert json.loads(outgoing)["data"]["scan_id"] == "missed"
+    assert queue.empty()
+
+
+async def test_slow_stream_clients_are_closed(stream_client):
+    _, app, deployment = stream_client
+    ws = app.redis_websocket
+    endpoint = MessageEndpoints.scan_status().endpoint
+    room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+    ws.quotas.max_queued_messages = 0
+    ws.quotas.max_throttle_time = -1
+
+    with mock.patch.object(ws, "stream_reader") as stream_reader:
+        stream_reader.add.return_value = "0-0"
+        client_id, queue = await ws.add_stream_client(deployment, endpoint, "request")
+        queue.put_nowait(("1-0", "message"))
+        with mock.patch.object(ws.socket, "emit"):
+            await ws._emit_messages([(room, "2-0", "message")])
+            await ws._emit_messages([(room, "3-0", "message")])
+        ws.remove_stream_client(client_id, deployment, endpoint)
+    assert queue.get_nowait() == ("1-0", "message")
+    # the end of the stream is only queued once
+    assert queue.get_nowait() is None
+    assert queue.empty()
+    assert client_id not in ws.closed_stream_clients
+
+
+async def test_stream_client_is_removed_if_joining_fails(stream_client):
+    _, app, deployment = stream_client
+    ws = app.redis_websocket
+    endpoint = MessageEndpoints.scan_status().endpoint
+    room = RedisAtlasEndpoints.socketio_endpoint_room(deployment, endpoint)
+
+    with mock.patch.object(ws, "_read_last_entry", side_effect=asyncio.CancelledError):
+        with pytest.raises(asyncio.CancelledError):
+            await ws.add_stream_client(deployment, endpoint, "request")
+    assert not ws.stream_clients
+    assert not ws.client_stats
+    assert room not in ws.room_subscribers
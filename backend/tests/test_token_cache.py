@@ -0,0 +1,74 @@
+import time
+from unittest import mock
+
+import jwt
+
+from bec_atlas import authentication
+from bec_atlas.authentication import decode_token, get_secret_key
+from bec_atlas.utils.token_cache import VerifiedTokenCache
+
+
+def test_token_cache_returns_cached_claims():
+    cache = VerifiedTokenCache()
+    payload = {"email": "test@example.com", "exp": time.time() + 60}
+    assert cache.get("token") is None
+    cache.add("token", payload)
+    assert cache.get("token") == payload
+    assert cache.metrics() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_token_cache_honors_expiry():
+    cache = VerifiedTokenCache()
+    cache.add("expired", {"email": "test@example.com", "exp": time.time() - 1})
+    cache.add("no_expiry", {"email": "test@example.com"})
+    assert cache.get("expired") is None
+    assert cache.get("no_expiry") is None
+    assert cache.metrics()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = VerifiedTokenCache(max_size=2)
+    for token in ("first", "second"):
+        cache.add(token, {"exp": time.time() + 60})
+    cache.get("first")
+    cache.add("third", {"exp": time.time() + 60})
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_token_cache_does_not_store_tokens():
+    cache = VerifiedTokenCache()
+    cache.add("secret_token", {"exp": time.time() + 60})
+    assert "secret_token" not in cache._entries
+
+
+def test_decode_token_skips_verification_of_cached_tokens():
+    token = jwt.encode(
+        {"email": "cached@example.com", "exp": time.time() + 60},
+        get_secret_key(),
+        algorithm=authentication.ALGORITHM,
+    )
+    with mock.patch.object(authentication, "token_cache", VerifiedTokenCache()):
+        with mock.patch.object(authentication.jwt, "decode", wraps=jwt.decode) as decode:
+            for _ in range(3):
+                assert decode_token(token)["email"] == "cached@example.com"
+        decode.assert_called_once()
+        assert authentication.token_cache.metrics()["hits"] == 2
+
+
+def test_decode_token_callers_cannot_modify_cached_claims():
+    token = jwt.encode(
+        {"email": "cached@example.com", "groups": ["users"], "exp": time.time() + 60},
+        get_secret_key(),
+        algorithm=authentication.ALGORITHM,
+    )
+    with mock.patch.object(authentication, "token_cache", VerifiedTokenCache()):
+        first = decode_token(token)
+        first["email"] = "other@example.com"
+        first["groups"].append("admin")
+        second = decode_token(token)
+        second["groups"].append("admin")
+        third = decode_token(token)
+    assert third["email"] == "cached@example.com"
+    assert third["groups"] == ["users"]
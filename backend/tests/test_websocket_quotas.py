@@ -0,0 +1,41 @@
+from unittest import mock
+
+from bec_atlas.utils.websocket_quotas import ConnectionStats, WebsocketQuotas
+
+
+def test_websocket_quotas_from_config():
+    quotas = WebsocketQuotas.from_config({"max_connections_per_user": 2})
+    assert quotas.max_connections_per_user == 2
+    assert quotas.max_subscriptions_per_user == WebsocketQuotas().max_subscriptions_per_user
+    assert WebsocketQuotas.from_config(None) == WebsocketQuotas()
+
+
+def test_connection_stats_rate():
+    stats = ConnectionStats(_window_start=0)
+    with mock.patch("bec_atlas.utils.websocket_quotas.time.monotonic", return_value=0.5):
+        stats.record_sent(100)
+    assert stats.bytes_per_second == 0
+    with mock.patch("bec_atlas.utils.websocket_quotas.time.monotonic", return_value=2):
+        stats.record_sent(300)
+    assert stats.bytes_per_second == 200
+    assert stats.bytes_sent == 400
+    assert stats.messages_sent == 2
+
+
+def test_connection_stats_throttle_time():
+    stats = ConnectionStats()
+    with mock.patch("bec_atlas.utils.websocket_quotas.time.monotonic", return_value=10):
+        assert stats.update_queue(5, max_queued_messages=10) is None
+        assert stats.update_queue(11, max_queued_messages=10) == 0
+    assert stats.to_dict()["throttled"] is True
+    with mock.patch("bec_atlas.utils.websocket_quotas.time.monotonic", return_value=15):
+        assert stats.update_queue(11, max_queued_messages=10) == 5
+        assert stats.update_queue(3, max_queued_messages=10) is None
+    assert stats.to_dict() == {
+        "messages_sent": 0,
+        "bytes_sent": 0,
+        "messages_dropped": 0,
+        "bytes_per_second": 0,
+        "queued_messages": 3,
+        "throttled": False,
+    }
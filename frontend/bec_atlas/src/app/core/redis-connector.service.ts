@@ -10,6 +10,8 @@ export class RedisConnectorService {
   private socket: Socket | null = null;
   private signals: Map<string, WritableSignal<any>> = new Map();
   private signalReferenceCount: Map<string, number> = new Map();
+  private lastStreamIds: Map<string, string> = new Map();
+  private hasConnected = false;
 
   constructor(
     private serverSettings: ServerSettingsService,
@@ -46,12 +48,19 @@ export class RedisConnectorService {
     this.socket.on('connect', () => {
       console.log('Connected to WebSocket server');
       // this.register(MessageEndpoints.device_readback('samx'));
+      if (this.hasConnected) {
+        this.resumeSubscriptions();
+      }
+      this.hasConnected = true;
     });
 
     this.socket.on('message', (data: any) => {
       // console.log('Received message:', data);
       const dataObj = JSON.parse(data);
       const endpoint_signal = this.signals.get(dataObj.endpoint_request);
+      if (dataObj.stream_id) {
+        this.lastStreamIds.set(dataObj.endpoint_request, dataObj.stream_id);
+      }
       if (endpoint_signal) {
         endpoint_signal.set(dataObj);
       }
@@ -69,8 +78,12 @@ export class RedisConnectorService {
       console.log('Reconnection attempt:', attempt);
     });
 
-    this.socket.on('error', (error: Error) => {
+    this.socket.on('error', (error: any) => {
       console.error('Socket error:', error);
+      if (error?.retry_after !== undefined) {
+        // the server is busy and rejected the connection; reconnect after the suggested delay
+        this.scheduleReconnect(error.retry_after);
+      }
     });
 
     this.socket.on('ping', () => {
@@ -78,6 +91,37 @@ export class RedisConnectorService {
     });
   }
 
+  /**
+   * Reconnect to the WebSocket server after a delay
+   * @param delay Delay in seconds
+   */
+  private scheduleReconnect(delay: number): void {
+    const socket = this.socket;
+    setTimeout(() => {
+      if (socket && socket === this.socket && !socket.connected) {
+        socket.connect();
+      }
+    }, delay * 1000);
+  }
+
+  /**
+   * Re-register all endpoints after a reconnect. The server replays all
+   * messages published since the last received stream id.
+   */
+  private resumeSubscriptions(): void {
+    for (const [endpoint_str, count] of this.signalReferenceCount) {
+      if (count === 0) {
+        continue;
+      }
+      const lastStreamId = this.lastStreamIds.get(endpoint_str);
+      if (lastStreamId) {
+        this.socket?.emit('register', endpoint_str, lastStreamId);
+      } else {
+        this.socket?.emit('register', endpoint_str);
+      }
+    }
+  }
+
   /**
    * Emit an event to the WebSocket server
    * @param event Event name
@@ -153,6 +197,8 @@ export class RedisConnectorService {
    * Disconnect from the WebSocket server
    */
   public disconnect(): void {
+    this.hasConnected = false;
+    this.lastStreamIds.clear();
     if (this.socket) {
       this.socket.disconnect();
       console.log('Disconnected from WebSocket server');